@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 import os
 from pathlib import Path
 
+from core.hasher_policies import order_hashers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -29,24 +31,40 @@ DEBUG = True
 ALLOWED_HOSTS = []
 
 
+# Admin and the API schema and docs are only installed and routed when
+# enabled. Lean workers skip the project admin and drf-spectacular, but DRF
+# loads the admin site itself, so startup time barely changes, see
+# manage.py profile_startup
+ENABLE_ADMIN = bool(int(os.environ.get('ENABLE_ADMIN', 1)))
+ENABLE_API_DOCS = bool(int(os.environ.get('ENABLE_API_DOCS', 1)))
+
+# Schema file written by manage.py spectacular --file, served by /api/schema/
+# instead of generating the schema on the first request of each process
+API_SCHEMA_FILE = os.environ.get('API_SCHEMA_FILE')
+
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
-    'rest_framework.authtoken',
-    'drf_spectacular',
     'core',
     'user',
     'recipe'
 ]
 
+if ENABLE_ADMIN:
+    INSTALLED_APPS.insert(0, 'django.contrib.admin')
+
+if ENABLE_API_DOCS:
+    INSTALLED_APPS.append('drf_spectacular')
+
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,16 +105,58 @@ WSGI_APPLICATION = 'app.wsgi.application'
 #     }
 # }
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds per thread, or with
+# DB_POOL_MAX_SIZE set borrowed from a per process pool for every request
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': (
+            'core.db.backends.postgresql' if DB_POOL_MAX_SIZE
+            else 'django.db.backends.postgresql'
+        ),
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('POSTGRES_DB'),
         'USER': os.environ.get('POSTGRES_USER'),
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
+        'CONN_MAX_AGE': int(os.environ.get(
+            'DB_CONN_MAX_AGE',
+            0 if DB_POOL_MAX_SIZE else 60
+        )),
+        'CONN_HEALTH_CHECKS': bool(int(
+            os.environ.get('DB_CONN_HEALTH_CHECKS', 1)
+        )),
+        'POOL': {
+            'MAX_SIZE': DB_POOL_MAX_SIZE,
+            'IDLE_TIMEOUT': int(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        },
     }
 }
 
+# Safe API reads go to the replicas of the comma separated DB_REPLICA_HOSTS,
+# except for users who wrote in the last DB_REPLICA_STICKY_SECONDS. Writes
+# are pinned in DB_REPLICA_STICKY_CACHE, which must be a CACHES alias shared
+# by every process, such as the one REDIS_CACHE_URL configures
+DATABASES.update({
+    f'replica_{index}': {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    for index, host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))
+    )
+})
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+
+DB_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5)),
+    'CACHE': os.environ.get('DB_REPLICA_STICKY_CACHE'),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -116,6 +176,42 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing, POLICY picks the hasher of new passwords while the
+# others only verify existing hashes, which are upgraded on the next login
+PASSWORD_HASHER_POLICY = os.environ.get('PASSWORD_HASHER_POLICY', 'pbkdf2')
+PASSWORD_HASHER_POLICIES = {
+    'pbkdf2': 'core.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'core.hashers.TunedScryptPasswordHasher',
+    'argon2': 'core.hashers.TunedArgon2PasswordHasher',
+}
+PASSWORD_HASHERS = order_hashers(
+    PASSWORD_HASHER_POLICIES,
+    PASSWORD_HASHER_POLICY
+)
+PASSWORD_HASHER_COST = {
+    'PBKDF2_ITERATIONS': int(os.environ.get('PBKDF2_ITERATIONS', 390000)),
+    'SCRYPT_WORK_FACTOR': int(os.environ.get('SCRYPT_WORK_FACTOR', 2 ** 14)),
+    'ARGON2_TIME_COST': int(os.environ.get('ARGON2_TIME_COST', 2)),
+    'ARGON2_MEMORY_COST': int(os.environ.get('ARGON2_MEMORY_COST', 102400)),
+    'ARGON2_PARALLELISM': int(os.environ.get('ARGON2_PARALLELISM', 8)),
+}
+
+# Password hashing worker processes, a SIZE of 0 hashes in request threads.
+# Every web server worker process starts its own pool, so N workers run
+# N * SIZE hashing processes, keep that near the CPU count. QUEUE_DEPTH bounds
+# the request threads of a worker waiting on hashes, keep it below the
+# threads per worker so other endpoints are still served during a burst
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 1))
+PASSWORD_HASH_POOL = {
+    'SIZE': PASSWORD_HASH_WORKERS,
+    'QUEUE_DEPTH': int(os.environ.get(
+        'PASSWORD_HASH_QUEUE_DEPTH',
+        2 * PASSWORD_HASH_WORKERS
+    )),
+    'TIMEOUT': float(os.environ.get('PASSWORD_HASH_TIMEOUT', 2)),
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -138,10 +234,68 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Caches, local memory unless a shared backend is configured per process.
+# REDIS_CACHE_URL adds a 'shared' alias, it needs the redis package
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    }
+}
+
+if os.environ.get('REDIS_CACHE_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_CACHE_URL'],
+    }
+
 # Custom user model
 AUTH_USER_MODEL = 'core.User'
 
-# DRF settings
+# DRF settings, the JSON renderer and parser can be swapped for DRF's own
 REST_FRAMEWORK = {
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'EXCEPTION_HANDLER': 'core.exceptions.exception_handler',
+    'DEFAULT_SCHEMA_CLASS': (
+        'drf_spectacular.openapi.AutoSchema' if ENABLE_API_DOCS
+        else 'rest_framework.schemas.openapi.AutoSchema'
+    ),
+    'DEFAULT_RENDERER_CLASSES': [
+        os.environ.get('API_JSON_RENDERER', 'core.renderers.FastJSONRenderer'),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        os.environ.get('API_JSON_PARSER', 'core.parsers.FastJSONParser'),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Token authentication cache, SHARED_CACHE is an optional CACHES alias. Other
+# processes accept a revoked token for up to TTL seconds, 0 disables caching
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 60)),
+    'SHARED_CACHE': os.environ.get('TOKEN_AUTH_SHARED_CACHE'),
+}
+
+# Seconds an API token stays valid after login
+AUTH_TOKEN_TTL = int(os.environ.get('AUTH_TOKEN_TTL', 60 * 60 * 24 * 30))
+
+# Recipe list pagination
+RECIPE_PAGE_SIZE = int(os.environ.get('RECIPE_PAGE_SIZE', 50))
+RECIPE_MAX_PAGE_SIZE = int(os.environ.get('RECIPE_MAX_PAGE_SIZE', 500))
+
+# Maximum number of recipes accepted by one bulk request
+RECIPE_BULK_MAX_ITEMS = int(os.environ.get('RECIPE_BULK_MAX_ITEMS', 1000))
+
+# Rows fetched per database round trip when exporting recipes
+RECIPE_EXPORT_CHUNK_SIZE = int(os.environ.get('RECIPE_EXPORT_CHUNK_SIZE', 2000))
+
+# Versioned recipe and tag response cache, an empty ALIAS disables it
+RECIPE_RESPONSE_CACHE = {
+    'ALIAS': os.environ.get('RECIPE_RESPONSE_CACHE', 'default'),
+    'TTL': int(os.environ.get('RECIPE_RESPONSE_CACHE_TTL', 300)),
 }
+
+# Render recipe and tag lists from .values() rows instead of model instances
+RECIPE_FAST_LIST = bool(int(os.environ.get('RECIPE_FAST_LIST', 0)))
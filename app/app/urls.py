@@ -13,18 +13,33 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 
+from core.views import RequestMetricsView
+
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path(
-        'api/docs/',
-        SpectacularSwaggerView.as_view(url_name='schema'),
-        name='api-docs'
-    ),
+    path('api/metrics/', RequestMetricsView.as_view(), name='metrics'),
     path('api/user/', include('user.urls')),
     path('api/recipe/', include('recipe.urls'))
 ]
+
+# Imported only when enabled, both pull in large dependency trees.
+if settings.ENABLE_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
+if settings.ENABLE_API_DOCS:
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    from core.schema import CachedSchemaView
+
+    urlpatterns += [
+        path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+        path(
+            'api/docs/',
+            SpectacularSwaggerView.as_view(url_name='schema'),
+            name='api-docs'
+        ),
+    ]
@@ -0,0 +1,139 @@
+"""
+Helpers shared by the benchmark management commands.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+
+import django
+from django.db import connection, connections
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(func, iterations, warmup=0):
+    """Call func repeatedly and return latency and query statistics."""
+    for _ in range(warmup):
+        func()
+
+    latencies = []
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            call_start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+
+    return {
+        **summarize(latencies, elapsed),
+        'queries_per_call': counter.count / iterations,
+    }
+
+
+def summarize(latencies, elapsed):
+    """Return throughput and latency statistics of calls taking elapsed."""
+    return {
+        'iterations': len(latencies),
+        'throughput_per_sec': len(latencies) / elapsed,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+@contextmanager
+def isolated_database(verbosity=0):
+    """Run the enclosed block against freshly created test databases.
+
+    Benchmarks seed and mutate data, so they never touch the configured
+    databases themselves, only their test counterparts.
+    """
+    setup_test_environment(debug=False)
+    old_config = setup_databases(
+        verbosity=verbosity,
+        interactive=False,
+        aliases=set(connections)
+    )
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def environment():
+    """Describe the environment results were produced in."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def write_results(path, results, stdout):
+    """Write results as JSON to path, or to stdout when path is None."""
+    content = json.dumps(results, indent=2, sort_keys=True)
+    if path:
+        with open(path, 'w') as stream:
+            stream.write(content + '\n')
+    else:
+        stdout.write(content)
+
+
+def compare_results(baseline_path, results, stdout, style):
+    """Print the change of every metric against a baseline JSON file."""
+    with open(baseline_path) as stream:
+        baseline = json.load(stream)['results']
+
+    for name, metrics in results['results'].items():
+        for key in ('p50_ms', 'p99_ms', 'queries_per_call'):
+            if name not in baseline or key not in baseline[name]:
+                continue
+            before, after = baseline[name][key], metrics[key]
+            change = (after - before) / before * 100 if before else 0.0
+            line = (
+                f'{name} {key}: {before:.2f} -> {after:.2f} ({change:+.1f}%)'
+            )
+            regressed = change > 10 or (
+                key == 'queries_per_call' and after > before
+            )
+            stdout.write(style.ERROR(line) if regressed else line)
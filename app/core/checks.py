@@ -0,0 +1,48 @@
+"""
+System checks for the core app.
+"""
+from django.core.checks import Error, Tags, register
+from django.db import connections
+
+# SQLite triggers keeping the recipe title search table in sync, created
+# by migration 0006.
+SQLITE_FTS_TABLE = 'core_recipe_fts'
+SQLITE_FTS_TRIGGERS = [
+    f'core_recipe_fts_{action}' for action in ('insert', 'delete', 'update')
+]
+
+
+@register(Tags.database)
+def check_recipe_search_triggers(app_configs, databases=None, **kwargs):
+    """Check the SQLite search table still has its triggers.
+
+    Remaking ``core_recipe``, which SQLite migrations do to alter it,
+    drops the triggers and leaves search results stale.
+    """
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT type, name FROM sqlite_master "
+                "WHERE name = %s OR tbl_name = 'core_recipe'",
+                [SQLITE_FTS_TABLE]
+            )
+            names = {name for _, name in cursor.fetchall()}
+        if SQLITE_FTS_TABLE not in names:
+            continue
+
+        missing = [name for name in SQLITE_FTS_TRIGGERS if name not in names]
+        if missing:
+            errors.append(Error(
+                f'Recipe search triggers missing on {alias}: '
+                + ', '.join(missing),
+                hint='Recreate them with the statements of '
+                     'core/migrations/0006_recipe_title_search.py.',
+                id='core.E001'
+            ))
+
+    return errors
@@ -0,0 +1,143 @@
+"""
+PostgreSQL database backend borrowing connections from a pool.
+"""
+import os
+import threading
+
+from django.db.backends.postgresql import base, creation
+from psycopg2 import extensions
+
+from core.db.pool import ConnectionPool, PoolTimeout
+
+Database = base.Database
+
+POOL_DEFAULTS = {
+    'MAX_SIZE': 10,
+    'IDLE_TIMEOUT': 300,
+    'TIMEOUT': 10,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_key(settings_dict):
+    """Return the key of the pool of a database in this process."""
+    return (os.getpid(),) + tuple(
+        settings_dict[name] for name in ('HOST', 'PORT', 'NAME', 'USER')
+    )
+
+
+def get_pool(settings_dict):
+    """Return the pool of a database, creating it on first use."""
+    key = pool_key(settings_dict)
+    with _pools_lock:
+        if key not in _pools:
+            config = {**POOL_DEFAULTS, **settings_dict.get('POOL', {})}
+            _pools[key] = ConnectionPool(
+                max_size=config['MAX_SIZE'],
+                idle_timeout=config['IDLE_TIMEOUT'],
+                timeout=config['TIMEOUT']
+            )
+
+        return _pools[key]
+
+
+def close_pool(settings_dict):
+    """Close the idle connections to a database."""
+    with _pools_lock:
+        pool = _pools.get(pool_key(settings_dict))
+    if pool is not None:
+        pool.close()
+
+
+def is_connection_usable(connection):
+    """Return whether a raw psycopg2 connection answers a query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not connection.autocommit:
+            connection.rollback()
+    except Database.Error:
+        return False
+    else:
+        return True
+
+
+def reset_connection(connection):
+    """Prepare a connection for reuse, returning whether it is reusable."""
+    try:
+        if connection.closed:
+            return False
+        status = connection.get_transaction_status()
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+    except Database.Error:
+        return False
+    else:
+        return True
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Test database creation closing pooled connections to copied or
+    dropped databases first, PostgreSQL refuses while they are open.
+    """
+
+    def _test_settings(self, name):
+        return {**self.connection.settings_dict, 'NAME': name}
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        close_pool(self.connection.settings_dict)
+        return super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pool(self._test_settings(test_database_name))
+        return super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend borrowing connections from a per process pool.
+
+    Closing the connection returns it to the pool of its database, so with
+    ``CONN_MAX_AGE = 0`` every request checks a connection out of the pool
+    and returns it when finished, instead of connecting to the server. The
+    ``POOL`` entry of the database settings configures ``MAX_SIZE``,
+    ``IDLE_TIMEOUT`` and ``TIMEOUT``. With ``CONN_HEALTH_CHECKS`` idle
+    connections are tested before being handed out.
+    """
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        return get_pool(self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        check = None
+        if self.settings_dict['CONN_HEALTH_CHECKS']:
+            check = is_connection_usable
+
+        try:
+            connection = self.pool.acquire(
+                lambda: super(DatabaseWrapper, self).get_new_connection(
+                    conn_params
+                ),
+                check=check
+            )
+        except PoolTimeout as exc:
+            raise Database.OperationalError(str(exc)) from exc
+
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level',
+            connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(
+                    self.connection,
+                    reusable=reset_connection(self.connection)
+                )
@@ -0,0 +1,103 @@
+"""
+Database connection pooling.
+"""
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Bounded, thread safe pool of open DB-API connections.
+
+    At most ``max_size`` connections are open at once, counting the ones
+    checked out and the idle ones. Idle connections are handed out most
+    recently used first, so the least used ones age and are closed once
+    idle for longer than ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, max_size, idle_timeout, timeout):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        # Connections opened over the pool's lifetime.
+        self.opened = 0
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def acquire(self, connect, check=None):
+        """Return an idle connection, or one opened by calling connect.
+
+        Idle connections for which ``check(connection)`` is false are
+        closed and skipped. Blocks up to ``timeout`` seconds when every
+        connection is checked out, then raises ``PoolTimeout``.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                f'No database connection available within {self.timeout}s, '
+                f'all {self.max_size} are in use.'
+            )
+
+        try:
+            while True:
+                connection = self._pop_idle()
+                if connection is None:
+                    connection = connect()
+                    with self._lock:
+                        self.opened += 1
+                    return connection
+                if check is None or check(connection):
+                    return connection
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, reusable=True):
+        """Return a checked out connection, closing it unless reusable."""
+        try:
+            if reusable:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+            else:
+                self._discard(connection)
+        finally:
+            self._slots.release()
+
+        self._close_expired()
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _pop_idle(self):
+        self._close_expired()
+        with self._lock:
+            return self._idle.pop()[0] if self._idle else None
+
+    def _close_expired(self):
+        """Close the connections idle for longer than idle_timeout."""
+        expired = []
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            while self._idle and self._idle[0][1] <= deadline:
+                expired.append(self._idle.popleft()[0])
+        for connection in expired:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
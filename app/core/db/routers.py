@@ -0,0 +1,135 @@
+"""
+Database routers.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+# Cache backends private to a process, unfit to share write pins.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+# Replica serving the reads of the current scope, None for the primary.
+replica = ContextVar('replica', default=None)
+
+
+def check_replica_settings():
+    """Raise ImproperlyConfigured unless write pins are shared.
+
+    A pin in one worker's memory would not keep the user's next request,
+    served by another worker, off the replicas.
+    """
+    config = settings.DB_REPLICAS
+    if not config['ALIASES'] or not config['STICKY_SECONDS']:
+        return
+
+    alias = config['CACHE']
+    if alias not in settings.CACHES:
+        raise ImproperlyConfigured(
+            'DB_REPLICAS needs CACHE, a CACHES alias shared by every '
+            'process, when replicas are configured.'
+        )
+    if settings.CACHES[alias]['BACKEND'] in LOCAL_CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f'DB_REPLICAS CACHE {alias!r} is private to each process, '
+            'write pins must be stored in a shared cache.'
+        )
+
+
+@contextmanager
+def routing_scope():
+    """Route reads to the primary until allow_replica_reads() is called,
+    restoring the previous routing on exit.
+    """
+    token = replica.set(None)
+    try:
+        yield
+    finally:
+        replica.reset(token)
+
+
+def choose_replica():
+    """Return a random replica alias, or None when there is none."""
+    aliases = settings.DB_REPLICAS['ALIASES']
+    return random.choice(aliases) if aliases else None
+
+
+def allow_replica_reads():
+    """Let the remaining reads of the current scope use one replica.
+
+    The replica is chosen once, so every read of a request sees the same
+    point in replication, a version and the rows it describes included.
+    """
+    replica.set(choose_replica())
+
+
+def _write_key(user):
+    return f'db-write:{user.pk}'
+
+
+def _pins_enabled():
+    config = settings.DB_REPLICAS
+    return bool(config['ALIASES'] and config['STICKY_SECONDS'])
+
+
+def record_write(user):
+    """Pin the user's reads to the primary for the sticky window."""
+    if user.is_authenticated and _pins_enabled():
+        caches[settings.DB_REPLICAS['CACHE']].set(
+            _write_key(user), True, settings.DB_REPLICAS['STICKY_SECONDS']
+        )
+
+
+def wrote_recently(user):
+    """Return whether the user wrote within the sticky window."""
+    if not user.is_authenticated or not _pins_enabled():
+        return False
+
+    return caches[settings.DB_REPLICAS['CACHE']].get(
+        _write_key(user), False
+    )
+
+
+async def awrote_recently(user):
+    """Async variant of wrote_recently()."""
+    if not user.is_authenticated or not _pins_enabled():
+        return False
+
+    return await caches[settings.DB_REPLICAS['CACHE']].aget(
+        _write_key(user), False
+    )
+
+
+class ReplicaRouter:
+    """Send reads allowed by ``allow_replica_reads()`` to a replica.
+
+    Replicas are the database aliases in ``DB_REPLICAS['ALIASES']``. Any
+    other read, every write and every read of the ``PRIMARY_MODELS``,
+    which must never lag, use the default database.
+    """
+    PRIMARY_MODELS = {'core.authtoken'}
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if model._meta.label_lower in self.PRIMARY_MODELS:
+            return DEFAULT_DB_ALIAS
+
+        return replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DB_REPLICAS['ALIASES']}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
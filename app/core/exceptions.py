@@ -0,0 +1,29 @@
+"""
+Exception handling for the API views.
+"""
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from core.hashing import HashingUnavailable
+
+
+class ServiceBusy(APIException):
+    """Raised when a request can't be served now but can be retried."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many concurrent logins, try again shortly.'
+    default_code = 'hashing_unavailable'
+
+    def __init__(self, detail=None, code=None, wait=1):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+def exception_handler(exc, context):
+    """DRF's exception handler, answering a busy hashing pool with a 503
+    and a Retry-After header.
+    """
+    if isinstance(exc, HashingUnavailable):
+        exc = ServiceBusy(wait=exc.wait)
+
+    return drf_exception_handler(exc, context)
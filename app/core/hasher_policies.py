@@ -0,0 +1,19 @@
+"""
+Password hasher order of each hashing policy.
+
+Imported by the settings, so it must not import Django.
+"""
+
+
+def order_hashers(policies, policy):
+    """Return the hasher paths of policies, the one of policy first.
+
+    The other hashers stay listed so existing hashes still verify, and
+    are upgraded on the next login.
+    """
+    if policy not in policies:
+        raise ValueError(f'Unknown password hasher policy {policy!r}.')
+
+    return [policies[policy]] + [
+        path for name, path in policies.items() if name != policy
+    ]
@@ -0,0 +1,58 @@
+"""
+Password hashers with costs tunable from settings.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+from core.hasher_policies import order_hashers
+
+
+def hashers_for_policy(policy):
+    """Return PASSWORD_HASHERS preferring the hasher of policy."""
+    return order_hashers(settings.PASSWORD_HASHER_POLICIES, policy)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 hasher iterating ``PBKDF2_ITERATIONS`` times.
+
+    Hashes made with a different number of iterations, including Django's
+    default, are rehashed on login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_COST['PBKDF2_ITERATIONS']
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt hasher using ``SCRYPT_WORK_FACTOR``, in the standard library."""
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_HASHER_COST['SCRYPT_WORK_FACTOR']
+
+    @property
+    def maxmem(self):
+        # Scrypt needs 128 * n * r bytes, above OpenSSL's 32MB default
+        # once the work factor is raised.
+        return 256 * self.work_factor * self.block_size
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 hasher using the ``ARGON2_*`` costs, needs argon2-cffi."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHER_COST['ARGON2_TIME_COST']
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHER_COST['ARGON2_MEMORY_COST']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_COST['ARGON2_PARALLELISM']
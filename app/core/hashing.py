@@ -0,0 +1,194 @@
+"""
+Password hashing on a bounded pool of worker processes.
+"""
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Settings the worker processes hash with, sent along with every task so
+# overrides made after the pool started apply too.
+HASHING_SETTINGS = ('PASSWORD_HASHERS', 'PASSWORD_HASHER_COST')
+
+
+class HashingUnavailable(Exception):
+    """Raised when the hashing pool is saturated or failing.
+
+    ``wait`` is the number of seconds after which a retry may succeed. The
+    API answers it with a 503, see ``core.exceptions``.
+    """
+
+    def __init__(self, wait=1):
+        super().__init__(
+            f'Password hashing unavailable, retry in {wait} seconds.'
+        )
+        self.wait = wait
+
+
+def _timed(func, *args):
+    """Return the seconds func(*args) took to run and its result."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _configure(config):
+    """Apply the hashing settings of the calling process."""
+    changed = False
+    for name, value in config.items():
+        if getattr(settings, name) != value:
+            setattr(settings, name, value)
+            changed = True
+
+    if changed:
+        hashers.get_hashers.cache_clear()
+        hashers.get_hashers_by_algorithm.cache_clear()
+
+
+def _make_password(config, password):
+    _configure(config)
+    return hashers.make_password(password)
+
+
+def _check_password(config, password, encoded):
+    """Return whether password matches, and its new hash if outdated."""
+    _configure(config)
+    outdated = []
+    valid = hashers.check_password(password, encoded, outdated.append)
+
+    return valid, hashers.make_password(password) if outdated else None
+
+
+class PasswordHashPool:
+    """Bounded process pool hashing and verifying passwords.
+
+    Hashing is CPU bound, so running it in the request threads lets a
+    burst of logins starve every other endpoint. The pool runs at most
+    ``SIZE`` hashes at once and accepts ``QUEUE_DEPTH`` more waiting ones.
+    Requests fail fast with a 503 beyond that, or when the hashes queued
+    ahead of them would not finish within ``TIMEOUT``, judging by how long
+    recent hashes took, so request threads are not held waiting for work
+    that will time out. A ``SIZE`` of 0 hashes in the calling thread.
+    """
+    # Weight of the latest hash in the running mean of hash durations.
+    SMOOTHING = 0.2
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._pending = 0
+        self._hash_time = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        return settings.PASSWORD_HASH_POOL
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.config['SIZE'],
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=django.setup
+                )
+                self._slots = threading.BoundedSemaphore(
+                    self.config['SIZE'] + self.config['QUEUE_DEPTH']
+                )
+
+            return self._executor, self._slots
+
+    def shutdown(self):
+        """Stop the worker processes, they restart on the next task."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def expected_wait(self):
+        """Return the seconds a new task would take to finish, or 0 while
+        no hash has been timed yet.
+        """
+        with self._lock:
+            if self._hash_time is None:
+                return 0
+            rounds = self._pending // self.config['SIZE'] + 1
+            return rounds * self._hash_time
+
+    def _record(self, seconds):
+        with self._lock:
+            if self._hash_time is None:
+                self._hash_time = seconds
+            else:
+                self._hash_time += self.SMOOTHING * (seconds - self._hash_time)
+
+    def _done(self, slots):
+        with self._lock:
+            self._pending -= 1
+        slots.release()
+
+    def run(self, func, *args):
+        """Run func with the hashing settings and args in the pool."""
+        config = {name: getattr(settings, name) for name in HASHING_SETTINGS}
+        if not self.config['SIZE']:
+            return func(config, *args)
+
+        executor, slots = self._get_executor()
+        if not slots.acquire(blocking=False):
+            raise HashingUnavailable(wait=self.retry_after())
+        wait = self.expected_wait()
+        if wait > self.config['TIMEOUT']:
+            slots.release()
+            raise HashingUnavailable(wait=math.ceil(wait))
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = executor.submit(_timed, func, config, *args)
+        except (BrokenProcessPool, RuntimeError):
+            self._done(slots)
+            self.shutdown()
+            raise HashingUnavailable()
+        # The slot is held until the task is done, even if we stop waiting.
+        future.add_done_callback(lambda future: self._done(slots))
+
+        try:
+            seconds, result = future.result(timeout=self.config['TIMEOUT'])
+        except TimeoutError:
+            future.cancel()
+            raise HashingUnavailable(wait=self.retry_after())
+        except BrokenProcessPool:
+            self.shutdown()
+            raise HashingUnavailable()
+
+        self._record(seconds)
+        return result
+
+    def retry_after(self):
+        """Return the whole seconds until the pool likely has room."""
+        return max(1, math.ceil(self.expected_wait()))
+
+    def make_password(self, password):
+        """Return the hash of password, see Django's make_password()."""
+        if password is None:
+            return hashers.make_password(None)
+
+        return self.run(_make_password, password)
+
+    def check_password(self, password, encoded):
+        """Return whether password matches encoded, and a new hash if
+        encoded was made by a hasher or cost no longer preferred.
+        """
+        if password is None or not hashers.is_password_usable(encoded):
+            return False, None
+
+        return self.run(_check_password, password, encoded)
+
+
+hash_pool = PasswordHashPool()
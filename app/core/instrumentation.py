@@ -0,0 +1,192 @@
+"""
+Per request query and latency instrumentation.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf')
+)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters collected while a single request is handled.
+
+    Instances are called by ``count_queries``, the database execute
+    wrapper of every connection, so each query run while they are the
+    current metrics is counted and timed.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.total_time = 0.0
+        self._start = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def finish(self):
+        """Stop the request clock."""
+        self.total_time = time.perf_counter() - self._start
+
+    def server_timing(self):
+        """Return the metrics as a Server-Timing header value."""
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.2f}',
+            f'total;dur={self.total_time * 1000:.2f}',
+        ])
+
+
+def current_metrics():
+    """Return the metrics of the request being handled, if any."""
+    return _current.get()
+
+
+def count_queries(execute, sql, params, many, context):
+    """Execute wrapper adding queries to the current request's metrics.
+
+    The metrics live in a context variable, which ``sync_to_async`` copies
+    to its worker threads, so queries of async requests are counted too.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """Add count_queries to a new connection, once."""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+@contextmanager
+def collect(metrics=None):
+    """Collect metrics for the enclosed block and yield them.
+
+    Passing the metrics of an earlier block resumes collecting into them.
+    """
+    if metrics is None:
+        metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+        metrics.finish()
+
+
+@contextmanager
+def serializer_timer():
+    """Add the time spent in the enclosed block to serializer time."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+
+
+class RouteStats:
+    """Aggregated metrics of every request made to one route."""
+
+    def __init__(self):
+        self.count = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.total_time = 0.0
+        self.max_total_time = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def add(self, metrics):
+        self.count += 1
+        self.queries += metrics.queries
+        self.max_queries = max(self.max_queries, metrics.queries)
+        self.db_time += metrics.db_time
+        self.serializer_time += metrics.serializer_time
+        self.total_time += metrics.total_time
+        self.max_total_time = max(self.max_total_time, metrics.total_time)
+        self.buckets[bisect.bisect_left(
+            LATENCY_BUCKETS_MS,
+            metrics.total_time * 1000
+        )] += 1
+
+    def percentile(self, fraction):
+        """Return an upper estimate of a latency percentile in ms."""
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                break
+        return min(bound, self.max_total_time * 1000)
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'queries': {
+                'mean': self.queries / self.count,
+                'max': self.max_queries,
+            },
+            'db_ms': {'mean': self.db_time * 1000 / self.count},
+            'serializer_ms': {
+                'mean': self.serializer_time * 1000 / self.count,
+            },
+            'total_ms': {
+                'mean': self.total_time * 1000 / self.count,
+                'max': self.max_total_time * 1000,
+                'p50': self.percentile(0.5),
+                'p99': self.percentile(0.99),
+                'histogram': {
+                    str(bound): count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                },
+            },
+        }
+
+
+class RouteRegistry:
+    """Thread safe, process wide collection of ``RouteStats``."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, metrics):
+        with self._lock:
+            self._routes.setdefault(route, RouteStats()).add(metrics)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: stats.as_dict()
+                for route, stats in sorted(self._routes.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+registry = RouteRegistry()
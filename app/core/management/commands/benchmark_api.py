@@ -0,0 +1,230 @@
+"""
+Django command to benchmark the recipe and user APIs
+"""
+import random
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import benchmarks
+from core.models import AuthToken, Recipe, Tag
+
+PASSWORD = 'Benchpass123'
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API endpoints."""
+    help = (
+        'Seed a throwaway test database and report throughput, latency '
+        'percentiles and query counts of the API endpoints as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument(
+            '--recipes',
+            type=int,
+            default=1000,
+            help='Recipes per user.'
+        )
+        parser.add_argument(
+            '--tags',
+            type=int,
+            default=20,
+            help='Tags per user.'
+        )
+        parser.add_argument(
+            '--tags-per-recipe',
+            type=int,
+            default=3
+        )
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument(
+            '--login-iterations',
+            type=int,
+            default=10,
+            help='Iterations of the token endpoint, which hashes passwords.'
+        )
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON results here.')
+        parser.add_argument(
+            '--compare',
+            help='Print the change against a previous JSON result file.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        random.seed(options['seed'])
+
+        with benchmarks.isolated_database():
+            self.stderr.write('Seeding data...')
+            user = self.seed(options)
+            results = {
+                'environment': benchmarks.environment(),
+                'parameters': {
+                    key: options[key] for key in (
+                        'users', 'recipes', 'tags', 'tags_per_recipe',
+                        'iterations', 'login_iterations', 'warmup', 'seed'
+                    )
+                },
+                'results': {},
+            }
+            for name, func, iterations, overrides in self.scenarios(
+                user, options
+            ):
+                self.stderr.write(f'Running {name}...')
+                with override_settings(**overrides):
+                    results['results'][name] = benchmarks.measure(
+                        func,
+                        iterations,
+                        warmup=min(options['warmup'], iterations)
+                    )
+
+        benchmarks.write_results(options['output'], results, self.stdout)
+        if options['compare']:
+            benchmarks.compare_results(
+                options['compare'], results, self.stderr, self.style
+            )
+
+    def seed(self, options):
+        """Create users, tags and recipes, returning the first user."""
+        password = make_password(PASSWORD)
+        users = get_user_model().objects.bulk_create([
+            get_user_model()(
+                email=f'bench{i}@example.com',
+                name=f'Bench {i}',
+                password=password
+            )
+            for i in range(options['users'])
+        ])
+
+        tags = Tag.objects.bulk_create([
+            Tag(user=user, name=f'tag {i}', description='')
+            for user in users
+            for i in range(options['tags'])
+        ])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                user=user,
+                title=f'Recipe {i}',
+                time_minutes=random.randint(1, 240),
+                price=f'{random.uniform(1, 100):.2f}'
+            )
+            for user in users
+            for i in range(options['recipes'])
+        ], batch_size=5000)
+
+        tags_by_user = {}
+        for tag in tags:
+            tags_by_user.setdefault(tag.user_id, []).append(tag)
+        through = Recipe.tag.through
+        through.objects.bulk_create([
+            through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipes
+            for tag in random.sample(
+                tags_by_user.get(recipe.user_id, []),
+                min(options['tags_per_recipe'], options['tags'])
+            )
+        ], batch_size=5000)
+
+        return users[0]
+
+    def scenarios(self, user, options):
+        """Return (name, callable, iterations, settings) for every endpoint.
+
+        Scenarios run with the response cache disabled, so they measure
+        the query and serializer path. The ``_cached`` ones repeat the
+        cached reads with the configured cache, measuring cache hits.
+        """
+        token = AuthToken.objects.rotate(user, 'benchmark')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        anonymous = APIClient()
+
+        recipe = Recipe.objects.filter(user=user).first()
+        recipes_url = reverse('recipe:recipe-list')
+        recipe_url = reverse('recipe:recipe-detail', args=[recipe.id])
+        tags_url = reverse('recipe:tag-list')
+        payload = {
+            'title': 'Benchmark recipe',
+            'time_minutes': 10,
+            'price': '4.20',
+            'tags': [{'name': 'tag 0'}, {'name': 'benchmark'}],
+        }
+
+        def call(client, method, url, *args, **kwargs):
+            def func():
+                res = getattr(client, method)(url, *args, **kwargs)
+                assert res.status_code < 400, res.content
+            return func
+
+        uncached = {
+            'RECIPE_RESPONSE_CACHE': {
+                **settings.RECIPE_RESPONSE_CACHE,
+                'ALIAS': '',
+            },
+        }
+        cached = {}
+        iterations = options['iterations']
+        return [
+            (
+                'recipe_list',
+                call(client, 'get', recipes_url),
+                iterations,
+                uncached
+            ),
+            (
+                'recipe_retrieve',
+                call(client, 'get', recipe_url),
+                iterations,
+                uncached
+            ),
+            (
+                'recipe_create',
+                call(client, 'post', recipes_url, payload, format='json'),
+                iterations,
+                uncached
+            ),
+            ('tag_list', call(client, 'get', tags_url), iterations, uncached),
+            (
+                'user_me',
+                call(client, 'get', reverse('user:me')),
+                iterations,
+                uncached
+            ),
+            (
+                'token_create',
+                call(
+                    anonymous,
+                    'post',
+                    reverse('user:token'),
+                    {'email': user.email, 'password': PASSWORD}
+                ),
+                options['login_iterations'],
+                uncached
+            ),
+            (
+                'recipe_list_cached',
+                call(client, 'get', recipes_url),
+                iterations,
+                cached
+            ),
+            (
+                'recipe_retrieve_cached',
+                call(client, 'get', recipe_url),
+                iterations,
+                cached
+            ),
+            (
+                'tag_list_cached',
+                call(client, 'get', tags_url),
+                iterations,
+                cached
+            ),
+        ]
@@ -0,0 +1,237 @@
+"""
+Django command to load test the read APIs under ASGI and WSGI
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core import benchmarks
+from core.models import AuthToken, Recipe, Tag
+
+
+class Command(BaseCommand):
+    """Django command to compare the async and sync read endpoints."""
+    help = (
+        'Seed a throwaway test database and report throughput and latency '
+        'percentiles of the async read endpoints served by app.asgi against '
+        'the DRF endpoints served by app.wsgi, at each concurrency, as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipes',
+            type=int,
+            default=500,
+            help='Recipes of the benchmark user.'
+        )
+        parser.add_argument('--tags', type=int, default=20)
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            action='append',
+            help='Requests in flight, may be repeated. Defaults to 1, 10, 50.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests per endpoint, server and concurrency.'
+        )
+        parser.add_argument('--output', help='Write the JSON results here.')
+        parser.add_argument(
+            '--compare',
+            help='Print the change against a previous JSON result file.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        concurrencies = options['concurrency'] or [1, 10, 50]
+        if min(concurrencies) < 1 or options['requests'] < 1:
+            raise CommandError('Concurrency and requests must be positive.')
+
+        # Imported here, the modules build their applications on import.
+        from app.asgi import application as asgi_application
+        from app.wsgi import application as wsgi_application
+
+        with benchmarks.isolated_database():
+            self.stderr.write('Seeding data...')
+            user = self.seed(options)
+            token = AuthToken.objects.rotate(user, 'benchmark')
+            results = {
+                'environment': benchmarks.environment(),
+                'parameters': {
+                    key: options[key]
+                    for key in ('recipes', 'tags', 'requests')
+                },
+                'results': {},
+            }
+            results['parameters']['concurrency'] = concurrencies
+            for name, sync_url, async_url in self.endpoints(user):
+                for concurrency in concurrencies:
+                    self.stderr.write(f'Running {name} x{concurrency}...')
+                    runs = (
+                        ('wsgi', self.run_wsgi, wsgi_application, sync_url),
+                        ('asgi', self.run_asgi, asgi_application, async_url),
+                    )
+                    for server, run, application, url in runs:
+                        latencies, elapsed = run(
+                            application,
+                            url,
+                            token.key,
+                            options['requests'],
+                            concurrency
+                        )
+                        key = f'{name}.{server}.c{concurrency}'
+                        results['results'][key] = {
+                            **benchmarks.summarize(latencies, elapsed),
+                            'concurrency': concurrency,
+                        }
+
+        benchmarks.write_results(options['output'], results, self.stdout)
+        if options['compare']:
+            benchmarks.compare_results(
+                options['compare'], results, self.stderr, self.style
+            )
+
+    def seed(self, options):
+        """Create a user with tagged recipes and return it."""
+        user = get_user_model().objects.create_user(
+            'bench@example.com',
+            name='Bench'
+        )
+        tags = Tag.objects.bulk_create([
+            Tag(user=user, name=f'tag {i}', description='')
+            for i in range(options['tags'])
+        ])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                user=user,
+                title=f'Recipe {i}',
+                time_minutes=i % 240 + 1,
+                price='4.20'
+            )
+            for i in range(options['recipes'])
+        ], batch_size=5000)
+
+        through = Recipe.tag.through
+        through.objects.bulk_create([
+            through(recipe_id=recipe.id, tag_id=tags[i % len(tags)].id)
+            for i, recipe in enumerate(recipes)
+        ] if tags else [], batch_size=5000)
+
+        return user
+
+    def endpoints(self, user):
+        """Return (name, DRF url, async url) of every compared endpoint."""
+        recipe_id = Recipe.objects.filter(user=user).values_list(
+            'id', flat=True
+        ).first()
+        return [
+            (
+                'recipe_list',
+                reverse('recipe:recipe-list'),
+                reverse('recipe:async-recipe-list'),
+            ),
+            (
+                'recipe_retrieve',
+                reverse('recipe:recipe-detail', args=[recipe_id]),
+                reverse('recipe:async-recipe-detail', args=[recipe_id]),
+            ),
+            (
+                'tag_list',
+                reverse('recipe:tag-list'),
+                reverse('recipe:async-tag-list'),
+            ),
+        ]
+
+    def run_wsgi(self, application, url, key, requests, concurrency):
+        """Send requests to the WSGI application from a thread pool."""
+        factory = RequestFactory()
+
+        def call():
+            environ = factory.get(
+                url,
+                HTTP_AUTHORIZATION='Token ' + key
+            ).environ
+            statuses = []
+            start = time.perf_counter()
+            body = application(
+                environ,
+                lambda status, headers, exc_info=None: statuses.append(status)
+            )
+            try:
+                b''.join(body)
+            finally:
+                body.close()
+            latency = time.perf_counter() - start
+            if not statuses[0].startswith('200'):
+                raise CommandError(f'GET {url} returned {statuses[0]}')
+            return latency
+
+        call()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            start = time.perf_counter()
+            futures = [pool.submit(call) for _ in range(requests)]
+            latencies = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+
+        return latencies, elapsed
+
+    def run_asgi(self, application, url, key, requests, concurrency):
+        """Send requests to the ASGI application from one event loop."""
+        path, _, query = url.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Token {key}'.encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+        }
+
+        async def call():
+            statuses = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+
+            start = time.perf_counter()
+            await application(dict(scope), receive, send)
+            latency = time.perf_counter() - start
+            if statuses[0] != 200:
+                raise CommandError(f'GET {url} returned {statuses[0]}')
+            return latency
+
+        async def run():
+            await call()
+            slots = asyncio.Semaphore(concurrency)
+
+            async def limited():
+                async with slots:
+                    return await call()
+
+            start = time.perf_counter()
+            latencies = await asyncio.gather(
+                *[limited() for _ in range(requests)]
+            )
+            return latencies, time.perf_counter() - start
+
+        return asyncio.run(run())
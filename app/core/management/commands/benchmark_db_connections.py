@@ -0,0 +1,131 @@
+"""
+Django command to benchmark the database connection cost per request
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from core import benchmarks
+from core.db.backends.postgresql.base import close_pool, get_pool
+
+POOLED_ENGINE = 'core.db.backends.postgresql'
+
+
+class Command(BaseCommand):
+    """Django command to compare connection reuse strategies."""
+    help = (
+        'Run requests issuing one query against the configured database '
+        'with a new connection per request, persistent connections and, on '
+        'PostgreSQL, pooled connections, and report the latency and '
+        'connections opened per request as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--output', help='Write the JSON results here.')
+        parser.add_argument(
+            '--compare',
+            help='Print the change against a previous JSON result file.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        settings_dict = connections[options['database']].settings_dict
+        results = {
+            'environment': benchmarks.environment(),
+            'parameters': {
+                key: options[key]
+                for key in ('database', 'iterations', 'warmup')
+            },
+            'results': {},
+        }
+        for name, overrides in self.modes(settings_dict):
+            self.stderr.write(f'Running {name}...')
+            results['results'][name] = self.measure(
+                {**settings_dict, **overrides},
+                options['iterations'],
+                options['warmup']
+            )
+
+        benchmarks.write_results(options['output'], results, self.stdout)
+        if options['compare']:
+            benchmarks.compare_results(
+                options['compare'], results, self.stderr, self.style
+            )
+
+    def modes(self, settings_dict):
+        """Return (name, settings overrides) of every strategy."""
+        modes = [
+            ('connect_per_request', {'CONN_MAX_AGE': 0}),
+            ('persistent', {'CONN_MAX_AGE': 60}),
+        ]
+        backend = load_backend(settings_dict['ENGINE'])
+        if backend.DatabaseWrapper.vendor == 'postgresql':
+            pool = dict(settings_dict.get('POOL', {}))
+            pool['MAX_SIZE'] = pool.get('MAX_SIZE') or 10
+            modes.append(('pooled', {
+                'ENGINE': POOLED_ENGINE,
+                'CONN_MAX_AGE': 0,
+                'POOL': pool,
+            }))
+
+        return modes
+
+    def measure(self, settings_dict, iterations, warmup):
+        """Time requests through a connection configured by settings_dict.
+
+        Each request is bracketed by the connection cleanup Django runs
+        when a request starts and finishes.
+        """
+        wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(
+            settings_dict,
+            alias='benchmark'
+        )
+        pooled = settings_dict['ENGINE'] == POOLED_ENGINE
+        opened = []
+
+        def count(sender, connection, **kwargs):
+            if connection is wrapper and not pooled:
+                opened.append(connection)
+
+        def request():
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            wrapper.close_if_unusable_or_obsolete()
+
+        connection_created.connect(count)
+        try:
+            for _ in range(warmup):
+                request()
+            # Pooled connections signal every checkout, count real ones.
+            pool_opened = get_pool(settings_dict).opened if pooled else 0
+            opened.clear()
+
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(iterations):
+                call_start = time.perf_counter()
+                request()
+                latencies.append(time.perf_counter() - call_start)
+            elapsed = time.perf_counter() - start
+
+            if pooled:
+                connects = get_pool(settings_dict).opened - pool_opened
+            else:
+                connects = len(opened)
+        finally:
+            connection_created.disconnect(count)
+            wrapper.close()
+            if pooled:
+                close_pool(settings_dict)
+
+        return {
+            **benchmarks.summarize(latencies, elapsed),
+            'connections_per_request': connects / iterations,
+        }
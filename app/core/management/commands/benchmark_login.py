@@ -0,0 +1,110 @@
+"""
+Django command to benchmark logins under each password hasher policy
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import benchmarks
+from core.hashers import hashers_for_policy
+
+PASSWORD = 'Benchpass123'
+
+
+class Command(BaseCommand):
+    """Django command to measure token issuance per hasher policy."""
+    help = (
+        'Report logins per second on one core through the token endpoint '
+        'for every password hasher policy, as JSON. Passwords are hashed '
+        'in the request thread, without the hashing pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policy',
+            action='append',
+            choices=list(settings.PASSWORD_HASHER_POLICIES),
+            help='Policy to benchmark, may be repeated. Defaults to all.'
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--output', help='Write the JSON results here.')
+        parser.add_argument(
+            '--compare',
+            help='Print the change against a previous JSON result file.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        policies = options['policy'] or list(
+            settings.PASSWORD_HASHER_POLICIES
+        )
+
+        with benchmarks.isolated_database():
+            results = {
+                'environment': benchmarks.environment(),
+                'parameters': {
+                    'iterations': options['iterations'],
+                    'warmup': options['warmup'],
+                    'cost': settings.PASSWORD_HASHER_COST,
+                    'hash_pool_size': 0,
+                },
+                'results': {},
+            }
+            for policy in policies:
+                # The pool would add process IPC to the per core figure.
+                with override_settings(
+                    PASSWORD_HASHERS=hashers_for_policy(policy),
+                    PASSWORD_HASH_POOL={
+                        **settings.PASSWORD_HASH_POOL,
+                        'SIZE': 0,
+                    }
+                ):
+                    try:
+                        make_password(PASSWORD)
+                    except ValueError as exc:
+                        self.stderr.write(f'Skipping {policy}: {exc}')
+                        continue
+
+                    self.stderr.write(f'Running {policy}...')
+                    results['results'][policy] = self.measure(
+                        policy,
+                        options
+                    )
+
+        benchmarks.write_results(options['output'], results, self.stdout)
+        if options['compare']:
+            benchmarks.compare_results(
+                options['compare'], results, self.stderr, self.style
+            )
+
+    def measure(self, policy, options):
+        """Return login statistics for a user hashed under policy."""
+        user = get_user_model().objects.create_user(
+            f'{policy}@example.com',
+            PASSWORD
+        )
+        url = reverse('user:token')
+        client = APIClient()
+
+        def login():
+            res = client.post(
+                url,
+                {'email': user.email, 'password': PASSWORD}
+            )
+            assert res.status_code == 200, res.content
+
+        stats = benchmarks.measure(
+            login,
+            options['iterations'],
+            warmup=options['warmup']
+        )
+        # The benchmark runs on a single thread, so its throughput is the
+        # throughput of one core.
+        stats['logins_per_sec_per_core'] = stats['throughput_per_sec']
+
+        return stats
@@ -0,0 +1,154 @@
+"""
+Django command to benchmark recipe and tag list serialization
+"""
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core import benchmarks
+from core.models import Recipe, Tag
+from recipe.serializers import (
+    RecipeSerializer,
+    TagSerializer,
+    ValuesRepresentation
+)
+from recipe.views import tag_prefetch
+
+
+class Command(BaseCommand):
+    """Django command to compare serializer and values list rendering."""
+    help = (
+        'Seed a throwaway test database and compare rendering a page of '
+        'recipes and tags to JSON through DRF serializers and through the '
+        'fast values representation.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Recipes and tags rendered per page.'
+        )
+        parser.add_argument(
+            '--tags-per-recipe',
+            type=int,
+            default=3
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON results here.')
+        parser.add_argument(
+            '--compare',
+            help='Print the change against a previous JSON result file.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        random.seed(options['seed'])
+
+        with benchmarks.isolated_database():
+            self.stderr.write('Seeding data...')
+            user = self.seed(options)
+            results = {
+                'environment': benchmarks.environment(),
+                'parameters': {
+                    key: options[key] for key in (
+                        'rows', 'tags_per_recipe', 'iterations', 'warmup',
+                        'seed'
+                    )
+                },
+                'results': {},
+            }
+            for name, serializer, queryset in self.scenarios(user):
+                slow, fast = self.renderers(serializer, queryset)
+                if slow() != fast():
+                    raise CommandError(f'{name} renderings differ.')
+
+                for kind, func in (('serializer', slow), ('values', fast)):
+                    self.stderr.write(f'Running {name}_{kind}...')
+                    results['results'][f'{name}_{kind}'] = benchmarks.measure(
+                        func,
+                        options['iterations'],
+                        warmup=options['warmup']
+                    )
+
+        results['speedup'] = {
+            name: (
+                results['results'][f'{name}_serializer']['p50_ms'] /
+                results['results'][f'{name}_values']['p50_ms']
+            )
+            for name in ('recipe_list', 'tag_list')
+        }
+        benchmarks.write_results(options['output'], results, self.stdout)
+        if options['compare']:
+            benchmarks.compare_results(
+                options['compare'], results, self.stderr, self.style
+            )
+
+    def seed(self, options):
+        """Create a user with rows recipes and tags."""
+        user = get_user_model().objects.create_user(
+            'bench@example.com',
+            name='Bench'
+        )
+        tags = Tag.objects.bulk_create([
+            Tag(user=user, name=f'tag {i}', description='')
+            for i in range(options['rows'])
+        ], batch_size=5000)
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                user=user,
+                title=f'Recipe {i}',
+                time_minutes=random.randint(1, 240),
+                price=f'{random.uniform(1, 100):.2f}'
+            )
+            for i in range(options['rows'])
+        ], batch_size=5000)
+
+        through = Recipe.tag.through
+        through.objects.bulk_create([
+            through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipes
+            for tag in random.sample(
+                tags,
+                min(options['tags_per_recipe'], len(tags))
+            )
+        ], batch_size=5000)
+
+        return user
+
+    def scenarios(self, user):
+        """Return (name, serializer, queryset) for every list."""
+        return [
+            (
+                'recipe_list',
+                RecipeSerializer(),
+                Recipe.objects.filter(user=user).order_by('-id')
+                .prefetch_related(tag_prefetch())
+            ),
+            (
+                'tag_list',
+                TagSerializer(),
+                Tag.objects.filter(user=user).order_by('-name')
+            ),
+        ]
+
+    def renderers(self, serializer, queryset):
+        """Return functions rendering queryset both ways to JSON."""
+        renderer = JSONRenderer()
+        representation = ValuesRepresentation.for_serializer(serializer)
+        serializer_class = type(serializer)
+
+        def slow():
+            data = serializer_class(queryset.all(), many=True).data
+            return renderer.render(data)
+
+        def fast():
+            rows = representation.values(queryset.all())
+            return renderer.render(representation.to_representation(rows))
+
+        return slow, fast
@@ -0,0 +1,234 @@
+"""
+Django command to bulk import recipes or tags from a file
+"""
+import csv
+import io
+import itertools
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from core.models import CollectionVersion, Recipe, Tag
+from recipe.serializers import RecipeSerializer, TagSerializer
+from recipe.csv_format import (
+    EXPORT_CSV_TAG_SEPARATOR,
+    EXPORT_CSV_TEXT_FIELDS,
+    unescape_csv_text
+)
+
+
+class Command(BaseCommand):
+    """Django command to import recipes or tags for a user."""
+    help = (
+        'Stream an NDJSON or CSV file of recipes or tags into the database '
+        'for one user, inserting in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import.')
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Email of the user owning the imported rows.'
+        )
+        parser.add_argument(
+            '--model',
+            choices=['recipe', 'tag'],
+            default='recipe',
+            help='Kind of rows in the file.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['ndjson', 'csv'],
+            help='File format, guessed from the extension by default.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows inserted per transaction.'
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Use bulk_create even when PostgreSQL COPY is available.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        try:
+            self.user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist.')
+
+        file_format = options['format'] or options['path'].rsplit('.', 1)[-1]
+        if file_format not in ('ndjson', 'csv'):
+            raise CommandError('Unable to guess the format, use --format.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        self.use_copy = (
+            connection.vendor == 'postgresql' and not options['no_copy']
+        )
+        self.tag_ids = dict(
+            Tag.objects.filter(user=self.user).values_list('name', 'id')
+        )
+        self.skipped = 0
+
+        if options['model'] == 'recipe':
+            serializer, write = RecipeSerializer(), self.write_recipes
+        else:
+            serializer, write = TagSerializer(), self.write_tags
+
+        imported = 0
+        start = time.perf_counter()
+        with open(options['path'], newline='', encoding='utf-8') as stream:
+            rows = self.validate(
+                serializer,
+                getattr(self, f'read_{file_format}')(stream)
+            )
+            while True:
+                batch = list(itertools.islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                with transaction.atomic():
+                    write(batch)
+                imported += len(batch)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f'Imported {imported} rows '
+                    f'({imported / elapsed:.0f} rows/sec)...'
+                )
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} {options["model"]} rows in {elapsed:.2f}s '
+            f'({imported / elapsed if elapsed else 0:.0f} rows/sec), '
+            f'skipped {self.skipped} invalid rows.'
+        ))
+
+    def read_ndjson(self, stream):
+        """Yield (line number, row) for each JSON document in stream."""
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+
+    def read_csv(self, stream):
+        """Yield (line number, row) for each CSV record in stream."""
+        reader = csv.DictReader(stream)
+        for row in reader:
+            for field in EXPORT_CSV_TEXT_FIELDS:
+                if row.get(field) is not None:
+                    row[field] = unescape_csv_text(row[field])
+            if row.get('tags') is not None:
+                names = row['tags'].split(EXPORT_CSV_TAG_SEPARATOR)
+                row['tags'] = [{'name': name} for name in names if name]
+            yield reader.line_num, row
+
+    def validate(self, serializer, rows):
+        """Yield validated data for rows, reporting invalid ones."""
+        for line_number, row in rows:
+            try:
+                if isinstance(row, Exception):
+                    raise serializers.ValidationError(str(row))
+                yield serializer.run_validation(row)
+            except serializers.ValidationError as exc:
+                self.skipped += 1
+                self.stderr.write(f'Line {line_number}: {exc.detail}')
+
+    def resolve_tags(self, names):
+        """Return ids for tag names, creating the ones not seen yet."""
+        missing = [
+            Tag(user=self.user, name=name, description='')
+            for name in dict.fromkeys(names) if name not in self.tag_ids
+        ]
+        if missing:
+            for tag in Tag.objects.bulk_create(missing):
+                self.tag_ids[tag.name] = tag.id
+            CollectionVersion.objects.bump(self.user, CollectionVersion.TAGS)
+
+        return [self.tag_ids[name] for name in names]
+
+    def write_tags(self, batch):
+        """Insert the tags of batch that do not exist yet."""
+        self.resolve_tags([attrs['name'] for attrs in batch])
+
+    def write_recipes(self, batch):
+        """Insert the recipes of batch and link them to their tags."""
+        names = [
+            list(dict.fromkeys(tag['name'] for tag in attrs.pop('tag', [])))
+            for attrs in batch
+        ]
+        tag_ids = iter(self.resolve_tags(
+            [name for recipe_names in names for name in recipe_names]
+        ))
+        recipes = [Recipe(user=self.user, **attrs) for attrs in batch]
+
+        if self.use_copy:
+            self.allocate_ids(recipes)
+            self.copy(recipes)
+        else:
+            Recipe.objects.bulk_create(recipes)
+
+        through = Recipe.tag.through
+        links = [
+            through(recipe_id=recipe.id, tag_id=next(tag_ids))
+            for recipe, recipe_names in zip(recipes, names)
+            for _ in recipe_names
+        ]
+        if self.use_copy:
+            self.copy(links)
+        else:
+            through.objects.bulk_create(links)
+        CollectionVersion.objects.bump(self.user, CollectionVersion.RECIPES)
+
+    def allocate_ids(self, objs):
+        """Reserve primary keys for objs from their table's sequence."""
+        opts = objs[0]._meta
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+                'FROM generate_series(1, %s)',
+                [opts.db_table, opts.pk.column, len(objs)]
+            )
+            for obj, (pk,) in zip(objs, cursor.fetchall()):
+                obj.pk = pk
+
+    def copy(self, objs):
+        """Insert objs with a single PostgreSQL COPY statement."""
+        if not objs:
+            return
+
+        opts = objs[0]._meta
+        fields = [
+            field for field in opts.concrete_fields
+            if not (field.primary_key and objs[0].pk is None)
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objs:
+            writer.writerow([
+                field.get_db_prep_save(field.pre_save(obj, True), connection)
+                for field in fields
+            ])
+        buffer.seek(0)
+
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(field.column) for field in fields)
+        not_null = ', '.join(
+            quote(field.column) for field in fields if not field.null
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {quote(opts.db_table)} ({columns}) FROM STDIN '
+                f'WITH (FORMAT csv, FORCE_NOT_NULL ({not_null}))',
+                buffer
+            )
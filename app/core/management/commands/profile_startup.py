@@ -0,0 +1,148 @@
+"""
+Django command to profile process startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmarks
+
+MODES = {
+    'full': {'ENABLE_ADMIN': '1', 'ENABLE_API_DOCS': '1'},
+    'lean': {'ENABLE_ADMIN': '0', 'ENABLE_API_DOCS': '0'},
+}
+
+
+def parse_import_times(output):
+    """Return (module, self ms, cumulative ms) of python -X importtime."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # The column header.
+            continue
+        imports.append(
+            (fields[2].strip(), self_us / 1000, cumulative_us / 1000)
+        )
+
+    return imports
+
+
+class Command(BaseCommand):
+    """Django command to report where startup time goes."""
+    help = (
+        'Boot the project in fresh processes, with and without the admin '
+        'and API docs, and report the time of each startup phase, of each '
+        'app ready() and of the slowest imports as JSON.'
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            action='append',
+            choices=list(MODES),
+            help='Configuration to profile, may be repeated. Defaults to all.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Processes started per mode.'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=15,
+            help='Packages and modules listed per mode.'
+        )
+        parser.add_argument('--output', help='Write the JSON results here.')
+        parser.add_argument(
+            '--compare',
+            help='Print the change against a previous JSON result file.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        if options['repeat'] < 1:
+            raise CommandError('Repeat must be positive.')
+
+        results = {
+            'environment': benchmarks.environment(),
+            'parameters': {'repeat': options['repeat']},
+            'results': {},
+        }
+        for mode in options['mode'] or list(MODES):
+            self.stderr.write(f'Profiling {mode}...')
+            results['results'][mode] = self.profile(
+                MODES[mode],
+                options['repeat'],
+                options['limit']
+            )
+
+        benchmarks.write_results(options['output'], results, self.stdout)
+        if options['compare']:
+            benchmarks.compare_results(
+                options['compare'], results, self.stderr, self.style
+            )
+
+    def profile(self, env, repeat, limit):
+        """Start repeat processes with env and summarize their startup."""
+        runs = [self.run(env) for _ in range(repeat)]
+        totals = [timings['total_ms'] / 1000 for timings, _ in runs]
+        # Import details are taken from the median run.
+        timings, imports = sorted(runs, key=lambda run: run[0]['total_ms'])[
+            len(runs) // 2
+        ]
+
+        packages = defaultdict(float)
+        for module, self_ms, _ in imports:
+            packages[module.split('.')[0]] += self_ms
+
+        return {
+            **benchmarks.summarize(totals, sum(totals)),
+            'modules_imported': len(imports),
+            'phases_ms': {
+                phase: statistics.median(
+                    run[0]['phases_ms'][phase] for run in runs
+                )
+                for phase in timings['phases_ms']
+            },
+            'ready_ms': timings['ready_ms'],
+            'imported_in': timings['imported_in'],
+            'packages_ms': dict(sorted(
+                packages.items(), key=lambda item: -item[1]
+            )[:limit]),
+            'modules_ms': {
+                module: cumulative_ms
+                for module, _, cumulative_ms in sorted(
+                    imports, key=lambda item: -item[2]
+                )[:limit]
+            },
+        }
+
+    def run(self, env):
+        """Boot the project in a new process, return timings and imports."""
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'core.startup'],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True
+        )
+        if process.returncode:
+            raise CommandError(
+                'Startup failed:\n' + process.stderr[-2000:]
+            )
+
+        return json.loads(process.stdout), parse_import_times(process.stderr)
@@ -0,0 +1,57 @@
+"""
+Django command to delete expired auth tokens in batches
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import AuthToken
+
+
+class Command(BaseCommand):
+    """Django command to reap expired auth tokens."""
+    help = (
+        'Delete auth tokens that have expired, a batch per transaction, so '
+        'requests never have to.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tokens deleted per transaction.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to pause between batches.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        now = timezone.now()
+        expired = AuthToken.objects.expired(now).order_by('id')
+        total = 0
+        while True:
+            with transaction.atomic():
+                ids = list(expired.values_list('id', flat=True)[:batch_size])
+                if not ids:
+                    break
+                # A regular delete, so the post_delete handlers run too.
+                deleted, _ = AuthToken.objects.filter(id__in=ids).delete()
+                total += deleted
+
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {total} expired tokens.')
+        )
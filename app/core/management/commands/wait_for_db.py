@@ -1,25 +1,132 @@
 """
 Django Command to wait for the database to available
 """
+import math
+import random
 import time
-from django.core.management.base import BaseCommand
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 from psycopg2 import OperationalError as Psycopg2OperationalError
-from django.db import OperationalError
+from django.db import OperationalError, connections
+from django.db.utils import load_backend
+
+# Seconds given to a probe still running at the deadline.
+GRACE_PERIOD = 1
 
 
 class Command(BaseCommand):
     """Django command to wait for database."""
+    help = (
+        'Wait until every database alias answers a query, retrying with '
+        'exponential backoff and jitter, and exit with an error when one '
+        'is still unavailable after the timeout.'
+    )
+    # The checks would import every view before the database is needed.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Alias to wait for, may be repeated. Defaults to all.'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=60,
+            help='Seconds to wait before failing.'
+        )
+        parser.add_argument(
+            '--initial-delay',
+            type=float,
+            default=0.1,
+            help='Seconds to wait after the first failed probe.'
+        )
+        parser.add_argument(
+            '--max-delay',
+            type=float,
+            default=5,
+            help='Upper bound of the delay between probes.'
+        )
 
     def handle(self, *args, **options):
         """Handle the command."""
+        aliases = options['databases'] or list(settings.DATABASES)
+        deadline = time.monotonic() + options['timeout']
+
         self.stdout.write('Waiting for database...')
-        db_up = False
-        while not db_up:
+        executor = ThreadPoolExecutor(max_workers=len(aliases))
+        futures = {
+            alias: executor.submit(self.wait, alias, deadline, options)
+            for alias in aliases
+        }
+        # A probe can block past the deadline, don't wait for it there.
+        wait(
+            futures.values(),
+            timeout=max(0, deadline - time.monotonic()) + GRACE_PERIOD
+        )
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        unavailable = [
+            alias for alias, future in futures.items()
+            if not (future.done() and future.result())
+        ]
+        if unavailable:
+            raise CommandError(
+                f'Database unavailable after {options["timeout"]}s: '
+                + ', '.join(unavailable)
+            )
+
+        self.stdout.write(self.style.SUCCESS('Database available!'))
+
+    def wait(self, alias, deadline, options):
+        """Probe alias until it answers or the deadline passes.
+
+        Returns whether the database became available.
+        """
+        attempt = 0
+        while True:
             try:
-                self.check(databases=['default'])
-                db_up = True
+                self.probe(alias, deadline - time.monotonic())
+                return True
             except (Psycopg2OperationalError, OperationalError):
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
 
-        self.stdout.write(self.style.SUCCESS('Database available!'))
+                delay = min(
+                    options['max_delay'],
+                    options['initial_delay'] * 2 ** attempt
+                )
+                # Jitter spreads the probes of containers started together.
+                delay = min(remaining, random.uniform(delay / 2, delay))
+                self.stdout.write(
+                    f'Database {alias} unavailable, '
+                    f'waiting {delay:.2f} seconds...'
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    def probe(self, alias, timeout):
+        """Run a trivial query on alias with a fresh connection, giving up
+        connecting after timeout seconds where the backend supports it.
+        """
+        settings_dict = connections[alias].settings_dict
+        backend = load_backend(settings_dict['ENGINE'])
+        options = dict(settings_dict['OPTIONS'])
+        if backend.DatabaseWrapper.vendor == 'postgresql':
+            # libpq takes whole seconds, and treats 1 as 2.
+            options['connect_timeout'] = max(1, math.ceil(timeout))
+
+        connection = backend.DatabaseWrapper(
+            {**settings_dict, 'OPTIONS': options},
+            alias
+        )
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        finally:
+            connection.close()
@@ -0,0 +1,78 @@
+"""
+Middleware for the app project.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from core.instrumentation import collect, registry
+
+
+class RequestMetricsMiddleware:
+    """Measure queries, database, serializer and total time per request.
+
+    The measurements are sent to the client as a ``Server-Timing`` header
+    and aggregated per route in ``core.instrumentation.registry``,
+    including the queries a streaming response makes while its body is
+    produced. The middleware runs natively in both modes, so async views
+    under ASGI are not pushed onto a thread by it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with collect() as metrics:
+            response = self.get_response(request)
+
+        return self.record(request, response, metrics)
+
+    async def __acall__(self, request):
+        with collect() as metrics:
+            response = await self.get_response(request)
+
+        return self.record(request, response, metrics)
+
+    def record(self, request, response, metrics):
+        """Add the Server-Timing header and aggregate the metrics."""
+        response['Server-Timing'] = metrics.server_timing()
+        if response.streaming:
+            response.streaming_content = self.stream(
+                request,
+                response.streaming_content,
+                metrics
+            )
+        else:
+            self.aggregate(request, metrics)
+
+        return response
+
+    def stream(self, request, content, metrics):
+        """Yield content, collecting into metrics while it is produced.
+
+        The headers leave before the body, so Server-Timing only covers
+        the view, while the registry gets the metrics of the whole
+        response once it has streamed or the client went away.
+        """
+        content = iter(content)
+        try:
+            while True:
+                with collect(metrics):
+                    chunk = next(content, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.aggregate(request, metrics)
+
+    def aggregate(self, request, metrics):
+        """Add metrics to the stats of the request's route."""
+        match = request.resolver_match
+        route = match.view_name if match else '<unresolved>'
+        registry.record(f'{request.method} {route}', metrics)
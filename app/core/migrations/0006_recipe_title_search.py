@@ -0,0 +1,93 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# On SQLite, titles are searched through an FTS5 table kept in sync by
+# triggers on core_recipe. SQLite migrations altering core_recipe remake
+# the table, which drops the triggers and silently leaves the search
+# results stale. Such a migration has to create the triggers below again,
+# and rebuild the search table. The core.E001 database check, run by
+# migrate and check --database, reports triggers gone missing.
+SQLITE_FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE core_recipe_fts USING fts5(
+        title,
+        content='core_recipe',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_recipe_fts_insert AFTER INSERT ON core_recipe BEGIN
+        INSERT INTO core_recipe_fts (rowid, title)
+        VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER core_recipe_fts_delete AFTER DELETE ON core_recipe BEGIN
+        INSERT INTO core_recipe_fts (core_recipe_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER core_recipe_fts_update AFTER UPDATE OF title
+    ON core_recipe BEGIN
+        INSERT INTO core_recipe_fts (core_recipe_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+        INSERT INTO core_recipe_fts (rowid, title)
+        VALUES (new.id, new.title);
+    END
+    """,
+    "INSERT INTO core_recipe_fts (core_recipe_fts) VALUES ('rebuild')",
+]
+
+
+def search_indexes():
+    return [
+        GinIndex(
+            SearchVector('title', config='english'),
+            name='recipe_title_search_idx'
+        ),
+        GinIndex(
+            OpClass('title', name='gin_trgm_ops'),
+            name='recipe_title_trgm_idx'
+        ),
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    """Index recipe titles for full text search on this database."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        Recipe = apps.get_model('core', 'Recipe')
+        for index in search_indexes():
+            schema_editor.add_index(Recipe, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        Recipe = apps.get_model('core', 'Recipe')
+        for index in search_indexes():
+            schema_editor.remove_index(Recipe, index)
+    elif vendor == 'sqlite':
+        for action in ('insert', 'delete', 'update'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS core_recipe_fts_{action}'
+            )
+        schema_editor.execute('DROP TABLE IF EXISTS core_recipe_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_collection_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
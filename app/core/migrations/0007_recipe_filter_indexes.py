@@ -0,0 +1,28 @@
+# Generated by Django 4.1.3 on 2026-10-17 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_recipe_title_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'time_minutes'], name='recipe_user_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'price'], name='recipe_user_price_idx'),
+        ),
+        # The auto created through table cannot declare indexes, this one
+        # serves tag id lookups grouped by recipe from the index alone.
+        migrations.RunSQL(
+            'CREATE INDEX core_recipe_tag_tag_recipe_idx '
+            'ON core_recipe_tag (tag_id, recipe_id)',
+            'DROP INDEX core_recipe_tag_tag_recipe_idx',
+        ),
+    ]
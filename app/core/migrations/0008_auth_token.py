@@ -0,0 +1,54 @@
+# Generated by Django 4.1.3 on 2026-10-17 02:25
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+LEGACY_TOKEN_TABLE = 'authtoken_token'
+
+
+def copy_legacy_tokens(apps, schema_editor):
+    """Carry rest_framework.authtoken tokens over, expiring after a TTL."""
+    connection = schema_editor.connection
+    if LEGACY_TOKEN_TABLE not in connection.introspection.table_names():
+        return
+
+    AuthToken = apps.get_model('core', 'AuthToken')
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT key, user_id FROM {LEGACY_TOKEN_TABLE}')
+        rows = cursor.fetchall()
+
+    expires_at = timezone.now() + timedelta(seconds=settings.AUTH_TOKEN_TTL)
+    AuthToken.objects.bulk_create([
+        AuthToken(key=key, user_id=user_id, expires_at=expires_at)
+        for key, user_id in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_recipe_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=40, unique=True)),
+                ('device', models.CharField(blank=True, max_length=64)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='authtoken',
+            index=models.Index(fields=['user', 'device'], name='authtoken_user_device_idx'),
+        ),
+        migrations.RunPython(copy_legacy_tokens, migrations.RunPython.noop),
+    ]
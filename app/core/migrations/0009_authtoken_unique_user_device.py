@@ -0,0 +1,44 @@
+# Generated by Django 4.1.3 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+def delete_duplicate_tokens(apps, schema_editor):
+    """Keep only the newest token of each user and device."""
+    AuthToken = apps.get_model('core', 'AuthToken')
+    seen = set()
+    duplicates = []
+    tokens = AuthToken.objects.order_by('-created', '-id').values_list(
+        'id', 'user_id', 'device'
+    )
+    for token_id, user_id, device in tokens.iterator():
+        if (user_id, device) in seen:
+            duplicates.append(token_id)
+        seen.add((user_id, device))
+
+    for start in range(0, len(duplicates), 1000):
+        AuthToken.objects.filter(
+            id__in=duplicates[start:start + 1000]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_auth_token'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_tokens,
+            migrations.RunPython.noop
+        ),
+        migrations.RemoveIndex(
+            model_name='authtoken',
+            name='authtoken_user_device_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='authtoken',
+            constraint=models.UniqueConstraint(fields=('user', 'device'), name='unique_authtoken_user_device'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+"""
+Mixins for the API views.
+"""
+from rest_framework.permissions import SAFE_METHODS
+
+from core.db.routers import (
+    allow_replica_reads,
+    record_write,
+    routing_scope,
+    wrote_recently
+)
+
+
+class ReplicaReadMixin:
+    """View mixin serving safe requests from a database replica.
+
+    Once a request is authenticated, GET, HEAD and OPTIONS requests may
+    read from the replicas in ``DB_REPLICAS['ALIASES']``, unless the user
+    wrote in the last ``DB_REPLICAS['STICKY_SECONDS']``, so users always
+    read their own writes. Every other request records a write.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with routing_scope():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            if not wrote_recently(request.user):
+                allow_replica_reads()
+        else:
+            record_write(request.user)
@@ -1,8 +1,14 @@
 """
 Database Models
 """
+import binascii
+import os
+from datetime import timedelta
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, \
     PermissionsMixin
 
@@ -45,6 +51,29 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    def set_password(self, raw_password):
+        """Hash raw_password in the password hashing pool."""
+        # Imported on use, app loading does not need multiprocessing.
+        from core.hashing import hash_pool
+
+        self.password = hash_pool.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Verify raw_password in the hashing pool, upgrading its hash."""
+        from core.hashing import hash_pool
+
+        valid, password = hash_pool.check_password(
+            raw_password,
+            self.password
+        )
+        if valid and password:
+            # Password hash upgrades shouldn't be considered password changes.
+            self.password = password
+            self.save(update_fields=['password'])
+
+        return valid
+
 
 class Recipe(models.Model):
     """Recipe object."""
@@ -56,6 +85,23 @@ class Recipe(models.Model):
     time_minutes = models.IntegerField()
     price = models.DecimalField(max_digits=5, decimal_places=2)
     tag = models.ManyToManyField('Tag')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', '-id'],
+                name='recipe_user_id_desc_idx'
+            ),
+            models.Index(
+                fields=['user', 'time_minutes'],
+                name='recipe_user_time_idx'
+            ),
+            models.Index(
+                fields=['user', 'price'],
+                name='recipe_user_price_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -69,6 +115,141 @@ class Tag(models.Model):
     )
     name = models.CharField(max_length=255)
     description = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', '-name'],
+                name='tag_user_name_desc_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class CollectionVersionManager(models.Manager):
+    """Manager for collection versions."""
+
+    def bump(self, user, *collections):
+        """Increment the version of each of the user's collections."""
+        now = timezone.now()
+        bump = {'version': F('version') + 1, 'updated_at': now}
+        rows = self.filter(user=user, collection__in=collections)
+        if rows.update(**bump) == len(collections):
+            return
+
+        existing = set(rows.values_list('collection', flat=True))
+        for collection in set(collections) - existing:
+            row, created = self.get_or_create(
+                user=user,
+                collection=collection,
+                defaults={'version': 1, 'updated_at': now}
+            )
+            if not created:
+                self.filter(pk=row.pk).update(**bump)
+
+    def current(self, user, collection):
+        """Return the version and last change time of a collection."""
+        row = self.filter(
+            user=user,
+            collection=collection
+        ).values_list('version', 'updated_at').first()
+
+        return row or (0, None)
+
+
+class CollectionVersion(models.Model):
+    """Version of a user's collection, bumped whenever it changes."""
+    RECIPES = 'recipes'
+    TAGS = 'tags'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE
+    )
+    collection = models.CharField(max_length=32)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    objects = CollectionVersionManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'collection'],
+                name='unique_user_collection_version'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.collection} v{self.version}'
+
+
+class AuthTokenQuerySet(models.QuerySet):
+    """Queries over auth tokens."""
+
+    def expired(self, now=None):
+        """Return the tokens that expired by now."""
+        return self.filter(expires_at__lte=now or timezone.now())
+
+    def rotate(self, user, device=''):
+        """Replace the user's token for device with a new one.
+
+        Rotations of a user are serialized by locking the user's row, so
+        concurrent logins from one device never leave two live tokens,
+        which the unique constraint on user and device also enforces.
+        """
+        with transaction.atomic(using=self.db):
+            users = type(user)._default_manager.using(self.db)
+            list(users.select_for_update().filter(pk=user.pk).values_list(
+                'pk', flat=True
+            ))
+            self.filter(user=user, device=device).delete()
+            return self.create(
+                user=user,
+                device=device,
+                expires_at=timezone.now() + timedelta(
+                    seconds=settings.AUTH_TOKEN_TTL
+                )
+            )
+
+
+class AuthToken(models.Model):
+    """Expiring API token of a user, one per device."""
+    key = models.CharField(max_length=40, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='auth_tokens'
+    )
+    device = models.CharField(max_length=64, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = AuthTokenQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'device'],
+                name='unique_authtoken_user_device'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = self.generate_key()
+        return super().save(*args, **kwargs)
+
+    @staticmethod
+    def generate_key():
+        return binascii.hexlify(os.urandom(20)).decode()
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def __str__(self):
+        return f'{self.device or "token"} of {self.user_id}'
@@ -0,0 +1,46 @@
+"""
+Renderers for the API.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer encoding straight to bytes with orjson.
+
+    Values orjson has no native encoding for, such as ``Decimal``, and
+    datetimes, whose precision DRF trims to milliseconds, are handed to
+    DRF's own encoder so they render like ``JSONRenderer``. Floats are the
+    exception, orjson writes the same numbers in its own notation, say
+    ``0.00001`` for ``1e-05``, and renders NaN and infinities as ``null``
+    where strict ``JSONRenderer`` fails. Indented output, and every
+    request when orjson is not installed, fall back to ``JSONRenderer``.
+    """
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+        # Escape the line separators like JSONRenderer, keeping the output
+        # a strict javascript subset.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace(
+            '\u2029'.encode(), b'\\u2029'
+        )
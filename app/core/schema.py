@@ -0,0 +1,95 @@
+"""
+Cached OpenAPI schema view.
+"""
+import hashlib
+import json
+import threading
+
+import yaml
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_spectacular.views import SpectacularAPIView
+
+# Rendered schemas of this process, keyed by the request variant.
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def clear_schema_cache():
+    """Forget the schemas rendered by this process."""
+    with _schemas_lock:
+        _schemas.clear()
+
+
+def load_schema_file(path):
+    """Return the schema written to path by the spectacular command."""
+    with open(path) as stream:
+        if path.endswith('.json'):
+            return json.load(stream)
+        return yaml.safe_load(stream)
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """Schema view rendering each variant of the document once per process.
+
+    The schema only changes with the code, so it is rendered on the first
+    request for a media type, version and language and served from memory
+    afterwards, with an ETag of its content for conditional GETs. With
+    ``API_SCHEMA_FILE`` set, the document written at build time by
+    ``manage.py spectacular --file`` is served instead of generated.
+    Schemas that depend on the user, when not ``serve_public``, are
+    generated on every request.
+    """
+    query_budget = {'get': 0}
+
+    def _get_schema_response(self, request):
+        if not self.serve_public:
+            return super()._get_schema_response(request)
+
+        key = (
+            request.accepted_media_type,
+            self.api_version or request.version,
+            request.GET.get('version'),
+            translation.get_language(),
+        )
+        with _schemas_lock:
+            schema = _schemas.get(key)
+        if schema is None:
+            schema = self.render_schema(request)
+            with _schemas_lock:
+                schema = _schemas.setdefault(key, schema)
+
+        content, content_type, etag = schema
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, no_cache=True)
+
+        return response
+
+    def render_schema(self, request):
+        """Return the content, content type and ETag of the schema."""
+        if settings.API_SCHEMA_FILE:
+            data = load_schema_file(settings.API_SCHEMA_FILE)
+        else:
+            data = super()._get_schema_response(request).data
+
+        renderer = request.accepted_renderer
+        content = renderer.render(
+            data,
+            request.accepted_media_type,
+            self.get_renderer_context()
+        )
+        if isinstance(content, str):
+            content = content.encode(renderer.charset or 'utf-8')
+
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type += f'; charset={renderer.charset}'
+
+        etag = '"%s"' % hashlib.md5(content).hexdigest()
+        return content, content_type, etag
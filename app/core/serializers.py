@@ -0,0 +1,19 @@
+"""
+Serializer base classes shared between apps.
+"""
+from rest_framework import serializers
+
+from core.instrumentation import serializer_timer
+
+
+class TimedSerializerMixin:
+    """Serializer mixin recording the time spent building ``.data``."""
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """List serializer recording the time spent building ``.data``."""
@@ -0,0 +1,88 @@
+"""
+Startup timing of a fresh process.
+
+Run as ``python -X importtime -m core.startup`` by the profile_startup
+command, it boots the project the way a worker does and prints, as JSON,
+the time of every phase and the phase that imported each watched module.
+Only the standard library is imported before the clock starts.
+"""
+import importlib
+import json
+import os
+import sys
+import time
+
+# Modules lean workers should import late or not at all, reported with
+# the phase that first imported them.
+WATCHED_MODULES = (
+    'django.contrib.admin.sites',
+    'drf_spectacular.openapi',
+    'core.admin',
+    'rest_framework.authentication',
+    'rest_framework.serializers',
+    'core.hashing',
+)
+
+
+def timed_ready(timings):
+    """Make every AppConfig created from now on time its ready()."""
+    from django.apps import AppConfig
+
+    create = AppConfig.create.__func__
+
+    def timed_create(cls, entry):
+        app_config = create(cls, entry)
+        ready = app_config.ready
+
+        def timed():
+            start = time.perf_counter()
+            ready()
+            timings[app_config.label] = (time.perf_counter() - start) * 1000
+
+        app_config.ready = timed
+        return app_config
+
+    AppConfig.create = classmethod(timed_create)
+
+
+def main():
+    """Boot the project and print the phase timings."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    phases = {}
+    ready = {}
+    imported_in = dict.fromkeys(WATCHED_MODULES)
+    start = time.perf_counter()
+
+    def phase(name, func):
+        phase_start = time.perf_counter()
+        result = func()
+        phases[name] = (time.perf_counter() - phase_start) * 1000
+        for module, first in imported_in.items():
+            if first is None and module in sys.modules:
+                imported_in[module] = name
+        return result
+
+    phase('django', lambda: importlib.import_module('django'))
+    timed_ready(ready)
+    from django.conf import settings
+
+    phase('settings', lambda: settings.INSTALLED_APPS)
+
+    import django
+
+    phase('setup', django.setup)
+    phase('urls', lambda: importlib.import_module(settings.ROOT_URLCONF))
+
+    from django.core.handlers.wsgi import WSGIHandler
+
+    phase('middleware', WSGIHandler)
+    json.dump({
+        'total_ms': (time.perf_counter() - start) * 1000,
+        'phases_ms': phases,
+        'ready_ms': ready,
+        'imported_in': imported_in,
+    }, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Tests for the benchmark helpers.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core import benchmarks
+
+
+class BenchmarkHelperTests(TestCase):
+    """Test measuring callables for the benchmark commands."""
+
+    def test_percentile(self):
+        """Test the nearest-rank percentile."""
+        values = list(range(1, 101))
+
+        self.assertEqual(benchmarks.percentile(values, 0.5), 50)
+        self.assertEqual(benchmarks.percentile(values, 0.99), 99)
+        self.assertEqual(benchmarks.percentile([3], 0.99), 3)
+
+    def test_measure_counts_queries(self):
+        """Test measure reports iterations and queries per call."""
+        calls = []
+
+        def func():
+            calls.append(get_user_model().objects.count())
+
+        result = benchmarks.measure(func, iterations=4, warmup=2)
+
+        self.assertEqual(len(calls), 6)
+        self.assertEqual(result['iterations'], 4)
+        self.assertEqual(result['queries_per_call'], 1)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
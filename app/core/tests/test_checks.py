@@ -0,0 +1,34 @@
+"""
+Tests for the core system checks.
+"""
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from core.checks import check_recipe_search_triggers
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite search table only')
+class RecipeSearchTriggersCheckTests(TestCase):
+    """Test the check of the SQLite recipe search triggers."""
+
+    def test_triggers_present(self):
+        """Test a migrated database passes the check."""
+        errors = check_recipe_search_triggers(None, databases=['default'])
+
+        self.assertEqual(errors, [])
+
+    def test_trigger_missing(self):
+        """Test a dropped trigger is reported."""
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER core_recipe_fts_update')
+
+        errors = check_recipe_search_triggers(None, databases=['default'])
+
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+        self.assertIn('core_recipe_fts_update', errors[0].msg)
+
+    def test_databases_not_checked(self):
+        """Test the check only runs for the databases it is given."""
+        self.assertEqual(check_recipe_search_triggers(None), [])
@@ -2,35 +2,346 @@
 """
 Test custom Django management commands.
 """
-from unittest.mock import patch
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import ANY, MagicMock, patch
 
 from psycopg2 import OperationalError as Psycopg2OperationalError
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.management.commands import wait_for_db
+from core.management.commands.profile_startup import parse_import_times
+from core.models import AuthToken, Recipe, Tag
+from user.authentication import token_cache
 
 
 # Create your tests here.
-@patch('core.management.commands.wait_for_db.Command.check')
+@patch('core.management.commands.wait_for_db.Command.probe')
 class CommandTests(SimpleTestCase):
     """Test for command to wait for db"""
 
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_probe):
         """Test waiting for db when db is available"""
-        patched_check.return_value = True
+        patched_probe.return_value = None
 
-        call_command('wait_for_db')
+        call_command('wait_for_db', database=['default'], stdout=StringIO())
 
-        patched_check.assert_called_once_with(databases=['default'])
+        patched_probe.assert_called_once_with('default', ANY)
 
     @patch('time.sleep')
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
+    def test_wait_for_db_delay(self, patched_sleep, patched_probe):
         """Test waiting for db when getting OperationalError"""
-        patched_check.side_effect = [Psycopg2OperationalError] * 2 \
-            + [OperationalError] * 3 + [True]
+        patched_probe.side_effect = [Psycopg2OperationalError] * 2 \
+            + [OperationalError] * 3 + [None]
+
+        call_command('wait_for_db', database=['default'], stdout=StringIO())
+
+        self.assertEqual(patched_probe.call_count, 6)
+        patched_probe.assert_called_with('default', ANY)
+
+    @patch('time.sleep')
+    def test_wait_for_db_backoff(self, patched_sleep, patched_probe):
+        """Test the delay between probes grows up to the maximum"""
+        patched_probe.side_effect = [OperationalError] * 6 + [None]
+
+        call_command(
+            'wait_for_db',
+            database=['default'],
+            initial_delay=0.1,
+            max_delay=1,
+            stdout=StringIO()
+        )
+
+        delays = [call.args[0] for call in patched_sleep.call_args_list]
+        self.assertLess(delays[0], 0.11)
+        self.assertGreaterEqual(delays[3], 0.4)
+        for delay in delays:
+            self.assertLessEqual(delay, 1)
+
+    @patch('time.sleep')
+    def test_wait_for_db_timeout(self, patched_sleep, patched_probe):
+        """Test the command fails once the timeout passes"""
+        patched_probe.side_effect = OperationalError
+
+        with self.assertRaisesMessage(CommandError, 'default'):
+            call_command(
+                'wait_for_db',
+                database=['default'],
+                timeout=0,
+                stdout=StringIO()
+            )
+
+        patched_sleep.assert_not_called()
+
+    def test_wait_for_db_all_aliases(self, patched_probe):
+        """Test every configured alias is probed by default"""
+        with patch(
+            'core.management.commands.wait_for_db.settings'
+        ) as patched_settings:
+            patched_settings.DATABASES = {'default': {}, 'replica_0': {}}
+            call_command('wait_for_db', stdout=StringIO())
+
+        self.assertEqual(
+            sorted(call.args[0] for call in patched_probe.call_args_list),
+            ['default', 'replica_0']
+        )
+
+    def test_wait_for_db_hanging_probe(self, patched_probe):
+        """Test a probe that never returns does not outlast the deadline"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        patched_probe.side_effect = lambda alias, timeout: release.wait(10)
+
+        start = time.monotonic()
+        with self.assertRaisesMessage(CommandError, 'default'):
+            call_command(
+                'wait_for_db',
+                database=['default'],
+                timeout=0.1,
+                stdout=StringIO()
+            )
+
+        self.assertLess(time.monotonic() - start, 5)
+        timeout = patched_probe.call_args.args[1]
+        self.assertLessEqual(timeout, 0.1)
+
+
+class WaitForDbProbeTests(SimpleTestCase):
+    """Test the connection made by a wait_for_db probe"""
+
+    @patch('core.management.commands.wait_for_db.load_backend')
+    def test_probe_connect_timeout(self, patched_load_backend):
+        """Test postgres probes connect with the remaining time"""
+        backend = MagicMock()
+        backend.DatabaseWrapper.vendor = 'postgresql'
+        patched_load_backend.return_value = backend
+
+        wait_for_db.Command().probe('default', 2.5)
+
+        settings_dict = backend.DatabaseWrapper.call_args.args[0]
+        self.assertEqual(settings_dict['OPTIONS']['connect_timeout'], 3)
+        backend.DatabaseWrapper.return_value.close.assert_called_once()
+
+
+class ImportRecipesCommandTests(TestCase):
+    """Test for command to import recipes and tags"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.tag = Tag.objects.create(user=self.user, name='lunch')
+
+    def import_file(self, content, suffix, *args):
+        """Write content to a temporary file and import it."""
+        with tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, delete=False
+        ) as stream:
+            stream.write(content)
+        self.addCleanup(os.remove, stream.name)
+
+        out, err = StringIO(), StringIO()
+        call_command(
+            'import_recipes', stream.name, '--user', self.user.email,
+            *args, stdout=out, stderr=err
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_import_ndjson_recipes(self):
+        """Test importing recipes from NDJSON in batches"""
+        content = (
+            '{"title": "First", "time_minutes": 5, "price": "1.50", '
+            '"tags": [{"name": "lunch"}, {"name": "quick"}]}\n'
+            '\n'
+            '{"title": "Second", "time_minutes": 10, "price": "2.00"}\n'
+            '{"title": "Third", "time_minutes": 15, "price": "3.00", '
+            '"tags": [{"name": "quick"}]}\n'
+        )
+
+        out, err = self.import_file(content, '.ndjson', '--batch-size', '2')
+
+        self.assertEqual(err, '')
+        self.assertIn('Imported 3 recipe rows', out)
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [recipe.title for recipe in recipes],
+            ['First', 'Second', 'Third']
+        )
+        self.assertEqual(
+            sorted(tag.name for tag in recipes[0].tag.all()),
+            ['lunch', 'quick']
+        )
+        self.assertIn(self.tag, recipes[0].tag.all())
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+    def test_import_csv_unescapes_formulas(self):
+        """Test text quoted by the CSV export is imported as written"""
+        content = (
+            'id,title,time_minutes,price,tags\n'
+            '7,\'=1+1,5,1.50,\'-hot|mild\n'
+            '8,\'\'@home,5,1.50,\n'
+            '9,\'plain,5,1.50,\n'
+        )
+
+        self.import_file(content, '.csv')
+
+        recipes = Recipe.objects.filter(user=self.user).order_by('title')
+        self.assertEqual(
+            [recipe.title for recipe in recipes],
+            ["'@home", "'plain", '=1+1']
+        )
+        self.assertEqual(
+            sorted(tag.name for tag in recipes[2].tag.all()),
+            ['-hot', 'mild']
+        )
+
+    def test_import_csv_recipes(self):
+        """Test importing recipes from CSV with tag names"""
+        content = (
+            'id,title,time_minutes,price,tags\n'
+            '7,Toast,5,1.50,lunch|breakfast\n'
+        )
+
+        self.import_file(content, '.csv')
+
+        recipe = Recipe.objects.get(user=self.user)
+        self.assertEqual(recipe.title, 'Toast')
+        self.assertEqual(
+            sorted(tag.name for tag in recipe.tag.all()),
+            ['breakfast', 'lunch']
+        )
+
+    def test_import_skips_invalid_rows(self):
+        """Test invalid rows are reported and skipped"""
+        content = (
+            '{"title": "Valid", "time_minutes": 5, "price": "1.50"}\n'
+            '{"title": "Invalid", "time_minutes": "soon", "price": "1"}\n'
+            'not json\n'
+        )
+
+        out, err = self.import_file(content, '.ndjson')
+
+        self.assertIn('Line 2:', err)
+        self.assertIn('Line 3:', err)
+        self.assertIn('skipped 2 invalid rows', out)
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_import_tags_deduplicated(self):
+        """Test importing tags skips names the user already has"""
+        content = '{"name": "lunch"}\n{"name": "dinner"}\n{"name": "dinner"}\n'
+
+        self.import_file(content, '.ndjson', '--model', 'tag')
+
+        self.assertEqual(
+            sorted(Tag.objects.values_list('name', flat=True)),
+            ['dinner', 'lunch']
+        )
+
+    def test_import_unknown_user(self):
+        """Test importing for an unknown user fails"""
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_recipes', 'recipes.ndjson', '--user', 'no@example.com'
+            )
+
+
+class ReapTokensCommandTests(TestCase):
+    """Test for command to delete expired auth tokens"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+
+    def create_token(self, device, seconds):
+        return AuthToken.objects.create(
+            user=self.user,
+            device=device,
+            expires_at=timezone.now() + timedelta(seconds=seconds)
+        )
+
+    def test_reap_expired_tokens_in_batches(self):
+        """Test only expired tokens are deleted, across batches"""
+        for i in range(5):
+            self.create_token(f'old {i}', -60)
+        valid = self.create_token('new', 60)
+
+        out = StringIO()
+        call_command('reap_tokens', '--batch-size', '2', stdout=out)
+
+        self.assertIn('Deleted 5 expired tokens', out.getvalue())
+        self.assertEqual(list(AuthToken.objects.all()), [valid])
+
+    def test_reap_invalidates_cached_tokens(self):
+        """Test reaped tokens are dropped from the authentication cache"""
+        token = self.create_token('old', -60)
+        token_cache.set(token.key, (self.user, token))
+
+        call_command('reap_tokens', stdout=StringIO())
+
+        self.assertIsNone(token_cache.get(token.key))
+
+    def test_reap_invalid_batch_size(self):
+        """Test a batch size below one is rejected"""
+        with self.assertRaises(CommandError):
+            call_command('reap_tokens', '--batch-size', '0')
+
+
+class ProfileStartupCommandTests(SimpleTestCase):
+    """Test for command to profile process startup"""
+
+    def test_parse_import_times(self):
+        """Test python -X importtime output is parsed to milliseconds"""
+        output = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       150 |        150 |   encodings.aliases',
+            'import time:      2000 |       2150 | encodings',
+            'Traceback (most recent call last):',
+        ])
+
+        self.assertEqual(parse_import_times(output), [
+            ('encodings.aliases', 0.15, 0.15),
+            ('encodings', 2.0, 2.15),
+        ])
+
+    def test_profile_startup(self):
+        """Test startup of a lean process is profiled"""
+        out = StringIO()
 
-        call_command('wait_for_db')
+        call_command(
+            'profile_startup',
+            mode=['lean'],
+            repeat=1,
+            stdout=out,
+            stderr=StringIO()
+        )
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
+        result = json.loads(out.getvalue())['results']['lean']
+        self.assertEqual(
+            set(result['phases_ms']),
+            {'django', 'settings', 'setup', 'urls', 'middleware'}
+        )
+        self.assertIn('user', result['ready_ms'])
+        self.assertNotIn('admin', result['ready_ms'])
+        self.assertGreater(result['modules_imported'], 0)
+        imported_in = result['imported_in']
+        # Views import the schema decorators, never the generator.
+        self.assertIsNone(imported_in['drf_spectacular.openapi'])
+        self.assertIsNone(imported_in['core.admin'])
+        self.assertIsNone(imported_in['core.hashing'])
+        # App loading, shared by management commands, stays free of DRF.
+        self.assertEqual(imported_in['rest_framework.serializers'], 'urls')
+        self.assertEqual(imported_in['rest_framework.authentication'], 'urls')
@@ -0,0 +1,165 @@
+"""
+Tests for the database connection pool.
+"""
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.db.backends.postgresql import base
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    """Connection recording whether it was closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test checking connections out of and into the pool."""
+
+    def setUp(self):
+        self.pool = ConnectionPool(max_size=2, idle_timeout=60, timeout=0.01)
+        self.opened = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def test_released_connection_reused(self):
+        """Test a released connection is handed out again."""
+        connection = self.pool.acquire(self.connect)
+        self.pool.release(connection)
+
+        self.assertIs(self.pool.acquire(self.connect), connection)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.pool.opened, 1)
+
+    def test_most_recently_used_first(self):
+        """Test the most recently released connection is reused first."""
+        first = self.pool.acquire(self.connect)
+        second = self.pool.acquire(self.connect)
+        self.pool.release(first)
+        self.pool.release(second)
+
+        self.assertIs(self.pool.acquire(self.connect), second)
+
+    def test_max_size_times_out(self):
+        """Test acquiring beyond max_size fails after the timeout."""
+        self.pool.acquire(self.connect)
+        self.pool.acquire(self.connect)
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire(self.connect)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_waiter_gets_released_connection(self):
+        """Test a blocked acquire gets the next released connection."""
+        pool = ConnectionPool(max_size=1, idle_timeout=60, timeout=5)
+        connection = pool.acquire(self.connect)
+        acquired = []
+        waiter = threading.Thread(
+            target=lambda: acquired.append(pool.acquire(self.connect))
+        )
+        waiter.start()
+
+        pool.release(connection)
+        waiter.join()
+
+        self.assertEqual(acquired, [connection])
+
+    def test_unreusable_connection_closed(self):
+        """Test connections released as unreusable are closed."""
+        connection = self.pool.acquire(self.connect)
+        self.pool.release(connection, reusable=False)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(len(self.pool), 0)
+        self.assertIsNot(self.pool.acquire(self.connect), connection)
+
+    def test_failed_check_discards(self):
+        """Test idle connections failing the check are replaced."""
+        connection = self.pool.acquire(self.connect)
+        self.pool.release(connection)
+
+        acquired = self.pool.acquire(self.connect, check=lambda conn: False)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(acquired, connection)
+
+    def test_failed_connect_frees_slot(self):
+        """Test a failing connect does not use up the pool."""
+        def connect():
+            raise OSError('connection refused')
+
+        for _ in range(3):
+            with self.assertRaises(OSError):
+                self.pool.acquire(connect)
+
+        self.pool.acquire(self.connect)
+        self.pool.acquire(self.connect)
+
+    @patch('core.db.pool.time.monotonic')
+    def test_idle_connections_expire(self, patched_monotonic):
+        """Test connections idle past idle_timeout are closed."""
+        patched_monotonic.return_value = 100
+        old = self.pool.acquire(self.connect)
+        new = self.pool.acquire(self.connect)
+        self.pool.release(old)
+
+        patched_monotonic.return_value = 159
+        self.pool.release(new)
+        self.assertEqual(len(self.pool), 2)
+
+        patched_monotonic.return_value = 160
+        self.assertIs(self.pool.acquire(self.connect), new)
+        self.assertTrue(old.closed)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_close(self):
+        """Test closing the pool closes idle connections."""
+        connection = self.pool.acquire(self.connect)
+        self.pool.release(connection)
+
+        self.pool.close()
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(len(self.pool), 0)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Test the pools of the pooled PostgreSQL backend."""
+
+    settings_dict = {
+        'HOST': 'db',
+        'PORT': '',
+        'NAME': 'app',
+        'USER': 'app',
+        'POOL': {'MAX_SIZE': 3},
+    }
+
+    def test_pool_per_database(self):
+        """Test databases share a pool only when they are the same."""
+        pool = base.get_pool(self.settings_dict)
+
+        self.assertIs(base.get_pool(dict(self.settings_dict)), pool)
+        self.assertIsNot(
+            base.get_pool({**self.settings_dict, 'NAME': 'test_app'}),
+            pool
+        )
+        self.assertEqual(pool.max_size, 3)
+        self.assertEqual(pool.idle_timeout, base.POOL_DEFAULTS['IDLE_TIMEOUT'])
+
+    def test_pool_per_process(self):
+        """Test forked processes never share pooled connections."""
+        pool = base.get_pool(self.settings_dict)
+
+        with patch('core.db.backends.postgresql.base.os.getpid') as getpid:
+            getpid.return_value = -1
+            self.assertIsNot(base.get_pool(self.settings_dict), pool)
@@ -0,0 +1,114 @@
+"""
+Tests for the password hasher policies.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.hashers import hashers_for_policy
+
+TOKEN_URL = reverse('user:token')
+FAST_COST = {
+    'PBKDF2_ITERATIONS': 1000,
+    'SCRYPT_WORK_FACTOR': 2 ** 10,
+    'ARGON2_TIME_COST': 1,
+    'ARGON2_MEMORY_COST': 1024,
+    'ARGON2_PARALLELISM': 1,
+}
+
+
+@override_settings(PASSWORD_HASHER_COST=FAST_COST)
+class HasherPolicyTests(TestCase):
+    """Test choosing, tuning and upgrading password hashers."""
+
+    def login(self, email, password='Testpass123'):
+        res = APIClient().post(
+            TOKEN_URL,
+            {'email': email, 'password': password}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def create_user(self, policy):
+        with override_settings(PASSWORD_HASHERS=hashers_for_policy(policy)):
+            return get_user_model().objects.create_user(
+                f'{policy}@example.com',
+                'Testpass123'
+            )
+
+    def test_hashers_for_policy(self):
+        """Test the policy hasher is preferred and the others kept."""
+        hashers = hashers_for_policy('scrypt')
+
+        self.assertEqual(hashers[0], 'core.hashers.TunedScryptPasswordHasher')
+        self.assertCountEqual(
+            hashers,
+            settings.PASSWORD_HASHER_POLICIES.values()
+        )
+
+    def test_settings_follow_policy(self):
+        """Test the configured hashers are ordered by the policy."""
+        self.assertEqual(
+            settings.PASSWORD_HASHERS,
+            hashers_for_policy(settings.PASSWORD_HASHER_POLICY)
+        )
+
+    def test_unknown_policy(self):
+        """Test an unknown policy raises an error."""
+        with self.assertRaises(ValueError):
+            hashers_for_policy('md5')
+
+    def test_new_passwords_use_policy(self):
+        """Test new passwords are hashed by the preferred hasher."""
+        user = self.create_user('scrypt')
+
+        self.assertTrue(user.password.startswith('scrypt$1024$'))
+
+    def test_upgrade_on_login(self):
+        """Test a login rehashes passwords of a previous policy."""
+        user = self.create_user('pbkdf2')
+
+        with override_settings(PASSWORD_HASHERS=hashers_for_policy('scrypt')):
+            self.login(user.email)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+        self.assertTrue(user.check_password('Testpass123'))
+
+    def test_rehash_on_cost_change(self):
+        """Test a login rehashes passwords made with another cost."""
+        user = self.create_user('pbkdf2')
+        cost = {**FAST_COST, 'PBKDF2_ITERATIONS': 2000}
+
+        with override_settings(
+            PASSWORD_HASHERS=hashers_for_policy('pbkdf2'),
+            PASSWORD_HASHER_COST=cost
+        ):
+            self.login(user.email)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_django_default_hashes_verify(self):
+        """Test hashes of Django's default hasher still verify."""
+        with override_settings(PASSWORD_HASHERS=[
+            'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        ]):
+            encoded = make_password('Testpass123')
+
+        self.assertTrue(check_password('Testpass123', encoded))
+
+    def test_scrypt_large_work_factor(self):
+        """Test scrypt work factors above OpenSSL's memory default work."""
+        cost = {**FAST_COST, 'SCRYPT_WORK_FACTOR': 2 ** 15}
+        with override_settings(
+            PASSWORD_HASHERS=hashers_for_policy('scrypt'),
+            PASSWORD_HASHER_COST=cost
+        ):
+            encoded = make_password('Testpass123')
+
+            self.assertTrue(check_password('Testpass123', encoded))
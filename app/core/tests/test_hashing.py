@@ -0,0 +1,172 @@
+"""
+Tests for the password hashing pool.
+"""
+import os
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.test import APIClient
+
+from core.hashing import HashingUnavailable, PasswordHashPool, hash_pool
+
+POOL = {'SIZE': 1, 'QUEUE_DEPTH': 0, 'TIMEOUT': 10}
+
+
+def get_pid(config):
+    return os.getpid()
+
+
+def sleep(config, seconds):
+    time.sleep(seconds)
+
+
+class PasswordHashPoolTests(SimpleTestCase):
+    """Test hashing passwords in worker processes."""
+
+    def setUp(self):
+        self.pool = PasswordHashPool()
+        self.addCleanup(self.pool.shutdown)
+
+    @override_settings(PASSWORD_HASH_POOL=POOL)
+    def test_runs_in_worker_process(self):
+        """Test tasks run in another process."""
+        self.assertNotEqual(self.pool.run(get_pid), os.getpid())
+
+    @override_settings(PASSWORD_HASH_POOL={**POOL, 'SIZE': 0})
+    def test_runs_inline_without_workers(self):
+        """Test a pool size of 0 hashes in the calling thread."""
+        self.assertEqual(self.pool.run(get_pid), os.getpid())
+
+    @override_settings(PASSWORD_HASH_POOL=POOL)
+    def test_make_and_check_password(self):
+        """Test hashes made in the pool verify in and out of it."""
+        encoded = self.pool.make_password('Testpass123')
+
+        self.assertTrue(check_password('Testpass123', encoded))
+        self.assertEqual(
+            self.pool.check_password('Testpass123', encoded),
+            (True, None)
+        )
+        self.assertEqual(
+            self.pool.check_password('wrong', encoded),
+            (False, None)
+        )
+
+    @override_settings(PASSWORD_HASH_POOL=POOL)
+    def test_unusable_passwords(self):
+        """Test unusable passwords never reach the workers."""
+        encoded = self.pool.make_password(None)
+
+        self.assertEqual(
+            self.pool.check_password('Testpass123', encoded),
+            (False, None)
+        )
+
+    @override_settings(PASSWORD_HASH_POOL=POOL)
+    def test_saturated_pool_rejects(self):
+        """Test tasks beyond size plus queue depth fail fast."""
+        started = threading.Event()
+
+        def occupy():
+            started.set()
+            self.pool.run(sleep, 1)
+
+        thread = threading.Thread(target=occupy)
+        thread.start()
+        self.addCleanup(thread.join)
+        started.wait()
+        time.sleep(0.1)
+
+        with self.assertRaises(HashingUnavailable):
+            self.pool.run(get_pid)
+
+    @override_settings(PASSWORD_HASH_POOL={**POOL, 'TIMEOUT': 2})
+    def test_expected_wait_beyond_timeout_rejects(self):
+        """Test tasks that would time out are rejected without waiting."""
+        self.pool._hash_time = 5
+        start = time.perf_counter()
+
+        with self.assertRaises(HashingUnavailable) as context:
+            self.pool.run(get_pid)
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(context.exception.wait, 5)
+
+    @override_settings(PASSWORD_HASH_POOL=POOL)
+    def test_hash_time_recorded(self):
+        """Test the duration of finished tasks is tracked."""
+        self.pool.run(sleep, 0.1)
+
+        self.assertGreaterEqual(self.pool._hash_time, 0.1)
+        self.assertGreaterEqual(self.pool.expected_wait(), 0.1)
+
+    @override_settings(PASSWORD_HASH_POOL={**POOL, 'TIMEOUT': 0.05})
+    def test_slow_task_times_out(self):
+        """Test waiting on a task gives up after the timeout."""
+        with self.assertRaises(HashingUnavailable):
+            self.pool.run(sleep, 1)
+
+
+class HashingUnavailableApiTests(TestCase):
+    """Test login and signup report a saturated pool."""
+
+    def setUp(self):
+        get_user_model().objects.create_user('user@example.com', 'Testpass123')
+
+    def test_model_layer_not_api_specific(self):
+        """Test the model raises a plain exception outside the API."""
+        user = get_user_model()(email='other@example.com')
+        with mock.patch.object(
+            hash_pool,
+            'run',
+            side_effect=HashingUnavailable(wait=3)
+        ):
+            with self.assertRaises(HashingUnavailable) as context:
+                user.set_password('Testpass123')
+
+        self.assertNotIsInstance(context.exception, APIException)
+
+    def test_login_busy(self):
+        """Test logins return a 503 asking clients to retry."""
+        with mock.patch.object(
+            hash_pool,
+            'run',
+            side_effect=HashingUnavailable()
+        ):
+            res = APIClient().post(
+                reverse('user:token'),
+                {'email': 'user@example.com', 'password': 'Testpass123'}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res['Retry-After'], '1')
+        self.assertEqual(res.data['detail'].code, 'hashing_unavailable')
+
+    def test_signup_busy(self):
+        """Test signups return a 503 asking clients to retry."""
+        with mock.patch.object(
+            hash_pool,
+            'run',
+            side_effect=HashingUnavailable()
+        ):
+            res = APIClient().post(
+                reverse('user:create'),
+                {
+                    'email': 'new@example.com',
+                    'password': 'Testpass123',
+                    'name': 'New',
+                }
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(
+            get_user_model().objects.filter(email='new@example.com').exists()
+        )
@@ -0,0 +1,157 @@
+"""
+Tests for request metrics instrumentation.
+"""
+import subprocess
+import sys
+from datetime import timedelta
+
+from asgiref.sync import SyncToAsync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.instrumentation import RouteStats, RequestMetrics, registry
+from core.models import AuthToken, Recipe
+
+METRICS_URL = reverse('metrics')
+RECIPES_URL = reverse('recipe:recipe-list')
+ASYNC_TAGS_URL = reverse('recipe:async-tag-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    """Test metrics collected for API requests."""
+
+    def setUp(self):
+        registry.reset()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        """Test responses report query count and timings."""
+        Recipe.objects.create(
+            user=self.user,
+            title='Recipe',
+            time_minutes=10,
+            price='1.00'
+        )
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        timing = res['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="3 queries"', timing)
+        self.assertIn('serializer;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_metrics_aggregated_per_route(self):
+        """Test requests are aggregated by method and view name."""
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+
+        stats = registry.snapshot()['GET recipe:recipe-list']
+
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['queries']['max'], 2)
+        self.assertEqual(sum(stats['total_ms']['histogram'].values()), 2)
+
+    def test_streamed_queries_aggregated(self):
+        """Test queries made while streaming a response are counted."""
+        Recipe.objects.create(
+            user=self.user,
+            title='Recipe',
+            time_minutes=10,
+            price='1.00'
+        )
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertIn('desc="0 queries"', res['Server-Timing'])
+        self.assertNotIn('GET recipe:recipe-export', registry.snapshot())
+        b''.join(res.streaming_content)
+        stats = registry.snapshot()['GET recipe:recipe-export']
+        self.assertEqual(stats['count'], 1)
+        self.assertEqual(stats['queries']['max'], 2)
+
+    def test_asgi_middleware_chain_is_async(self):
+        """Test no middleware pushes ASGI requests onto a thread."""
+        chain = ASGIHandler()._middleware_chain
+
+        self.assertNotIsInstance(chain, SyncToAsync)
+        self.assertTrue(iscoroutinefunction(chain))
+
+    async def test_async_request_queries_counted(self):
+        """Test queries of async views are counted."""
+        token = await AuthToken.objects.acreate(
+            user=self.user,
+            expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        res = await self.async_client.get(
+            ASYNC_TAGS_URL,
+            AUTHORIZATION='Token ' + token.key
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('desc="2 queries"', res['Server-Timing'])
+        stats = registry.snapshot()['GET recipe:async-tag-list']
+        self.assertEqual(stats['queries']['max'], 2)
+
+    def test_metrics_endpoint_requires_staff(self):
+        """Test only staff users can read the metrics."""
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_endpoint_for_staff(self):
+        """Test staff users can read the per route metrics."""
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(RECIPES_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('GET recipe:recipe-list', res.data)
+
+
+class RouteStatsTests(TestCase):
+    """Test aggregating request metrics."""
+
+    def test_percentiles_from_histogram(self):
+        """Test percentiles are estimated from the latency buckets."""
+        stats = RouteStats()
+        for total_time in [0.0005] * 98 + [0.3, 0.3]:
+            metrics = RequestMetrics()
+            metrics.total_time = total_time
+            stats.add(metrics)
+
+        self.assertEqual(stats.percentile(0.5), 1)
+        self.assertEqual(stats.percentile(0.99), 300)
+
+    def test_import_without_rest_framework(self):
+        """Test the query counter installed at startup skips DRF."""
+        process = subprocess.run(
+            [
+                sys.executable, '-c',
+                'import sys, core.instrumentation; '
+                'print("rest_framework" in sys.modules)'
+            ],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+
+        self.assertEqual(process.stdout.strip(), 'False')
@@ -2,6 +2,8 @@
 Tests for models.
 """
 
+from django.db import connection
+from django.db.models import Count
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -88,3 +90,83 @@ class ModelTests(TestCase):
         )
 
         self.assertEqual(str(tag), tag.name)
+
+    def test_bump_collection_version(self):
+        """Test bumping creates, then increments, collection versions."""
+        user = create_user()
+        Version = models.CollectionVersion
+
+        self.assertEqual(Version.objects.current(user, Version.RECIPES)[0], 0)
+        Version.objects.bump(user, Version.RECIPES)
+        Version.objects.bump(user, Version.RECIPES, Version.TAGS)
+
+        self.assertEqual(Version.objects.current(user, Version.RECIPES)[0], 2)
+        self.assertEqual(Version.objects.current(user, Version.TAGS)[0], 1)
+
+
+class ModelIndexTests(TestCase):
+    """Test list queries are served by the composite user indexes."""
+
+    def setUp(self):
+        self.user = create_user()
+
+    def explain(self, queryset):
+        """Return the database query plan for queryset."""
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be sequentially scanned.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertIndexScanWithoutSort(self, plan):
+        """Assert the plan uses an index and does not sort the rows."""
+        if connection.vendor == 'postgresql':
+            self.assertIn('Index', plan)
+            self.assertNotIn('Sort', plan)
+        else:
+            self.assertIn('USING', plan)
+            self.assertIn('INDEX', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_recipe_list_uses_user_id_index(self):
+        """Test listing recipes by user newest first needs no sort."""
+        queryset = models.Recipe.objects.filter(
+            user=self.user
+        ).order_by('-id')[:50]
+
+        self.assertIndexScanWithoutSort(self.explain(queryset))
+
+    def test_tag_list_uses_user_name_index(self):
+        """Test listing tags by user and name needs no sort."""
+        queryset = models.Tag.objects.filter(
+            user=self.user
+        ).order_by('-name')
+
+        self.assertIndexScanWithoutSort(self.explain(queryset))
+
+    def test_recipe_time_filter_uses_user_time_index(self):
+        """Test filtering recipes by time uses the user time index."""
+        queryset = models.Recipe.objects.filter(
+            user=self.user,
+            time_minutes__lte=30
+        )
+
+        self.assertIn('recipe_user_time_idx', self.explain(queryset))
+
+    def test_recipe_price_filter_uses_user_price_index(self):
+        """Test filtering recipes by price uses the user price index."""
+        queryset = models.Recipe.objects.filter(
+            user=self.user,
+            price__lte=10
+        )
+
+        self.assertIn('recipe_user_price_idx', self.explain(queryset))
+
+    def test_recipe_tag_lookup_uses_tag_recipe_index(self):
+        """Test grouping links of tags by recipe reads only the index."""
+        through = models.Recipe.tag.through
+        queryset = through.objects.filter(
+            tag_id__in=[1, 2]
+        ).values('recipe_id').annotate(count=Count('tag_id'))
+
+        self.assertIn('core_recipe_tag_tag_recipe_idx', self.explain(queryset))
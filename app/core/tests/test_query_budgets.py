@@ -0,0 +1,424 @@
+"""
+Tests for the query budgets of the API views.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from rest_framework.test import APIClient
+
+from core.models import AuthToken, CollectionVersion, Recipe, Tag
+from core.schema import CachedSchemaView, clear_schema_cache
+from core.tests.utils import QueryBudgetMixin
+from core.views import RequestMetricsView
+from recipe import async_views
+from recipe.views import RecipeViewSet, TagViewSet
+from user.views import (
+    CreateTokenView,
+    CreateUserView,
+    ManageUserView,
+    TokenDetailView,
+    TokenListView,
+)
+
+PROJECT_APPS = ('core.', 'recipe.', 'user.')
+RECIPES_URL = reverse('recipe:recipe-list')
+RECIPES_BULK_URL = reverse('recipe:recipe-bulk')
+TAGS_URL = reverse('recipe:tag-list')
+ME_URL = reverse('user:me')
+
+
+def iter_views(patterns):
+    """Yield the view callback of every pattern in a URL configuration."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.callback
+
+
+class QueryBudgetDeclarationTests(TestCase):
+    """Test every project API view declares a query budget."""
+
+    def test_views_declare_budgets(self):
+        """Test each routed action of the project has a query budget."""
+        for callback in iter_views(get_resolver().url_patterns):
+            cls = getattr(callback, 'cls', None) or getattr(
+                callback, 'view_class', None
+            )
+            if cls is None or not cls.__module__.startswith(PROJECT_APPS):
+                continue
+
+            actions = getattr(callback, 'actions', None)
+            if actions:
+                expected = set(actions.values())
+            else:
+                expected = {
+                    method for method in cls.http_method_names
+                    if method not in ('head', 'options') and
+                    hasattr(cls, method)
+                }
+            with self.subTest(view=cls.__name__):
+                budget = getattr(cls, 'query_budget', {})
+                self.assertEqual(expected - set(budget), set())
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Test API requests stay within their budget at any data size."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+            name='Test User'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tag = Tag.objects.create(user=self.user, name='Tag')
+        Tag.objects.create(user=self.user, name='New')
+        AuthToken.objects.rotate(self.user)
+        self.bump_versions()
+
+    def bump_versions(self):
+        CollectionVersion.objects.bump(
+            self.user,
+            CollectionVersion.RECIPES,
+            CollectionVersion.TAGS
+        )
+
+    def seed_recipes(self, size):
+        """Create size recipes linked to two tags each."""
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                user=self.user,
+                title=f'Recipe {i}',
+                time_minutes=10,
+                price=Decimal('1.00')
+            )
+            for i in range(size)
+        ])
+        tags = Tag.objects.bulk_create([
+            Tag(user=self.user, name=f'Tag {i}', description='')
+            for i in range(size)
+        ])
+        through = Recipe.tag.through
+        through.objects.bulk_create([
+            through(recipe_id=recipe.id, tag_id=tag_id)
+            for recipe, tag in zip(recipes, tags)
+            for tag_id in (tag.id, self.tag.id)
+        ])
+        self.bump_versions()
+        return recipes
+
+    def token_client(self):
+        """Return a client authenticated by a token already cached."""
+        token = AuthToken.objects.rotate(self.user, 'token client')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        client.get(ME_URL)
+        return client
+
+    def recipe_payload(self, title='Recipe'):
+        return {
+            'title': title,
+            'time_minutes': 10,
+            'price': '2.50',
+            'tags': [{'name': 'Tag'}, {'name': 'New'}],
+        }
+
+    def recipe_url(self, recipe):
+        return reverse('recipe:recipe-detail', args=[recipe.id])
+
+    def test_recipe_list(self):
+        """Test listing recipes."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(RECIPES_URL, {'page_size': 500})
+
+        self.assertQueryBudget(RecipeViewSet, 'list', prepare)
+
+    def test_recipe_search(self):
+        """Test searching recipes."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(
+                RECIPES_URL, {'search': 'recipe', 'page_size': 500}
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'search', prepare)
+
+    def test_recipe_filter(self):
+        """Test filtering recipes by tags and ranges."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(RECIPES_URL, {
+                'tags': f'{self.tag.id}',
+                'tags_match': 'all',
+                'max_time': 30,
+                'max_price': '5',
+                'page_size': 500,
+            })
+
+        self.assertQueryBudget(RecipeViewSet, 'list', prepare)
+
+    @override_settings(RECIPE_FAST_LIST=True)
+    def test_recipe_fast_list(self):
+        """Test listing recipes from values rows."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(RECIPES_URL, {'page_size': 500})
+
+        self.assertQueryBudget(RecipeViewSet, 'list', prepare)
+
+    def test_recipe_retrieve(self):
+        """Test retrieving a recipe."""
+        def prepare(size):
+            recipe = self.seed_recipes(size)[0]
+            return lambda: self.client.get(self.recipe_url(recipe))
+
+        self.assertQueryBudget(RecipeViewSet, 'retrieve', prepare)
+
+    def test_recipe_create(self):
+        """Test creating a recipe with tags."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.post(
+                RECIPES_URL, self.recipe_payload(), format='json'
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'create', prepare)
+
+    def test_recipe_update(self):
+        """Test replacing a recipe with tags."""
+        def prepare(size):
+            recipe = self.seed_recipes(size)[0]
+            return lambda: self.client.put(
+                self.recipe_url(recipe), self.recipe_payload(), format='json'
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'update', prepare)
+
+    def test_recipe_partial_update(self):
+        """Test partially updating a recipe."""
+        def prepare(size):
+            recipe = self.seed_recipes(size)[0]
+            return lambda: self.client.patch(
+                self.recipe_url(recipe), {'title': 'New'}, format='json'
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'partial_update', prepare)
+
+    def test_recipe_destroy(self):
+        """Test deleting a recipe."""
+        def prepare(size):
+            recipe = self.seed_recipes(size)[0]
+            return lambda: self.client.delete(self.recipe_url(recipe))
+
+        self.assertQueryBudget(RecipeViewSet, 'destroy', prepare)
+
+    def test_recipe_bulk_create(self):
+        """Test bulk creating recipes."""
+        def prepare(size):
+            payload = [self.recipe_payload(f'Bulk {i}') for i in range(size)]
+            return lambda: self.client.post(
+                RECIPES_BULK_URL, payload, format='json'
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'bulk_create', prepare)
+
+    def test_recipe_bulk_update(self):
+        """Test bulk updating recipes with tags."""
+        def prepare(size):
+            payload = [
+                {'id': recipe.id, **self.recipe_payload()}
+                for recipe in self.seed_recipes(size)
+            ]
+            return lambda: self.client.patch(
+                RECIPES_BULK_URL, payload, format='json'
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'bulk_update', prepare)
+
+    def test_recipe_bulk_destroy(self):
+        """Test bulk deleting recipes."""
+        def prepare(size):
+            ids = [recipe.id for recipe in self.seed_recipes(size)]
+            return lambda: self.client.delete(
+                RECIPES_BULK_URL, ids, format='json'
+            )
+
+        self.assertQueryBudget(RecipeViewSet, 'bulk_destroy', prepare)
+
+    def test_recipe_export(self):
+        """Test exporting recipes."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(reverse('recipe:recipe-export'))
+
+        self.assertQueryBudget(RecipeViewSet, 'export', prepare)
+
+    def test_tag_list(self):
+        """Test listing tags."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(TAGS_URL)
+
+        self.assertQueryBudget(TagViewSet, 'list', prepare)
+
+    def test_tag_update(self):
+        """Test replacing a tag."""
+        url = reverse('recipe:tag-detail', args=[self.tag.id])
+
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.put(url, {'name': 'Renamed'})
+
+        self.assertQueryBudget(TagViewSet, 'update', prepare)
+
+    def test_tag_partial_update(self):
+        """Test partially updating a tag."""
+        url = reverse('recipe:tag-detail', args=[self.tag.id])
+
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.patch(url, {'name': 'Renamed'})
+
+        self.assertQueryBudget(TagViewSet, 'partial_update', prepare)
+
+    def test_tag_destroy(self):
+        """Test deleting a tag used by recipes."""
+        def prepare(size):
+            recipe = self.seed_recipes(size)[0]
+            tag = recipe.tag.exclude(id=self.tag.id).get()
+            url = reverse('recipe:tag-detail', args=[tag.id])
+            return lambda: self.client.delete(url)
+
+        self.assertQueryBudget(TagViewSet, 'destroy', prepare)
+
+    def test_user_me(self):
+        """Test retrieving and updating the authenticated user."""
+        for method, payload in (
+            ('get', None),
+            ('put', {
+                'email': 'new@example.com',
+                'name': 'New',
+                'password': 'Testpass123',
+            }),
+            ('patch', {'name': 'Newer'}),
+        ):
+            def prepare(size):
+                self.seed_recipes(size)
+                return lambda: getattr(self.client, method)(ME_URL, payload)
+
+            with self.subTest(method=method):
+                self.assertQueryBudget(ManageUserView, method, prepare)
+
+    def test_async_recipe_list(self):
+        """Test listing recipes through the async view."""
+        client = self.token_client()
+
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: client.get(
+                reverse('recipe:async-recipe-list'), {'page_size': 500}
+            )
+
+        self.assertQueryBudget(async_views.RecipeListView, 'get', prepare)
+
+    def test_async_recipe_retrieve(self):
+        """Test retrieving a recipe through the async view."""
+        client = self.token_client()
+
+        def prepare(size):
+            recipe = self.seed_recipes(size)[0]
+            url = reverse('recipe:async-recipe-detail', args=[recipe.id])
+            return lambda: client.get(url)
+
+        self.assertQueryBudget(async_views.RecipeDetailView, 'get', prepare)
+
+    def test_async_tag_list(self):
+        """Test listing tags through the async view."""
+        client = self.token_client()
+
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: client.get(reverse('recipe:async-tag-list'))
+
+        self.assertQueryBudget(async_views.TagListView, 'get', prepare)
+
+    def test_user_create(self):
+        """Test creating a user."""
+        def prepare(size):
+            start = get_user_model().objects.count()
+            get_user_model().objects.bulk_create([
+                get_user_model()(email=f'seed{start + i}@example.com')
+                for i in range(size)
+            ])
+            email = f'new{size}@example.com'
+            return lambda: APIClient().post(
+                reverse('user:create'),
+                {'email': email, 'password': 'Testpass123', 'name': 'New'}
+            )
+
+        self.assertQueryBudget(CreateUserView, 'post', prepare)
+
+    def test_token_create(self):
+        """Test creating a token."""
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: APIClient().post(
+                reverse('user:token'),
+                {'email': self.user.email, 'password': 'Testpass123'}
+            )
+
+        self.assertQueryBudget(CreateTokenView, 'post', prepare)
+
+    def test_token_list(self):
+        """Test listing the user's tokens."""
+        def prepare(size):
+            for i in range(size):
+                AuthToken.objects.rotate(self.user, f'Device {size} {i}')
+            return lambda: self.client.get(reverse('user:tokens'))
+
+        self.assertQueryBudget(TokenListView, 'get', prepare)
+
+    def test_token_revoke_all(self):
+        """Test revoking all the user's tokens."""
+        def prepare(size):
+            for i in range(size):
+                AuthToken.objects.rotate(self.user, f'Device {i}')
+            return lambda: self.client.delete(reverse('user:tokens'))
+
+        self.assertQueryBudget(TokenListView, 'delete', prepare)
+
+    def test_token_revoke(self):
+        """Test revoking one of the user's tokens."""
+        def prepare(size):
+            for i in range(size):
+                token = AuthToken.objects.rotate(self.user, f'Device {i}')
+            url = reverse('user:token-detail', args=[token.id])
+            return lambda: self.client.delete(url)
+
+        self.assertQueryBudget(TokenDetailView, 'delete', prepare)
+
+    def test_request_metrics(self):
+        """Test reading the request metrics."""
+        self.user.is_staff = True
+        self.user.save()
+
+        def prepare(size):
+            self.seed_recipes(size)
+            return lambda: self.client.get(reverse('metrics'))
+
+        self.assertQueryBudget(RequestMetricsView, 'get', prepare)
+
+    def test_api_schema(self):
+        """Test generating the API schema."""
+        def prepare(size):
+            self.seed_recipes(size)
+            clear_schema_cache()
+            return lambda: self.client.get(reverse('schema'))
+
+        self.assertQueryBudget(CachedSchemaView, 'get', prepare)
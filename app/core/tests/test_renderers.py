@@ -0,0 +1,210 @@
+"""
+Tests for the JSON renderer and parser.
+"""
+import datetime
+import io
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import parsers, renderers
+from core.models import Recipe, Tag
+
+
+class FastJSONRendererTests(TestCase):
+    """Test the fast renderer matches DRF's JSON renderer."""
+
+    def render(self, data):
+        return renderers.FastJSONRenderer().render(data)
+
+    def assertSameRendering(self, data, accepted_media_type=None):
+        expected = JSONRenderer().render(data, accepted_media_type)
+        rendered = renderers.FastJSONRenderer().render(
+            data,
+            accepted_media_type
+        )
+
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(rendered, expected)
+
+    def test_render_values(self):
+        """Test decimals, datetimes and text render like DRF."""
+        self.assertSameRendering({
+            'price': Decimal('5.50'),
+            'created': datetime.datetime(
+                2022, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+            ),
+            'date': datetime.date(2022, 1, 2),
+            'duration': datetime.timedelta(minutes=5),
+            'title': 'Crème brûlée \u2028 \u2029 "quoted"',
+            1: [True, None, 1.5],
+        })
+
+    def test_render_floats(self):
+        """Test floats keep their value in orjson's notation."""
+        data = [1e-05, 1e16, 0.1, 1.5]
+
+        rendered = self.render(data)
+
+        self.assertEqual(rendered, b'[0.00001,1e16,0.1,1.5]')
+        self.assertEqual(
+            json.loads(rendered),
+            json.loads(JSONRenderer().render(data))
+        )
+
+    def test_render_non_finite_floats(self):
+        """Test NaN and infinities render as null instead of failing."""
+        data = [float('nan'), float('inf'), float('-inf')]
+
+        self.assertEqual(self.render(data), b'[null,null,null]')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_render_none(self):
+        """Test None renders as an empty body."""
+        self.assertSameRendering(None)
+
+    def test_render_indent(self):
+        """Test indented output is left to DRF."""
+        self.assertSameRendering({'a': [1, 2]}, 'application/json; indent=4')
+
+    def test_render_without_orjson(self):
+        """Test rendering falls back to DRF when orjson is missing."""
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertSameRendering({'price': Decimal('1.00')})
+
+
+class FastJSONParserTests(TestCase):
+    """Test the fast parser matches DRF's JSON parser."""
+
+    def parse(self, content, parser=None, **context):
+        parser = parser or parsers.FastJSONParser()
+        return parser.parse(io.BytesIO(content), parser_context=context)
+
+    def test_parse(self):
+        """Test JSON bodies parse like DRF."""
+        content = '{"title": "Crème", "tags": [{"name": "a"}], "n": 1.5}'
+        content = content.encode()
+
+        self.assertEqual(
+            self.parse(content),
+            self.parse(content, JSONParser())
+        )
+
+    def test_parse_errors(self):
+        """Test invalid bodies raise a parse error."""
+        for content in (b'{"title": ', b'{"n": NaN}', b'\xff'):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    self.parse(content)
+
+    def test_parse_other_encoding(self):
+        """Test non UTF-8 bodies are decoded by DRF."""
+        content = '{"title": "Crème"}'.encode('latin-1')
+
+        data = self.parse(content, encoding='latin-1')
+
+        self.assertEqual(data, {'title': 'Crème'})
+
+    def test_parse_without_orjson(self):
+        """Test parsing falls back to DRF when orjson is missing."""
+        with mock.patch.object(parsers, 'orjson', None):
+            self.assertEqual(self.parse(b'{"a": 1}'), {'a': 1})
+
+
+class RenderedEndpointTests(TestCase):
+    """Test every API endpoint renders the same bytes as DRF would."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+            name='Test User ☃',
+            is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        tag = Tag.objects.create(user=self.user, name='dîner\u2028')
+        self.recipe = Recipe.objects.create(
+            user=self.user,
+            title='Crème brûlée',
+            time_minutes=10,
+            price=Decimal('5.50')
+        )
+        self.recipe.tag.add(tag)
+
+    def requests(self):
+        recipe_url = reverse('recipe:recipe-detail', args=[self.recipe.id])
+        tag_url = reverse(
+            'recipe:tag-detail',
+            args=[self.recipe.tag.get().id]
+        )
+        payload = {
+            'title': 'Soupe à l\'oignon',
+            'time_minutes': 30,
+            'price': '7.25',
+            'tags': [{'name': 'soupe'}],
+        }
+        return [
+            ('get', reverse('recipe:recipe-list'), None),
+            ('get', recipe_url, None),
+            ('post', reverse('recipe:recipe-list'), payload),
+            ('post', reverse('recipe:recipe-list'), {'title': ''}),
+            ('patch', recipe_url, {'price': '1.5'}),
+            ('post', reverse('recipe:recipe-bulk'), [payload, {}]),
+            ('get', reverse('recipe:tag-list'), None),
+            ('patch', tag_url, {'name': 'dessert'}),
+            ('get', reverse('user:me'), None),
+            ('patch', reverse('user:me'), {'name': 'Renamed ☃'}),
+            ('get', reverse('metrics'), None),
+            ('get', reverse('recipe:recipe-detail', args=[0]), None),
+        ]
+
+    def test_endpoints(self):
+        """Test responses equal DRF's rendering of their data."""
+        for method, url, payload in self.requests():
+            with self.subTest(method=method, url=url):
+                res = getattr(self.client, method)(url, payload, format='json')
+                self.assertEqual(res['Content-Type'], 'application/json')
+                self.assertEqual(res.content, JSONRenderer().render(res.data))
+
+    def test_anonymous_endpoints(self):
+        """Test anonymous responses equal DRF's rendering of their data."""
+        client = APIClient()
+        for url, payload in (
+            (reverse('user:create'), {'email': 'new@example.com'}),
+            (
+                reverse('user:create'),
+                {'email': 'new@example.com', 'password': 'Testpass123'}
+            ),
+            (
+                reverse('user:token'),
+                {'email': 'user@example.com', 'password': 'Testpass123'}
+            ),
+            (reverse('recipe:recipe-list'), {}),
+        ):
+            with self.subTest(url=url, payload=payload):
+                res = client.post(url, payload, format='json')
+                self.assertEqual(res.content, JSONRenderer().render(res.data))
+
+    def test_json_request_parsed(self):
+        """Test JSON request bodies are parsed by the fast parser."""
+        res = self.client.generic(
+            'PATCH',
+            reverse('user:me'),
+            '{"name": "Parsed ☃"}'.encode(),
+            content_type='application/json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['name'], 'Parsed ☃')
@@ -0,0 +1,210 @@
+"""
+Tests for the read replica database router.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.db import routers
+from core.db.routers import ReplicaRouter
+from core.models import AuthToken, Recipe, Tag
+from user.authentication import token_cache
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+ME_URL = reverse('user:me')
+ASYNC_RECIPES_URL = reverse('recipe:async-recipe-list')
+
+REPLICAS = {'ALIASES': ['replica_0'], 'STICKY_SECONDS': 5, 'CACHE': 'default'}
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379',
+    },
+}
+
+
+@override_settings(DB_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    """Test the databases chosen by the router."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_use_primary_by_default(self):
+        """Test reads outside of a replica scope use the primary."""
+        self.assertEqual(self.router.db_for_read(Recipe), 'default')
+
+    def test_allowed_reads_use_replica(self):
+        """Test reads allowed in a routing scope use a replica."""
+        with routers.routing_scope():
+            routers.allow_replica_reads()
+            self.assertEqual(self.router.db_for_read(Recipe), 'replica_0')
+
+        self.assertEqual(self.router.db_for_read(Recipe), 'default')
+
+    def test_primary_models_never_use_replica(self):
+        """Test auth tokens are always read from the primary."""
+        with routers.routing_scope():
+            routers.allow_replica_reads()
+            self.assertEqual(self.router.db_for_read(AuthToken), 'default')
+
+    def test_instance_hint_keeps_database(self):
+        """Test related reads stay on the database of the instance."""
+        recipe = Recipe()
+        recipe._state.db = 'default'
+        with routers.routing_scope():
+            routers.allow_replica_reads()
+            self.assertEqual(
+                self.router.db_for_read(Tag, instance=recipe),
+                'default'
+            )
+
+    @override_settings(DB_REPLICAS={**REPLICAS, 'ALIASES': []})
+    def test_no_replicas_use_primary(self):
+        """Test reads use the primary when no replica is configured."""
+        with routers.routing_scope():
+            routers.allow_replica_reads()
+            self.assertEqual(self.router.db_for_read(Recipe), 'default')
+
+    @override_settings(DB_REPLICAS={
+        **REPLICAS,
+        'ALIASES': ['replica_0', 'replica_1'],
+    })
+    @patch('core.db.routers.random.choice', side_effect=[
+        'replica_0', 'replica_1'
+    ])
+    def test_replica_chosen_once_per_scope(self, choice):
+        """Test every read of a scope uses the same replica."""
+        with routers.routing_scope():
+            routers.allow_replica_reads()
+            self.assertEqual(self.router.db_for_read(Recipe), 'replica_0')
+            self.assertEqual(self.router.db_for_read(Tag), 'replica_0')
+
+        self.assertEqual(choice.call_count, 1)
+
+    def test_writes_use_primary(self):
+        """Test writes always use the primary."""
+        with routers.routing_scope():
+            routers.allow_replica_reads()
+            self.assertEqual(self.router.db_for_write(Recipe), 'default')
+
+
+class ReplicaSettingsTests(SimpleTestCase):
+    """Test the replica settings are validated."""
+
+    @override_settings(DB_REPLICAS={**REPLICAS, 'CACHE': None})
+    def test_replicas_need_cache(self):
+        """Test replicas without a pin cache are refused."""
+        with self.assertRaises(ImproperlyConfigured):
+            routers.check_replica_settings()
+
+    @override_settings(DB_REPLICAS=REPLICAS)
+    def test_replicas_need_shared_cache(self):
+        """Test a cache private to the process is refused."""
+        with self.assertRaises(ImproperlyConfigured):
+            routers.check_replica_settings()
+
+    @override_settings(
+        CACHES=SHARED_CACHES,
+        DB_REPLICAS={**REPLICAS, 'CACHE': 'shared'}
+    )
+    def test_shared_cache_accepted(self):
+        """Test a cache shared between processes is accepted."""
+        routers.check_replica_settings()
+
+    @override_settings(DB_REPLICAS={**REPLICAS, 'ALIASES': [], 'CACHE': None})
+    def test_no_replicas_need_no_cache(self):
+        """Test pins are neither needed nor stored without replicas."""
+        routers.check_replica_settings()
+        user = get_user_model()(pk=1, email='user@example.com')
+
+        routers.record_write(user)
+
+        self.assertFalse(routers.wrote_recently(user))
+
+
+@override_settings(DB_REPLICAS=REPLICAS)
+@patch('core.db.routers.choose_replica', return_value='default')
+class ReplicaReadViewTests(TestCase):
+    """Test the views reading from replicas."""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.token = AuthToken.objects.rotate(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_safe_reads_use_replica(self, choose_replica):
+        """Test recipe and tag lists are read from a replica."""
+        Recipe.objects.create(
+            user=self.user,
+            title='Recipe',
+            time_minutes=5,
+            price='1.00'
+        )
+        for url in (RECIPES_URL, TAGS_URL):
+            choose_replica.reset_mock()
+            res = self.client.get(url)
+
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(choose_replica.called)
+
+        self.assertIsNone(routers.replica.get())
+
+    def test_reads_after_write_use_primary(self, choose_replica):
+        """Test users read from the primary right after a write."""
+        self.client.patch(ME_URL, {'name': 'New name'})
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, 200)
+        choose_replica.assert_not_called()
+        self.assertTrue(routers.wrote_recently(self.user))
+
+        cache.delete(routers._write_key(self.user))
+        self.client.get(RECIPES_URL)
+
+        self.assertTrue(choose_replica.called)
+
+    def test_write_is_sticky_per_user(self, choose_replica):
+        """Test a write pins reads of the writer only."""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        routers.record_write(other)
+        self.client.get(RECIPES_URL)
+
+        self.assertTrue(choose_replica.called)
+
+    @override_settings(DB_REPLICAS={**REPLICAS, 'STICKY_SECONDS': 0})
+    def test_zero_sticky_seconds_disables_stickiness(self, choose_replica):
+        """Test reads use a replica right after a write without a window."""
+        self.client.patch(ME_URL, {'name': 'New name'})
+        self.client.get(RECIPES_URL)
+
+        self.assertTrue(choose_replica.called)
+
+    async def test_async_reads_use_replica(self, choose_replica):
+        """Test the async recipe list is read from a replica."""
+        res = await self.async_client.get(
+            ASYNC_RECIPES_URL,
+            AUTHORIZATION='Token ' + self.token.key
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(choose_replica.called)
@@ -0,0 +1,112 @@
+"""
+Tests for the cached OpenAPI schema view.
+"""
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from drf_spectacular.generators import SchemaGenerator
+
+from core.schema import clear_schema_cache
+
+SCHEMA_URL = reverse('schema')
+
+
+class SchemaViewTests(SimpleTestCase):
+    """Test the schema is generated once and served conditionally."""
+
+    def setUp(self):
+        clear_schema_cache()
+        self.addCleanup(clear_schema_cache)
+
+    def test_schema_generated_once(self):
+        """Test the schema is generated on the first request only."""
+        with patch.object(
+            SchemaGenerator,
+            'get_schema',
+            autospec=True,
+            side_effect=SchemaGenerator.get_schema
+        ) as get_schema:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(get_schema.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertIn(b'/api/recipe/recipes/', first.content)
+
+    def test_conditional_get(self):
+        """Test a matching If-None-Match gets a 304 without content."""
+        etag = self.client.get(SCHEMA_URL)['ETag']
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+
+    def test_formats_cached_separately(self):
+        """Test each media type is rendered and tagged on its own."""
+        yaml_res = self.client.get(SCHEMA_URL)
+        json_res = self.client.get(
+            SCHEMA_URL,
+            HTTP_ACCEPT='application/vnd.oai.openapi+json'
+        )
+
+        self.assertNotEqual(yaml_res['ETag'], json_res['ETag'])
+        self.assertTrue(
+            json_res['Content-Type'].startswith(
+                'application/vnd.oai.openapi+json'
+            )
+        )
+        self.assertIn('paths', json.loads(json_res.content))
+
+    def test_schema_file_served(self):
+        """Test the precomputed schema file is served when configured."""
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.json', delete=False
+        ) as stream:
+            json.dump({'openapi': '3.0.3', 'paths': {}}, stream)
+        self.addCleanup(os.remove, stream.name)
+
+        with override_settings(API_SCHEMA_FILE=stream.name):
+            res = self.client.get(
+                SCHEMA_URL,
+                HTTP_ACCEPT='application/vnd.oai.openapi+json'
+            )
+
+        self.assertEqual(
+            json.loads(res.content),
+            {'openapi': '3.0.3', 'paths': {}}
+        )
+
+
+class SchemaContentTests(SimpleTestCase):
+    """Test the generated schema describes every project view."""
+
+    def get_schema(self):
+        return SchemaGenerator().get_schema(public=True)
+
+    def test_metrics_documented(self):
+        """Test the metrics endpoint has its responses in the schema."""
+        path = self.get_schema()['paths']['/api/metrics/']
+
+        self.assertIn('200', path['get']['responses'])
+        self.assertIn('204', path['delete']['responses'])
+
+    def test_operation_ids_unique(self):
+        """Test no two operations share an operationId."""
+        operation_ids = [
+            operation['operationId']
+            for path in self.get_schema()['paths'].values()
+            for operation in path.values()
+        ]
+
+        self.assertEqual(len(operation_ids), len(set(operation_ids)))
+        self.assertIn('user_tokens_revoke', operation_ids)
+        self.assertIn('user_tokens_revoke_all', operation_ids)
@@ -0,0 +1,44 @@
+"""
+Tests for the project URL configuration.
+"""
+import importlib
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+
+from app import urls
+
+
+class LeanUrlsTests(SimpleTestCase):
+    """Test the admin and API docs are only routed when enabled."""
+
+    def reload_urls(self):
+        clear_url_caches()
+        return importlib.reload(urls)
+
+    def setUp(self):
+        self.addCleanup(self.reload_urls)
+
+    def test_admin_and_docs_enabled(self):
+        """Test the admin and API docs are routed by default."""
+        module = self.reload_urls()
+
+        self.assertEqual(reverse('schema', urlconf=module), '/api/schema/')
+        self.assertEqual(reverse('api-docs', urlconf=module), '/api/docs/')
+        self.assertEqual(
+            reverse('admin:index', urlconf=module),
+            '/admin/'
+        )
+
+    @override_settings(ENABLE_ADMIN=False, ENABLE_API_DOCS=False)
+    def test_admin_and_docs_disabled(self):
+        """Test the admin and API docs are not routed when disabled."""
+        module = self.reload_urls()
+
+        for name in ('schema', 'api-docs', 'admin:index'):
+            with self.assertRaises(NoReverseMatch):
+                reverse(name, urlconf=module)
+        self.assertEqual(
+            reverse('user:me', urlconf=module),
+            '/api/user/me/'
+        )
@@ -0,0 +1,54 @@
+"""
+Test helpers shared between apps.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+QUERY_BUDGET_SIZES = (1, 100)
+
+
+class QueryBudgetMixin:
+    """TestCase mixin asserting views stay within their query budget.
+
+    Views declare ``query_budget``, a mapping of viewset action or lower
+    case HTTP method to the most queries one request may issue, not
+    counting authentication. Variants of an action costing more, such as
+    a search, may get a budget of their own under another name.
+    """
+
+    def assertQueryBudget(self, view, action, prepare):
+        """Assert a request to view fits its budget at every data size.
+
+        ``prepare(size)`` seeds ``size`` rows and returns a callable making
+        the request. The request must issue the same number of queries for
+        every size in ``QUERY_BUDGET_SIZES``, or it has an N+1 problem.
+        """
+        budget = view.query_budget[action]
+        counts = {}
+        for size in QUERY_BUDGET_SIZES:
+            request = prepare(size)
+            with CaptureQueriesContext(connection) as queries:
+                res = request()
+                if getattr(res, 'streaming', False):
+                    b''.join(res.streaming_content)
+            self.assertLess(
+                res.status_code, 400,
+                f'{view.__name__}.{action} failed: {res.status_code}'
+            )
+            counts[size] = queries
+
+        sql = {
+            size: '\n'.join(query['sql'] for query in queries)
+            for size, queries in counts.items()
+        }
+        sizes = [len(queries) for queries in counts.values()]
+        self.assertEqual(
+            len(set(sizes)), 1,
+            f'{view.__name__}.{action} query count depends on the number '
+            f'of rows: {dict(zip(counts, sizes))}\n{sql}'
+        )
+        self.assertLessEqual(
+            sizes[0], budget,
+            f'{view.__name__}.{action} issued {sizes[0]} queries, '
+            f'budget is {budget}\n{sql[QUERY_BUDGET_SIZES[-1]]}'
+        )
@@ -0,0 +1,34 @@
+"""
+Views for the core APIs.
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.instrumentation import registry
+from user.authentication import CachedTokenAuthentication
+
+
+class RequestMetricsView(APIView):
+    """Report per route query and latency metrics of this process."""
+    authentication_classes = [
+        CachedTokenAuthentication,
+        SessionAuthentication
+    ]
+    permission_classes = [IsAdminUser]
+    query_budget = {'get': 0, 'delete': 0}
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request):
+        """Return the aggregated metrics for every route."""
+        return Response(registry.snapshot())
+
+    @extend_schema(responses={204: None})
+    def delete(self, request):
+        """Reset the aggregated metrics."""
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,144 @@
+"""
+Async views for the recipe read APIs.
+"""
+from django.http import HttpResponse
+from django.views import View
+
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.db.routers import (
+    allow_replica_reads,
+    awrote_recently,
+    routing_scope
+)
+from core.models import Recipe, Tag
+from recipe.filters import RecipeFilter
+from recipe.pagination import AsyncRecipeCursorPagination
+from recipe.serializers import (
+    RecipeSerializer,
+    TagSerializer,
+    ValuesRepresentation
+)
+from user.authentication import CachedTokenAuthentication
+
+
+class AsyncAPIView(View):
+    """Base of the async, read only JSON views.
+
+    Requests are authenticated, queried through the async ORM and
+    rendered from ``.values()`` rows with the ``ValuesRepresentation`` of
+    ``serializer_class``, so under ASGI they are served on the event loop
+    instead of a thread per request. Every middleware must be async
+    capable for that, a sync one moves the whole chain onto a thread.
+    Responses have the same data as the equivalent DRF views.
+    """
+    http_method_names = ['get', 'head', 'options']
+    authentication_class = CachedTokenAuthentication
+    serializer_class = None
+    query_budget = {}
+
+    def get_representation(self):
+        return ValuesRepresentation.for_serializer(self.serializer_class())
+
+    def render(self, data, status=200, headers=None):
+        """Return data rendered by the default DRF renderer."""
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return HttpResponse(
+            renderer.render(data),
+            content_type=renderer.media_type,
+            status=status,
+            headers=headers
+        )
+
+    async def authenticate(self, request):
+        """Return the DRF request for request once authenticated."""
+        user_auth = await self.authentication_class().aauthenticate(request)
+        if user_auth is None:
+            raise exceptions.NotAuthenticated()
+
+        request = Request(request, authenticators=())
+        request.user, request.auth = user_auth
+        return request
+
+    async def dispatch(self, request, *args, **kwargs):
+        with routing_scope():
+            try:
+                request = await self.authenticate(request)
+                if not await awrote_recently(request.user):
+                    allow_replica_reads()
+                return await super().dispatch(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return self.handle_exception(exc)
+
+    def handle_exception(self, exc):
+        """Return the error response of exc like DRF's exception handler."""
+        headers = None
+        if isinstance(exc, (
+            exceptions.NotAuthenticated,
+            exceptions.AuthenticationFailed
+        )):
+            headers = {
+                'WWW-Authenticate': self.authentication_class.keyword
+            }
+
+        data = exc.detail
+        if not isinstance(data, (dict, list)):
+            data = {'detail': data}
+        return self.render(data, exc.status_code, headers)
+
+
+class RecipeListView(AsyncAPIView):
+    """List the recipes of the authenticated user."""
+    serializer_class = RecipeSerializer
+    filter_backends = [RecipeFilter]
+    pagination_class = AsyncRecipeCursorPagination
+    query_budget = {'get': 2}
+
+    async def get(self, request):
+        representation = self.get_representation()
+        queryset = Recipe.objects.filter(user=request.user)
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(
+            representation.values(queryset),
+            request
+        )
+        data = await representation.ato_representation(page)
+        return self.render(paginator.get_paginated_data(data))
+
+
+class RecipeDetailView(AsyncAPIView):
+    """Retrieve a recipe of the authenticated user."""
+    serializer_class = RecipeSerializer
+    query_budget = {'get': 2}
+
+    async def get(self, request, pk):
+        representation = self.get_representation()
+        data = await representation.ato_representation(
+            representation.values(
+                Recipe.objects.filter(user=request.user, pk=pk)
+            )
+        )
+        if not data:
+            raise exceptions.NotFound()
+
+        return self.render(data[0])
+
+
+class TagListView(AsyncAPIView):
+    """List the tags of the authenticated user."""
+    serializer_class = TagSerializer
+    query_budget = {'get': 1}
+
+    async def get(self, request):
+        representation = self.get_representation()
+        data = await representation.ato_representation(
+            representation.values(
+                Tag.objects.filter(user=request.user).order_by('-name')
+            )
+        )
+        return self.render(data)
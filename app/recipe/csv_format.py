@@ -0,0 +1,28 @@
+"""
+CSV format of recipe exports and imports.
+"""
+EXPORT_CSV_FIELDS = ['id', 'title', 'time_minutes', 'price', 'tags']
+EXPORT_CSV_TAG_SEPARATOR = '|'
+# Exported columns holding user text.
+EXPORT_CSV_TEXT_FIELDS = ['title', 'tags']
+# Leading characters that make spreadsheets read a cell as a formula.
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def escape_csv_text(value):
+    """Quote value so spreadsheets show it as text, not a formula.
+
+    Values already starting with quotes before a formula character get
+    one more, so ``unescape_csv_text`` restores every value exactly.
+    """
+    if value.lstrip("'").startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_csv_text(value):
+    """Return the value quoted by ``escape_csv_text``."""
+    if value.startswith("'") and \
+            value.lstrip("'").startswith(CSV_FORMULA_PREFIXES):
+        return value[1:]
+    return value
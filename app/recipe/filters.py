@@ -0,0 +1,211 @@
+"""
+Filter backends for the recipe APIs.
+"""
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import Recipe
+
+# Text search configuration of the recipe title GIN index.
+SEARCH_CONFIG = 'english'
+# SQLite FTS5 table mirroring recipe titles, see migration 0006.
+SEARCH_FTS_TABLE = 'core_recipe_fts'
+
+
+class RecipeFilterParamsSerializer(serializers.Serializer):
+    """Query parameters accepted by ``RecipeFilter``."""
+    tags = serializers.CharField(required=False)
+    tags_match = serializers.ChoiceField(
+        choices=['any', 'all'],
+        default='any'
+    )
+    min_time = serializers.IntegerField(required=False, min_value=0)
+    max_time = serializers.IntegerField(required=False, min_value=0)
+    min_price = serializers.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        required=False,
+        min_value=0
+    )
+    max_price = serializers.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        required=False,
+        min_value=0
+    )
+
+    def validate_tags(self, value):
+        """Parse a comma separated list of tag ids."""
+        try:
+            ids = [int(tag_id) for tag_id in value.split(',') if tag_id]
+        except ValueError:
+            raise serializers.ValidationError(
+                'Expected a comma separated list of tag ids.'
+            )
+
+        return list(dict.fromkeys(ids))
+
+
+class RecipeFilter(BaseFilterBackend):
+    """Filter recipes by tag ids and by time and price ranges.
+
+    ``?tags=1,2`` keeps recipes linked to any of the tags through a single
+    EXISTS subquery, or with ``&tags_match=all`` to every tag through one
+    GROUP BY ... HAVING over the recipe to tag table, instead of a join per
+    tag. Ranges use ``min_time``, ``max_time``, ``min_price`` and
+    ``max_price`` and are served by the ``(user, ...)`` indexes. Only
+    lists are filtered, detail and write requests ignore the parameters.
+    """
+    ranges = {
+        'min_time': 'time_minutes__gte',
+        'max_time': 'time_minutes__lte',
+        'min_price': 'price__gte',
+        'max_price': 'price__lte',
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        # Views without actions, like the async list, only serve lists.
+        if getattr(view, 'action', 'list') != 'list':
+            return queryset
+
+        params = RecipeFilterParamsSerializer(data=request.query_params)
+        if not params.is_valid():
+            raise ValidationError(params.errors)
+        params = params.validated_data
+
+        queryset = queryset.filter(**{
+            lookup: params[param]
+            for param, lookup in self.ranges.items() if param in params
+        })
+
+        tag_ids = params.get('tags')
+        if not tag_ids:
+            return queryset
+
+        through = Recipe.tag.through.objects.filter(tag_id__in=tag_ids)
+        if params['tags_match'] == 'all':
+            return queryset.filter(id__in=through.values(
+                'recipe_id'
+            ).annotate(
+                tag_count=Count('tag_id')
+            ).filter(
+                tag_count=len(tag_ids)
+            ).values('recipe_id'))
+
+        return queryset.filter(
+            Exists(through.filter(recipe_id=OuterRef('pk')))
+        )
+
+    def get_schema_operation_parameters(self, view):
+        descriptions = {
+            'tags': 'Comma separated tag ids.',
+            'tags_match': 'Whether recipes need any (default) or all tags.',
+            'min_time': 'Minimum preparation time in minutes.',
+            'max_time': 'Maximum preparation time in minutes.',
+            'min_price': 'Minimum price.',
+            'max_price': 'Maximum price.',
+        }
+        return [
+            {
+                'name': name,
+                'required': False,
+                'in': 'query',
+                'description': description,
+                'schema': {'type': 'string'},
+            }
+            for name, description in descriptions.items()
+        ]
+
+
+class RecipeSearchFilter(BaseFilterBackend):
+    """Rank recipes matching ``?search=`` by title relevance.
+
+    On PostgreSQL titles match through the GIN indexed ``tsvector``, or
+    through trigram word similarity for partial words and typos. SQLite
+    uses an FTS5 table with prefix matching and bm25 ranking. Other
+    databases fall back to a case insensitive substring match. Only lists
+    are searched, the term of a detail or write request is ignored.
+    """
+    search_param = 'search'
+
+    def get_search_term(self, request):
+        """Return the stripped search term, or '' when not searching."""
+        if request is None:
+            return ''
+
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        term = self.get_search_term(request)
+        if not term or getattr(view, 'action', None) != 'list':
+            return queryset
+
+        search = getattr(self, f'search_{connection.vendor}', None)
+        if search is None:
+            return queryset.filter(title__icontains=term)
+
+        return search(queryset, term).order_by('-search_rank', '-id')
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Search recipe titles, best matches first.',
+            'schema': {'type': 'string'},
+        }]
+
+    def search_postgresql(self, queryset, term):
+        query = SearchQuery(
+            term,
+            config=SEARCH_CONFIG,
+            search_type='websearch'
+        )
+        return queryset.alias(
+            search_vector=SearchVector('title', config=SEARCH_CONFIG),
+            search_similarity=TrigramWordSimilarity(term, 'title'),
+        ).filter(
+            Q(search_vector=query) | Q(title__trigram_word_similar=term)
+        ).annotate(
+            search_rank=SearchRank(F('search_vector'), query) +
+            F('search_similarity')
+        )
+
+    def search_sqlite(self, queryset, term):
+        words = re.findall(r'\w+', term)
+        if not words:
+            return queryset.none().annotate(search_rank=Value(0.0))
+
+        match = ' '.join('"%s"*' % word for word in words)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {SEARCH_FTS_TABLE} '
+            f'WHERE {SEARCH_FTS_TABLE} MATCH %s',
+            [match]
+        )).annotate(search_rank=RawSQL(
+            f'SELECT -bm25({SEARCH_FTS_TABLE}) FROM {SEARCH_FTS_TABLE} '
+            f'WHERE {SEARCH_FTS_TABLE} MATCH %s '
+            f'AND rowid = {queryset.model._meta.db_table}.id',
+            [match],
+            output_field=FloatField()
+        ))
@@ -0,0 +1,158 @@
+"""
+Mixins for the recipe API views.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from rest_framework.response import Response
+
+from core.instrumentation import serializer_timer
+from core.models import CollectionVersion
+from recipe.serializers import ValuesRepresentation
+
+
+class ConditionalGetMixin:
+    """View mixin answering conditional GETs from a collection version.
+
+    ``collection`` names the ``CollectionVersion`` of the user that every
+    write to the data behind the view bumps. The ETag derives from that
+    version alone, so a request whose ETag still matches gets a 304
+    without running the view's queries or serializers. No Last-Modified
+    is sent, its whole second precision would let a write made in the
+    second of a fetch go unnoticed by clients only sending
+    If-Modified-Since.
+    """
+    collection = None
+
+    def get_collection_version(self):
+        """Return the version and change time of the view's collection."""
+        if not hasattr(self, '_collection_version'):
+            self._collection_version = CollectionVersion.objects.current(
+                self.request.user,
+                self.collection
+            )
+
+        return self._collection_version
+
+    def get_version_key(self):
+        """Return a string identifying the response at this version.
+
+        The change time is part of the key so versions restarting from
+        zero, say after restoring the database, never collide. So are the
+        scheme and host, which the absolute pagination links are built
+        from.
+        """
+        version, updated_at = self.get_collection_version()
+        query = sorted(self.request.query_params.lists())
+        return ':'.join([
+            str(self.request.user.pk),
+            self.collection,
+            str(version),
+            updated_at.isoformat() if updated_at else '',
+            self.request.accepted_renderer.format,
+            self.request.scheme,
+            self.request.get_host(),
+            self.request.path,
+            repr(query),
+        ])
+
+    def get_etag(self):
+        """Return the ETag of the current response."""
+        key = self.get_version_key().encode()
+        return '"%s"' % hashlib.md5(key).hexdigest()
+
+    def fresh_response(self, handler, request, *args, **kwargs):
+        """Return the full response of a request that is not up to date."""
+        return handler(request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Return a 304 if the client is up to date, else call handler."""
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.fresh_response(handler, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """View mixin caching response data per collection version.
+
+    Entries are keyed by the version key, so a write bumping the version
+    makes every cached response of the collection unreachable at once and
+    stale data is never served. Collections that were never written
+    through a version bump are not cached.
+    """
+
+    def get_response_cache(self):
+        """Return the cache storing responses, or None when disabled."""
+        alias = settings.RECIPE_RESPONSE_CACHE['ALIAS']
+        return caches[alias] if alias else None
+
+    def get_response_cache_key(self):
+        digest = hashlib.md5(self.get_version_key().encode()).hexdigest()
+        return f'recipe-response:{digest}'
+
+    def fresh_response(self, handler, request, *args, **kwargs):
+        cache = self.get_response_cache()
+        version, _ = self.get_collection_version()
+        if cache is None or not version:
+            return super().fresh_response(handler, request, *args, **kwargs)
+
+        key = self.get_response_cache_key()
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().fresh_response(handler, request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                response.data,
+                settings.RECIPE_RESPONSE_CACHE['TTL']
+            )
+
+        return response
+
+
+class FastListMixin:
+    """View mixin rendering list responses from ``.values()`` rows.
+
+    Enabled by the ``RECIPE_FAST_LIST`` setting, the list action then
+    renders rows with the ``ValuesRepresentation`` compiled from the
+    view's serializer, producing the same data as the serializer itself.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.RECIPE_FAST_LIST:
+            return super().list(request, *args, **kwargs)
+
+        representation = ValuesRepresentation.for_serializer(
+            self.get_serializer()
+        )
+        queryset = representation.values(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        with serializer_timer():
+            data = representation.to_representation(
+                queryset if page is None else page
+            )
+        if page is not None:
+            return self.get_paginated_response(data)
+
+        return Response(data)
@@ -0,0 +1,92 @@
+"""
+Pagination classes for the recipe APIs.
+"""
+from django.conf import settings
+
+from rest_framework.pagination import (
+    CursorPagination,
+    PageNumberPagination,
+    _reverse_ordering,
+)
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Keyset pagination over recipes ordered by newest first.
+
+    The opaque cursor encodes the last seen id, so every page is fetched
+    with an ``id < last_id`` seek on the index instead of an OFFSET scan.
+    """
+    ordering = '-id'
+    page_size = settings.RECIPE_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.RECIPE_MAX_PAGE_SIZE
+
+
+class RecipeSearchPagination(PageNumberPagination):
+    """Page number pagination over ranked search results.
+
+    A rank is not unique and cannot be seeked on, so search results fall
+    back to numbered pages.
+    """
+    page_size = settings.RECIPE_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.RECIPE_MAX_PAGE_SIZE
+
+
+class AsyncRecipeCursorPagination(RecipeCursorPagination):
+    """``RecipeCursorPagination`` fetching pages with the async ORM.
+
+    Cursors are interchangeable with the synchronous views'. Ids are
+    unique, so positions alone address a page and the offset of a cursor
+    is always zero.
+    """
+
+    async def apaginate_queryset(self, queryset, request):
+        """Async variant of paginate_queryset() for a DRF request."""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, None)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, position = self.cursor or (0, False, None)
+
+        order = self.ordering[0]
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+            queryset = queryset.filter(**{
+                f'{order.lstrip("-")}__{lookup}': position
+            })
+
+        results = [
+            row async for row in
+            queryset[offset:offset + self.page_size + 1]
+        ]
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(
+                results[-1],
+                self.ordering
+            )
+
+        current = position is not None or offset > 0
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = current, following is not None
+            self.next_position, self.previous_position = position, following
+        else:
+            self.has_next, self.has_previous = following is not None, current
+            self.next_position, self.previous_position = following, position
+
+        return self.page
+
+    def get_paginated_data(self, data):
+        """Return the body of the paginated response."""
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
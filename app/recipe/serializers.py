@@ -1,26 +1,277 @@
 """
 Serialiers for recipe API.
 """
+from core.serializers import (
+    TimedListSerializer,
+    TimedSerializerMixin
+)
 from core.models import (
+    CollectionVersion,
     Recipe,
     Tag
 )
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
 from rest_framework import serializers
 
+# Fields representing the value loaded from the database as is.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
 
-class RecipeSerializer(serializers.ModelSerializer):
-    """Serializer for recipes"""
 
-    class Meta:
-        model = Recipe
-        fields = ['id', 'title', 'time_minutes', 'price']
-        read_only_fields = ['id']
+def get_or_create_tags(user, names):
+    """Return a name to tag mapping for user, creating missing tags."""
+    tags = {}
+    for tag in Tag.objects.filter(user=user, name__in=set(names)):
+        tags.setdefault(tag.name, tag)
+
+    missing = [
+        Tag(user=user, name=name, description='')
+        for name in dict.fromkeys(names) if name not in tags
+    ]
+    if missing:
+        for tag in Tag.objects.bulk_create(missing):
+            tags[tag.name] = tag
+        CollectionVersion.objects.bump(user, CollectionVersion.TAGS)
+
+    return tags
+
+
+class RecipeListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """Serializer writing many recipes with bulk queries."""
+
+    def _link_tags(self, recipes, tags_per_recipe, replace=False):
+        """Bulk insert recipe to tag links, creating tags by name."""
+        tagged = [
+            (recipe, [tag['name'] for tag in tags])
+            for recipe, tags in zip(recipes, tags_per_recipe)
+            if tags is not None
+        ]
+        if not tagged:
+            return
+
+        through = Recipe.tag.through
+        if replace:
+            through.objects.filter(
+                recipe__in=[recipe for recipe, _ in tagged]
+            ).delete()
+
+        by_name = get_or_create_tags(
+            tagged[0][0].user,
+            [name for _, names in tagged for name in names]
+        )
+        through.objects.bulk_create([
+            through(recipe_id=recipe.id, tag_id=by_name[name].id)
+            for recipe, names in tagged
+            for name in names
+        ], ignore_conflicts=True)
 
+    def create(self, validated_data):
+        """Create all recipes and their tag links in bulk."""
+        tags = [attrs.pop('tag', None) for attrs in validated_data]
+        recipes = Recipe.objects.bulk_create(
+            [Recipe(**attrs) for attrs in validated_data]
+        )
+        self._link_tags(recipes, tags)
 
-class TagSerializer(serializers.ModelSerializer):
+        return recipes
+
+    def update(self, instance, validated_data):
+        """Update recipes matched by position with validated_data."""
+        tags = [attrs.pop('tag', None) for attrs in validated_data]
+        fields = set()
+        for recipe, attrs in zip(instance, validated_data):
+            for attr, value in attrs.items():
+                setattr(recipe, attr, value)
+            fields.update(attrs)
+
+        if fields:
+            # bulk_update() skips auto_now, so stamp the change here.
+            now = timezone.now()
+            for recipe in instance:
+                recipe.updated_at = now
+            fields.add('updated_at')
+            Recipe.objects.bulk_update(instance, fields)
+        self._link_tags(instance, tags, replace=True)
+
+        return instance
+
+
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for tags"""
 
     class Meta:
         model = Tag
         fields = ['id', 'name']
         read_only_fields = ['id']
+        list_serializer_class = TimedListSerializer
+
+
+class RecipeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Serializer for recipes"""
+    tags = TagSerializer(many=True, required=False, source='tag')
+
+    class Meta:
+        model = Recipe
+        fields = ['id', 'title', 'time_minutes', 'price', 'tags']
+        read_only_fields = ['id']
+        list_serializer_class = RecipeListSerializer
+
+    def _set_tags(self, recipe, tags):
+        """Link recipe to the given tags, creating them by name."""
+        names = [tag['name'] for tag in tags]
+        by_name = get_or_create_tags(recipe.user, names)
+        recipe.tag.set([by_name[name] for name in names])
+
+    def create(self, validated_data):
+        """Create a recipe with its tags."""
+        tags = validated_data.pop('tag', None)
+        recipe = super().create(validated_data)
+
+        if tags is not None:
+            self._set_tags(recipe, tags)
+
+        return recipe
+
+    def update(self, instance, validated_data):
+        """Update a recipe, replacing its tags when given."""
+        tags = validated_data.pop('tag', None)
+        recipe = super().update(instance, validated_data)
+
+        if tags is not None:
+            self._set_tags(recipe, tags)
+
+        return recipe
+
+
+class ValuesRepresentation:
+    """Fast equivalent of a model serializer's list representation.
+
+    Rows are fetched with ``.values()`` and rendered by a plan compiled
+    once per serializer class, skipping model instances and the per field
+    attribute lookups of ``to_representation``. Many to many relations
+    rendered by nested serializers are fetched with one query over the
+    through table, ordered by the related primary key like the views'
+    prefetches. Other kinds of fields are not supported.
+    """
+    _compiled = {}
+
+    def __init__(self, serializer):
+        opts = serializer.Meta.model._meta
+        self.pk = opts.pk.attname
+        self.plan = []
+        self.nested = []
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.ListSerializer):
+                relation = opts.get_field(field.source)
+                if not relation.many_to_many:
+                    raise ImproperlyConfigured(
+                        f'{field.field_name} is not a many to many relation.'
+                    )
+                child = ValuesRepresentation(field.child)
+                if child.nested:
+                    raise ImproperlyConfigured(
+                        f'{field.field_name} nests another relation.'
+                    )
+                self.nested.append((field.field_name, relation, child))
+                self.plan.append((field.field_name, field.field_name, None))
+            elif '.' in field.source or field.source == '*':
+                raise ImproperlyConfigured(
+                    f'{field.field_name} does not map to a model field.'
+                )
+            elif isinstance(field, IDENTITY_FIELDS):
+                self.plan.append((field.field_name, field.source, None))
+            elif isinstance(field, serializers.DecimalField):
+                self.plan.append(
+                    (field.field_name, field.source, field.to_representation)
+                )
+            else:
+                raise ImproperlyConfigured(
+                    f'{type(field).__name__} {field.field_name} is not '
+                    'supported.'
+                )
+
+        nested = {name for name, _, _ in self.nested}
+        self.fields = list(dict.fromkeys([self.pk] + [
+            source for name, source, _ in self.plan if name not in nested
+        ]))
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """Return the compiled representation of a serializer class."""
+        key = type(serializer)
+        if key not in cls._compiled:
+            cls._compiled[key] = cls(serializer)
+
+        return cls._compiled[key]
+
+    def values(self, queryset):
+        """Return queryset as rows holding the fields to represent."""
+        return queryset.prefetch_related(None).values(*self.fields)
+
+    def render(self, row):
+        data = {}
+        for name, source, convert in self.plan:
+            value = row[source]
+            if convert is not None and value is not None:
+                value = convert(value)
+            data[name] = value
+
+        return data
+
+    def _links(self, rows, relation, child):
+        """Return the query over the related rows of every row."""
+        through = relation.remote_field.through
+        source = through._meta.get_field(relation.m2m_field_name()).attname
+        target = relation.m2m_reverse_field_name()
+        target_pk = through._meta.get_field(target).attname
+
+        return through.objects.filter(
+            **{f'{source}__in': [row[self.pk] for row in rows]}
+        ).order_by(target_pk).values_list(
+            source,
+            *[f'{target}__{field}' for field in child.fields]
+        )
+
+    def _attach(self, rows, name, child, links):
+        """Store the rendered related rows of every row under name."""
+        related = {row[self.pk]: [] for row in rows}
+        for link in links:
+            related[link[0]].append(
+                child.render(dict(zip(child.fields, link[1:])))
+            )
+
+        for row in rows:
+            row[name] = related[row[self.pk]]
+
+    def to_representation(self, rows):
+        """Return the representation of rows fetched by values()."""
+        rows = list(rows)
+        if rows:
+            for name, relation, child in self.nested:
+                links = self._links(rows, relation, child)
+                self._attach(rows, name, child, links)
+
+        return [self.render(row) for row in rows]
+
+    async def ato_representation(self, rows):
+        """Async variant of to_representation() using the async ORM.
+
+        rows is either a list or a query fetched with ``async for``.
+        """
+        if hasattr(rows, '__aiter__'):
+            rows = [row async for row in rows]
+        else:
+            rows = list(rows)
+        if rows:
+            for name, relation, child in self.nested:
+                links = self._links(rows, relation, child)
+                self._attach(rows, name, child, [
+                    link async for link in links
+                ])
+
+        return [self.render(row) for row in rows]
@@ -1,7 +1,9 @@
 """
 Tests for the recipe API.
 """
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -13,6 +15,8 @@ from core.models import (
     Tag
 )
 from decimal import Decimal
+from unittest.mock import patch
+from recipe.pagination import RecipeCursorPagination
 from recipe.serializers import RecipeSerializer
 
 RECIPES_URL = reverse('recipe:recipe-list')
@@ -70,7 +74,7 @@ class PrivateRecipeApiTest(TestCase):
 
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_recipes_limited_to_user(self):
         """Test retrieving recipes for user"""
@@ -89,7 +93,52 @@ class PrivateRecipeApiTest(TestCase):
         serializer = RecipeSerializer(recipes, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_recipes_paginated_with_cursor(self):
+        """Test recipe list is paginated by an opaque cursor"""
+
+        recipes = [
+            create_recipe(user=self.user, title=f'Recipe {i}')
+            for i in range(5)
+        ]
+
+        res = self.client.get(RECIPES_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r['id'] for r in res.data['results']],
+            [recipes[4].id, recipes[3].id]
+        )
+        self.assertIsNone(res.data['previous'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [r['id'] for r in res.data['results']],
+            [recipes[2].id, recipes[1].id]
+        )
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [r['id'] for r in res.data['results']],
+            [recipes[0].id]
+        )
+        self.assertIsNone(res.data['next'])
+
+    def test_recipes_page_size_capped(self):
+        """Test requested page size can not exceed the maximum"""
+
+        for i in range(3):
+            create_recipe(user=self.user, title=f'Recipe {i}')
+
+        with patch.object(RecipeCursorPagination, 'max_page_size', 2):
+            res = self.client.get(RECIPES_URL, {'page_size': 100})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIsNotNone(res.data['next'])
 
     def test_view_recipe_detail(self):
         """Test viewing a recipe detail"""
@@ -196,31 +245,81 @@ class PrivateRecipeApiTest(TestCase):
     def test_create_recipe_with_tags(self):
         """Test create Recipe with tags"""
 
-        toast_tag = Tag.objects.create(name='toast')
+        toast_tag = Tag.objects.create(user=self.user, name='toast')
 
         payload = {
             'title': 'Test Recipe',
             'time_minutes': 30,
             'price': Decimal(5.5),
             'tags': [
-                {'name':'breakfast'},
+                {'name': 'breakfast'},
                 {'name': 'toast'}
             ]
         }
 
-        res = self.client.post(RECIPES_URL, payload)
+        res = self.client.post(RECIPES_URL, payload, format='json')
         res_tags = res.data['tags']
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res_tags), 2)
 
-        self.assertIsNotNone(res_tags)
-
-        new_tag = Tag.objects.filter(user=self.user, name=payload['tags'][0])
+        new_tag = Tag.objects.filter(
+            user=self.user,
+            name=payload['tags'][0]['name']
+        )
         self.assertTrue(new_tag.exists())
 
         resipe = Recipe.objects.filter(user=self.user).first()
-        resipe_tags = resipe.tags.all()
+        resipe_tags = resipe.tag.all()
 
         self.assertEqual(len(resipe_tags), 2)
         self.assertTrue(toast_tag in resipe_tags)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+    def test_update_recipe_tags(self):
+        """Test updating a recipe replaces its tags"""
+
+        recipe = create_recipe(user=self.user)
+        recipe.tag.add(Tag.objects.create(user=self.user, name='lunch'))
+
+        payload = {'tags': [{'name': 'dinner'}]}
+        url = detail_recipe_url(recipe.id)
+        res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [tag.name for tag in recipe.tag.all()],
+            ['dinner']
+        )
+
+    def test_partial_update_keeps_tags(self):
+        """Test updating a recipe without tags leaves them untouched"""
+
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name='lunch')
+        recipe.tag.add(tag)
+
+        url = detail_recipe_url(recipe.id)
+        res = self.client.patch(url, {'title': 'New title'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(recipe.tag.all()), [tag])
+
+    def test_list_query_count_independent_of_recipes(self):
+        """Test listing recipes with tags does not issue a query per row"""
+
+        tag = Tag.objects.create(user=self.user, name='lunch')
+        create_recipe(user=self.user).tag.add(tag)
+
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(RECIPES_URL)
+
+        for i in range(10):
+            create_recipe(user=self.user, title=f'Recipe {i}').tag.add(tag)
+
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 11)
+        self.assertEqual(len(many), len(single))
@@ -0,0 +1,150 @@
+"""
+Tests for the async recipe and tag read APIs.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import AuthToken, Recipe, Tag
+from user.authentication import token_cache
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+ASYNC_RECIPES_URL = reverse('recipe:async-recipe-list')
+ASYNC_TAGS_URL = reverse('recipe:async-tag-list')
+
+
+def async_detail_url(recipe_id):
+    """Create and return an async recipe detail URL."""
+    return reverse('recipe:async-recipe-detail', args=[recipe_id])
+
+
+class AsyncApiTests(TestCase):
+    """Test the async views return what the DRF views return."""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.token = AuthToken.objects.rotate(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        lunch = Tag.objects.create(user=self.user, name='lunch')
+        dinner = Tag.objects.create(user=self.user, name='dinner')
+        for i in range(3):
+            recipe = Recipe.objects.create(
+                user=self.user,
+                title=f'Recipe {i}',
+                time_minutes=10 * (i + 1),
+                price=Decimal('2.50')
+            )
+            recipe.tag.set([lunch, dinner][:i])
+
+    def test_recipe_list_matches(self):
+        """Test the async recipe list matches the DRF list."""
+        res = self.client.get(ASYNC_RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), self.client.get(RECIPES_URL).json())
+
+    def test_recipe_list_cursor_pages(self):
+        """Test cursors page forwards and backwards like the DRF list."""
+        first = self.client.get(ASYNC_RECIPES_URL, {'page_size': 2}).json()
+        expected = self.client.get(RECIPES_URL, {'page_size': 2}).json()
+        self.assertEqual(first, {
+            **expected,
+            'next': expected['next'].replace(RECIPES_URL, ASYNC_RECIPES_URL),
+        })
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next'])
+
+        previous = self.client.get(second['previous']).json()
+        self.assertEqual(previous['results'], first['results'])
+
+    def test_recipe_list_filtered(self):
+        """Test the async recipe list applies the recipe filters."""
+        params = {'max_time': 20}
+
+        res = self.client.get(ASYNC_RECIPES_URL, params)
+
+        self.assertEqual(
+            res.json()['results'],
+            self.client.get(RECIPES_URL, params).json()['results']
+        )
+        self.assertEqual(len(res.json()['results']), 2)
+
+    def test_recipe_list_invalid_filter(self):
+        """Test invalid filters are rejected."""
+        res = self.client.get(ASYNC_RECIPES_URL, {'min_time': 'soon'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('min_time', res.json())
+
+    def test_recipe_detail_matches(self):
+        """Test the async recipe detail matches the DRF detail."""
+        recipe = Recipe.objects.get(title='Recipe 2')
+
+        res = self.client.get(async_detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(),
+            self.client.get(
+                reverse('recipe:recipe-detail', args=[recipe.id])
+            ).json()
+        )
+
+    def test_recipe_detail_other_user(self):
+        """Test recipes of other users are not found."""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        recipe = Recipe.objects.create(
+            user=other,
+            title='Other',
+            time_minutes=5,
+            price=Decimal('1.00')
+        )
+
+        res = self.client.get(async_detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tag_list_matches(self):
+        """Test the async tag list matches the DRF list."""
+        res = self.client.get(ASYNC_TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), self.client.get(TAGS_URL).json())
+
+    def test_auth_required(self):
+        """Test requests without a valid token are rejected."""
+        self.client.credentials()
+        res = self.client.get(ASYNC_RECIPES_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Token')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        res = self.client.get(ASYNC_TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_served_by_async_client(self):
+        """Test the views are served natively by the ASGI handler."""
+        res = await AsyncClient().get(
+            ASYNC_RECIPES_URL,
+            AUTHORIZATION='Token ' + self.token.key
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()['results']), 3)
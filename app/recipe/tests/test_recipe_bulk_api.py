@@ -0,0 +1,246 @@
+"""
+Tests for the bulk recipe API.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    CollectionVersion,
+    Recipe,
+    Tag
+)
+
+BULK_URL = reverse('recipe:recipe-bulk')
+
+
+def create_recipe(user, **params):
+    """Helper function to create a new recipe."""
+    defaults = {
+        'title': 'Test Recipe',
+        'time_minutes': 10,
+        'price': Decimal('10.40')
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PublicRecipeBulkApiTests(TestCase):
+    """Test unauthenticated bulk API requests."""
+
+    def test_auth_required(self):
+        """Test auth is required for bulk requests."""
+        res = APIClient().post(BULK_URL, [], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateRecipeBulkApiTests(TestCase):
+    """Test authenticated bulk API requests."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_recipes(self):
+        """Test creating a list of recipes with tags."""
+        Tag.objects.create(user=self.user, name='lunch')
+        payload = [
+            {
+                'title': f'Recipe {i}',
+                'time_minutes': 10 + i,
+                'price': '5.50',
+                'tags': [{'name': 'lunch'}, {'name': f'tag {i}'}]
+            }
+            for i in range(3)
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['results']), 3)
+        self.assertEqual(res.data['errors'], [])
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [recipe.title for recipe in recipes],
+            ['Recipe 0', 'Recipe 1', 'Recipe 2']
+        )
+        for i, recipe in enumerate(recipes):
+            self.assertEqual(
+                sorted(tag.name for tag in recipe.tag.all()),
+                ['lunch', f'tag {i}']
+            )
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 4)
+
+    def test_bulk_create_query_count_independent_of_size(self):
+        """Test bulk create issues a fixed number of queries."""
+        Tag.objects.create(user=self.user, name='lunch')
+        CollectionVersion.objects.bump(self.user, CollectionVersion.RECIPES)
+        payload = [
+            {
+                'title': f'Recipe {i}',
+                'time_minutes': 10,
+                'price': '5.50',
+                'tags': [{'name': 'lunch'}]
+            }
+            for i in range(20)
+        ]
+
+        with CaptureQueriesContext(connection) as single:
+            self.client.post(BULK_URL, payload[:1], format='json')
+
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.post(BULK_URL, payload[1:], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['results']), 19)
+        self.assertEqual(len(many), len(single))
+
+    def test_bulk_create_atomic_rejects_batch(self):
+        """Test an invalid item rejects the whole batch by default."""
+        payload = [
+            {'title': 'Valid', 'time_minutes': 10, 'price': '5.50'},
+            {'title': 'Invalid', 'time_minutes': 'soon', 'price': '5.50'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        self.assertIn('time_minutes', res.data['errors'][0]['errors'])
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_bulk_create_non_atomic_skips_invalid(self):
+        """Test invalid items are reported when atomic is disabled."""
+        payload = [
+            {'title': 'Invalid', 'time_minutes': 'soon', 'price': '5.50'},
+            {'title': 'Valid', 'time_minutes': 10, 'price': '5.50'},
+        ]
+
+        res = self.client.post(
+            f'{BULK_URL}?atomic=false',
+            payload,
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['errors'][0]['index'], 0)
+        self.assertEqual(
+            list(Recipe.objects.values_list('title', flat=True)),
+            ['Valid']
+        )
+
+    def test_bulk_create_requires_list(self):
+        """Test the bulk payload must be a list."""
+        res = self.client.post(BULK_URL, {'title': 'Recipe'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_recipes(self):
+        """Test partially updating a list of recipes."""
+        first = create_recipe(user=self.user)
+        second = create_recipe(user=self.user)
+        second.tag.add(Tag.objects.create(user=self.user, name='lunch'))
+        payload = [
+            {'id': first.id, 'title': 'First'},
+            {'id': second.id, 'price': '1.25', 'tags': [{'name': 'dinner'}]},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, 'First')
+        self.assertEqual(second.price, Decimal('1.25'))
+        self.assertEqual(
+            [tag.name for tag in second.tag.all()],
+            ['dinner']
+        )
+        self.assertEqual(res.data['results'][1]['tags'][0]['name'], 'dinner')
+
+    def test_bulk_update_other_users_recipe_not_found(self):
+        """Test recipes of other users can not be updated."""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        recipe = create_recipe(user=other)
+        payload = [{'id': recipe.id, 'title': 'Stolen'}]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.title, 'Test Recipe')
+
+    def test_bulk_update_duplicate_ids_rejected(self):
+        """Test items repeating an id are reported instead of applied."""
+        recipe = create_recipe(user=self.user)
+        other = create_recipe(user=self.user)
+        payload = [
+            {'id': recipe.id, 'title': 'First'},
+            {'id': other.id, 'title': 'Other'},
+            {'id': recipe.id, 'title': 'Second'},
+        ]
+
+        res = self.client.patch(
+            f'{BULK_URL}?atomic=false',
+            payload,
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['errors'], [
+            {'index': 0, 'errors': {'id': ['Duplicate id.']}},
+            {'index': 2, 'errors': {'id': ['Duplicate id.']}},
+        ])
+        recipe.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(recipe.title, 'Test Recipe')
+        self.assertEqual(other.title, 'Other')
+
+    def test_bulk_delete_recipes(self):
+        """Test deleting a list of recipes."""
+        recipes = [create_recipe(user=self.user) for _ in range(3)]
+        payload = [recipes[0].id, recipes[2].id]
+
+        res = self.client.delete(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'],
+            sorted([recipes[0].id, recipes[2].id])
+        )
+        self.assertEqual(
+            list(Recipe.objects.values_list('id', flat=True)),
+            [recipes[1].id]
+        )
+
+    def test_bulk_delete_non_atomic_reports_missing(self):
+        """Test missing ids are reported when atomic is disabled."""
+        recipe = create_recipe(user=self.user)
+
+        res = self.client.delete(
+            f'{BULK_URL}?atomic=false',
+            [recipe.id, recipe.id + 100],
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [recipe.id])
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        self.assertFalse(Recipe.objects.exists())
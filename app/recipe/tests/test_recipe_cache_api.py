@@ -0,0 +1,167 @@
+"""
+Tests for the versioned response cache of the recipe APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+
+
+def detail_url(recipe_id):
+    """Create and return a recipe detail URL."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class ResponseCacheApiTests(TestCase):
+    """Test list and detail responses are cached per collection version."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.create_recipe('Soup')
+
+    def create_recipe(self, title):
+        return self.client.post(
+            RECIPES_URL,
+            {
+                'title': title,
+                'time_minutes': 10,
+                'price': '2.50',
+                'tags': [{'name': 'lunch'}],
+            },
+            format='json'
+        )
+
+    def assertCached(self, url, **params):
+        """Assert a repeated request only looks up the version."""
+        first = self.client.get(url, params)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url, params)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(len(queries), 1)
+
+    def test_list_cached(self):
+        """Test the recipe list is served from the cache."""
+        self.assertCached(RECIPES_URL)
+
+    def test_retrieve_cached(self):
+        """Test recipe details are served from the cache."""
+        self.assertCached(detail_url(Recipe.objects.get().id))
+
+    def test_tag_list_cached(self):
+        """Test the tag list is served from the cache."""
+        self.assertCached(TAGS_URL)
+
+    def test_query_params_cached_separately(self):
+        """Test different query strings never share an entry."""
+        self.create_recipe('Stew')
+        self.client.get(RECIPES_URL)
+
+        res = self.client.get(RECIPES_URL, {'page_size': 1})
+
+        self.assertEqual(len(res.data['results']), 1)
+
+    @override_settings(
+        ALLOWED_HOSTS=['testserver', 'a.example.com', 'b.example.com']
+    )
+    def test_origins_cached_separately(self):
+        """Test pagination links are built for the requesting origin."""
+        self.create_recipe('Stew')
+        params = {'page_size': 1}
+        self.client.get(RECIPES_URL, params, HTTP_HOST='a.example.com')
+
+        res = self.client.get(RECIPES_URL, params, HTTP_HOST='b.example.com')
+        self.assertTrue(res.data['next'].startswith('http://b.example.com/'))
+
+        res = self.client.get(
+            RECIPES_URL,
+            params,
+            HTTP_HOST='b.example.com',
+            secure=True
+        )
+        self.assertTrue(res.data['next'].startswith('https://b.example.com/'))
+
+    def test_create_invalidates(self):
+        """Test creating a recipe is visible on the next list."""
+        self.client.get(RECIPES_URL)
+        self.create_recipe('Stew')
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_update_invalidates(self):
+        """Test updating a recipe is visible on the next retrieve."""
+        url = detail_url(Recipe.objects.get().id)
+        self.client.get(url)
+        self.client.patch(url, {'title': 'Broth'})
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.data['title'], 'Broth')
+
+    def test_destroy_invalidates(self):
+        """Test deleting a recipe is visible on the next list."""
+        self.client.get(RECIPES_URL)
+        self.client.delete(detail_url(Recipe.objects.get().id))
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_tag_update_invalidates_recipes(self):
+        """Test renaming a tag is visible in cached recipes."""
+        self.client.get(RECIPES_URL)
+        self.client.get(TAGS_URL)
+        tag_id = Recipe.objects.get().tag.get().id
+
+        self.client.patch(
+            reverse('recipe:tag-detail', args=[tag_id]),
+            {'name': 'dinner'}
+        )
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.data['results'][0]['tags'][0]['name'], 'dinner')
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.data[0]['name'], 'dinner')
+
+    def test_cache_is_per_user(self):
+        """Test users never see each other's cached responses."""
+        self.client.get(RECIPES_URL)
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        self.client.force_authenticate(other)
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    @override_settings(RECIPE_RESPONSE_CACHE={'ALIAS': '', 'TTL': 300})
+    def test_cache_disabled(self):
+        """Test an empty cache alias disables response caching."""
+        self.client.get(RECIPES_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(queries), 3)
@@ -0,0 +1,225 @@
+"""
+Tests for conditional GET requests to the recipe APIs.
+"""
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    CollectionVersion,
+    Recipe,
+    Tag
+)
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+
+
+def detail_url(recipe_id):
+    """Create and return a recipe detail URL."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def create_recipe(user, **params):
+    """Helper function to create a new recipe."""
+    defaults = {
+        'title': 'Test Recipe',
+        'time_minutes': 10,
+        'price': Decimal('10.40')
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class ConditionalGetApiTests(TestCase):
+    """Test ETag validation of list and detail views."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.post(
+            RECIPES_URL,
+            {
+                'title': 'Soup',
+                'time_minutes': 10,
+                'price': '2.50',
+                'tags': [{'name': 'lunch'}],
+            },
+            format='json'
+        )
+
+    def test_list_returns_validators(self):
+        """Test list responses carry an ETag only."""
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', res)
+        self.assertNotIn('Last-Modified', res)
+        self.assertIn('no-cache', res['Cache-Control'])
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test a matching If-None-Match skips the list query."""
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(len(queries), 1)
+
+    def test_if_modified_since_ignored(self):
+        """Test a write in the second of a fetch is never hidden from
+        clients only sending If-Modified-Since.
+        """
+        self.client.get(RECIPES_URL)
+        self.client.post(
+            RECIPES_URL,
+            {'title': 'Stew', 'time_minutes': 20, 'price': '4.00'},
+            format='json'
+        )
+
+        res = self.client.get(
+            RECIPES_URL,
+            HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_etag_depends_on_query_string(self):
+        """Test different pages of the list do not share an ETag."""
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        res = self.client.get(
+            RECIPES_URL,
+            {'page_size': 1},
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_write_changes_etag(self):
+        """Test creating a recipe invalidates the previous ETag."""
+        etag = self.client.get(RECIPES_URL)['ETag']
+        create_payload = {'title': 'Stew', 'time_minutes': 5, 'price': '1.00'}
+        self.client.post(RECIPES_URL, create_payload)
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_retrieve_not_modified(self):
+        """Test the detail view honours If-None-Match."""
+        url = detail_url(Recipe.objects.get().id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'title': 'Broth'})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], 'Broth')
+
+    def test_bulk_delete_changes_etag(self):
+        """Test bulk writes invalidate the previous ETag."""
+        etag = self.client.get(RECIPES_URL)['ETag']
+        self.client.delete(
+            reverse('recipe:recipe-bulk'),
+            [Recipe.objects.get().id],
+            format='json'
+        )
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+    def test_tag_rename_changes_recipe_etag(self):
+        """Test renaming a tag invalidates recipes embedding it."""
+        recipes_etag = self.client.get(RECIPES_URL)['ETag']
+        tags_etag = self.client.get(TAGS_URL)['ETag']
+        tag = Tag.objects.get()
+
+        self.client.patch(
+            reverse('recipe:tag-detail', args=[tag.id]),
+            {'name': 'dinner'}
+        )
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=recipes_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['tags'][0]['name'], 'dinner')
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=tags_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_tags_not_modified(self):
+        """Test the tag list honours If-None-Match."""
+        etag = self.client.get(TAGS_URL)['ETag']
+
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_is_per_user(self):
+        """Test another user's ETag never matches."""
+        etag = self.client.get(RECIPES_URL)['ETag']
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        self.client.force_authenticate(other)
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_failed_write_keeps_version(self):
+        """Test a failed write rolls its version bump back with it."""
+        version = CollectionVersion.objects.current(
+            self.user,
+            CollectionVersion.RECIPES
+        )
+        bump = CollectionVersion.objects.bump
+
+        def bump_then_fail(*args):
+            bump(*args)
+            raise RuntimeError('write failed')
+
+        with patch.object(
+            CollectionVersion.objects,
+            'bump',
+            side_effect=bump_then_fail
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.post(
+                    RECIPES_URL,
+                    {'title': 'Stew', 'time_minutes': 20, 'price': '4.00'},
+                    format='json'
+                )
+
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(
+            CollectionVersion.objects.current(
+                self.user,
+                CollectionVersion.RECIPES
+            ),
+            version
+        )
@@ -0,0 +1,134 @@
+"""
+Tests for the recipe export API.
+"""
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag
+)
+
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+def create_recipe(user, **params):
+    """Helper function to create a new recipe."""
+    defaults = {
+        'title': 'Test Recipe',
+        'time_minutes': 10,
+        'price': Decimal('10.40')
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PrivateRecipeExportApiTests(TestCase):
+    """Test exporting recipes for the authenticated user."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        tag = Tag.objects.create(user=self.user, name='lunch')
+        self.first = create_recipe(user=self.user, title='First')
+        self.second = create_recipe(user=self.user, title='Second')
+        self.second.tag.add(tag)
+
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        create_recipe(user=other, title='Other')
+
+    def test_export_ndjson(self):
+        """Test recipes are streamed as one JSON document per line."""
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(rows, [
+            {
+                'id': self.second.id,
+                'title': 'Second',
+                'time_minutes': 10,
+                'price': '10.40',
+                'tags': [{'id': self.second.tag.get().id, 'name': 'lunch'}],
+            },
+            {
+                'id': self.first.id,
+                'title': 'First',
+                'time_minutes': 10,
+                'price': '10.40',
+                'tags': [],
+            },
+        ])
+
+    def test_export_csv(self):
+        """Test recipes are streamed as CSV with a header row."""
+        res = self.client.get(EXPORT_URL, {'type': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        content = b''.join(res.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['title'] for row in rows], ['Second', 'First'])
+        self.assertEqual(rows[0]['tags'], 'lunch')
+        self.assertEqual(rows[1]['price'], '10.40')
+
+    def test_export_csv_neutralizes_formulas(self):
+        """Test user text that spreadsheets would evaluate is quoted."""
+        Recipe.objects.filter(user=self.user).delete()
+        formula = create_recipe(user=self.user, title='=HYPERLINK("x")')
+        formula.tag.add(Tag.objects.create(user=self.user, name='@SUM(1)'))
+        create_recipe(user=self.user, title="'=quoted")
+        create_recipe(user=self.user, title='Plain - text')
+
+        res = self.client.get(EXPORT_URL, {'type': 'csv'})
+
+        content = b''.join(res.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(
+            [row['title'] for row in rows],
+            ['Plain - text', "''=quoted", '\'=HYPERLINK("x")']
+        )
+        self.assertEqual(rows[2]['tags'], "'@SUM(1)")
+        self.assertEqual(rows[0]['tags'], '')
+
+    @override_settings(RECIPE_EXPORT_CHUNK_SIZE=1)
+    def test_export_fetches_in_chunks(self):
+        """Test the export reads the recipes chunk by chunk."""
+        res = self.client.get(EXPORT_URL)
+        with CaptureQueriesContext(connection) as queries:
+            content = b''.join(res.streaming_content).decode()
+
+        self.assertEqual(len(content.splitlines()), 2)
+        tag_queries = [
+            query for query in queries
+            if 'core_recipe_tag' in query['sql']
+        ]
+        self.assertEqual(len(tag_queries), 2)
+
+    def test_export_unknown_type(self):
+        """Test an unknown export type is rejected."""
+        res = self.client.get(EXPORT_URL, {'type': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,100 @@
+"""
+Tests for the fast list rendering of the recipe APIs.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag
+)
+from recipe.serializers import ValuesRepresentation
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+
+
+@override_settings(RECIPE_RESPONSE_CACHE={'ALIAS': '', 'TTL': 0})
+class FastListApiTests(TestCase):
+    """Test fast list responses are identical to serializer output."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        tags = Tag.objects.bulk_create([
+            Tag(user=self.user, name=name, description='')
+            for name in ('vegan', 'quick', 'spicy ☃')
+        ])
+        for i in range(7):
+            recipe = Recipe.objects.create(
+                user=self.user,
+                title=f'Soup "{i}"',
+                time_minutes=i * 10,
+                price=Decimal('0.5') * i
+            )
+            recipe.tag.set(tags[i % 3:])
+        Recipe.objects.create(
+            user=self.user,
+            title='Plain',
+            time_minutes=1,
+            price=Decimal('9.99')
+        )
+
+    def assertSameContent(self, url, params=None):
+        """Assert url renders the same bytes with and without fast lists."""
+        with override_settings(RECIPE_FAST_LIST=False):
+            slow = self.client.get(url, params)
+        with override_settings(RECIPE_FAST_LIST=True):
+            fast = self.client.get(url, params)
+
+        self.assertEqual(fast.status_code, slow.status_code)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_recipe_list(self):
+        """Test recipe pages match, including the next page cursor."""
+        self.assertSameContent(RECIPES_URL)
+        self.assertSameContent(RECIPES_URL, {'page_size': 3})
+
+    def test_recipe_list_filtered(self):
+        """Test filtered and searched recipe lists match."""
+        tag = Tag.objects.get(name='quick')
+        self.assertSameContent(RECIPES_URL, {'tags': tag.id})
+        self.assertSameContent(RECIPES_URL, {'search': 'soup'})
+
+    def test_tag_list(self):
+        """Test tag lists match."""
+        self.assertSameContent(TAGS_URL)
+
+    def test_empty_list(self):
+        """Test lists without rows match."""
+        Recipe.objects.all().delete()
+
+        self.assertSameContent(RECIPES_URL)
+
+
+class ValuesRepresentationTests(TestCase):
+    """Test compiling serializers into values representations."""
+
+    def test_unsupported_field(self):
+        """Test fields without a plain model source are rejected."""
+        class RecipeTitleSerializer(serializers.ModelSerializer):
+            upper = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Recipe
+                fields = ['id', 'upper']
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesRepresentation(RecipeTitleSerializer())
@@ -0,0 +1,174 @@
+"""
+Tests for filtering the recipe API.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Recipe,
+    Tag
+)
+
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+def detail_url(recipe_id):
+    """Create and return a recipe detail URL."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def create_recipe(user, **params):
+    """Helper function to create a new recipe."""
+    defaults = {
+        'title': 'Test Recipe',
+        'time_minutes': 10,
+        'price': Decimal('10.40')
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PrivateRecipeFilterApiTests(TestCase):
+    """Test filtering the recipes of the authenticated user."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.vegan = Tag.objects.create(user=self.user, name='vegan')
+        self.quick = Tag.objects.create(user=self.user, name='quick')
+        self.salad = create_recipe(
+            self.user,
+            title='Salad',
+            time_minutes=5,
+            price=Decimal('4.00')
+        )
+        self.salad.tag.add(self.vegan, self.quick)
+        self.curry = create_recipe(
+            self.user,
+            title='Curry',
+            time_minutes=45,
+            price=Decimal('12.00')
+        )
+        self.curry.tag.add(self.vegan)
+        self.toast = create_recipe(
+            self.user,
+            title='Toast',
+            time_minutes=3,
+            price=Decimal('1.50')
+        )
+        self.toast.tag.add(self.quick)
+        create_recipe(self.user, title='Stew', time_minutes=120)
+
+    def filter(self, **params):
+        res = self.client.get(RECIPES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {recipe['title'] for recipe in res.data['results']}
+
+    def tag_ids(self, *tags):
+        return ','.join(str(tag.id) for tag in tags)
+
+    def test_filter_any_tag(self):
+        """Test recipes linked to any of the tags are returned."""
+        titles = self.filter(tags=self.tag_ids(self.vegan, self.quick))
+
+        self.assertEqual(titles, {'Salad', 'Curry', 'Toast'})
+
+    def test_filter_all_tags(self):
+        """Test recipes linked to every tag are returned."""
+        titles = self.filter(
+            tags=self.tag_ids(self.vegan, self.quick, self.quick),
+            tags_match='all'
+        )
+
+        self.assertEqual(titles, {'Salad'})
+
+    def test_filter_time_range(self):
+        """Test recipes are filtered by preparation time."""
+        self.assertEqual(self.filter(max_time=5), {'Salad', 'Toast'})
+        self.assertEqual(
+            self.filter(min_time=5, max_time=60),
+            {'Salad', 'Curry'}
+        )
+
+    def test_filter_price_range(self):
+        """Test recipes are filtered by price."""
+        self.assertEqual(
+            self.filter(min_price='2', max_price='10.40'),
+            {'Salad', 'Stew'}
+        )
+
+    def test_filters_combine(self):
+        """Test tag and range filters apply together."""
+        titles = self.filter(
+            tags=self.tag_ids(self.vegan),
+            max_time=30,
+            max_price='10'
+        )
+
+        self.assertEqual(titles, {'Salad'})
+
+    def test_filter_tags_of_other_user(self):
+        """Test other users' recipes never match their tags."""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        tag = Tag.objects.create(user=other, name='vegan')
+        create_recipe(other, title='Other').tag.add(tag)
+
+        self.assertEqual(self.filter(tags=self.tag_ids(tag)), set())
+
+    def test_invalid_filters_rejected(self):
+        """Test malformed filter values return a 400."""
+        for params in (
+            {'tags': '1,a'},
+            {'tags_match': 'some'},
+            {'max_time': '-1'},
+            {'min_price': 'cheap'},
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(RECIPES_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filters_ignored_outside_lists(self):
+        """Test filter parameters do not apply to detail and write routes."""
+        params = f'?tags={self.quick.id}&max_time=1&tags_match=some'
+        url = detail_url(self.curry.id) + params
+
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.patch(url, {'title': 'Green curry'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.delete(url)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_all_tags_single_subquery(self):
+        """Test all-tags filtering does not join once per tag."""
+        tags = Tag.objects.bulk_create([
+            Tag(user=self.user, name=f'tag {i}', description='')
+            for i in range(5)
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.filter(tags=self.tag_ids(*tags), tags_match='all')
+
+        sql = next(
+            query['sql'] for query in queries
+            if 'HAVING' in query['sql']
+        )
+        self.assertEqual(sql.count('JOIN'), 0)
@@ -0,0 +1,146 @@
+"""
+Tests for the recipe search API.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+def detail_url(recipe_id):
+    """Create and return a recipe detail URL."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def create_recipe(user, **params):
+    """Helper function to create a new recipe."""
+    defaults = {
+        'title': 'Test Recipe',
+        'time_minutes': 10,
+        'price': Decimal('10.40')
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PrivateRecipeSearchApiTests(TestCase):
+    """Test searching the recipes of the authenticated user."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, term, **params):
+        res = self.client.get(RECIPES_URL, {'search': term, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def titles(self, res):
+        return [recipe['title'] for recipe in res.data['results']]
+
+    def test_search_matches_words(self):
+        """Test only recipes whose title matches are returned."""
+        create_recipe(self.user, title='Tomato soup')
+        create_recipe(self.user, title='Chicken curry')
+
+        res = self.search('soup')
+
+        self.assertEqual(self.titles(res), ['Tomato soup'])
+
+    def test_search_matches_partial_words(self):
+        """Test the start of a word matches the whole word."""
+        create_recipe(self.user, title='Pancakes with syrup')
+        create_recipe(self.user, title='Waffles')
+
+        res = self.search('panc')
+
+        self.assertEqual(self.titles(res), ['Pancakes with syrup'])
+
+    def test_search_ranks_best_match_first(self):
+        """Test recipes matching more often rank higher."""
+        create_recipe(self.user, title='Soup, soup and more soup')
+        create_recipe(self.user, title='Bread with a side of soup')
+
+        res = self.search('soup')
+
+        self.assertEqual(self.titles(res), [
+            'Soup, soup and more soup',
+            'Bread with a side of soup',
+        ])
+
+    def test_search_limited_to_user(self):
+        """Test recipes of other users are never found."""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        create_recipe(other, title='Tomato soup')
+
+        res = self.search('soup')
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_search_sees_updates(self):
+        """Test renamed and deleted recipes are searched by their title."""
+        renamed = create_recipe(self.user, title='Tomato soup')
+        deleted = create_recipe(self.user, title='Onion soup')
+        renamed.title = 'Tomato salad'
+        renamed.save()
+        deleted.delete()
+
+        self.assertEqual(self.titles(self.search('soup')), [])
+        self.assertEqual(self.titles(self.search('salad')), ['Tomato salad'])
+
+    def test_search_paginated_by_page_number(self):
+        """Test search results are split into numbered pages."""
+        for i in range(3):
+            create_recipe(self.user, title=f'Soup {i}')
+
+        res = self.search('soup', page_size=2)
+
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIn('page=2', res.data['next'])
+
+    def test_search_without_words(self):
+        """Test a term without any word matches nothing."""
+        create_recipe(self.user, title='Tomato soup')
+
+        res = self.search('"*')
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_blank_search_lists_recipes(self):
+        """Test a blank search term keeps the regular list."""
+        create_recipe(self.user, title='Tomato soup')
+
+        res = self.search(' ')
+
+        self.assertEqual(self.titles(res), ['Tomato soup'])
+        self.assertNotIn('count', res.data)
+
+    def test_search_ignored_outside_lists(self):
+        """Test a search term does not hide recipes from other routes."""
+        recipe = create_recipe(self.user, title='Tomato soup')
+        url = detail_url(recipe.id) + '?search=salad'
+
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.patch(url, {'title': 'Onion soup'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.delete(url)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
@@ -8,7 +8,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from recipe import views
+from recipe import async_views, views
 
 router = DefaultRouter()
 router.register('recipes', views.RecipeViewSet)
@@ -18,5 +18,20 @@ app_name = 'recipe'
 
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(router.urls)),
+    path(
+        'async/recipes/',
+        async_views.RecipeListView.as_view(),
+        name='async-recipe-list'
+    ),
+    path(
+        'async/recipes/<int:pk>/',
+        async_views.RecipeDetailView.as_view(),
+        name='async-recipe-detail'
+    ),
+    path(
+        'async/tags/',
+        async_views.TagListView.as_view(),
+        name='async-tag-list'
+    ),
 ]
@@ -1,50 +1,383 @@
 """
 Views for the recipe APIs.
 """
+import csv
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import StreamingHttpResponse
 
 from rest_framework import (
     viewsets,
-    mixins
+    mixins,
+    serializers,
+    status
 )
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from core.mixins import ReplicaReadMixin
 from core.models import (
+    CollectionVersion,
     Recipe,
     Tag
 )
+from recipe.csv_format import (
+    EXPORT_CSV_FIELDS,
+    EXPORT_CSV_TAG_SEPARATOR,
+    EXPORT_CSV_TEXT_FIELDS,
+    escape_csv_text
+)
+from recipe.filters import RecipeFilter, RecipeSearchFilter
+from recipe.mixins import CachedResponseMixin, FastListMixin
+from recipe.pagination import (
+    RecipeCursorPagination,
+    RecipeSearchPagination
+)
 from recipe.serializers import (
     RecipeSerializer,
     TagSerializer
 )
+from user.authentication import CachedTokenAuthentication
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def tag_prefetch():
+    """Return the prefetch of recipe tags in a stable order."""
+    return Prefetch('tag', queryset=Tag.objects.order_by('id'))
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class Echo:
+    """File-like object that returns what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+class RecipeViewSet(ReplicaReadMixin,
+                    CachedResponseMixin,
+                    FastListMixin,
+                    viewsets.ModelViewSet):
     """View for manage recipe APIs."""
     serializer_class = RecipeSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    filter_backends = [RecipeFilter, RecipeSearchFilter]
+    collection = CollectionVersion.RECIPES
+    query_budget = {
+        'list': 3,
+        # A list with ?search=, its numbered pages count the matches.
+        'search': 4,
+        'retrieve': 3,
+        'create': 8,
+        'update': 12,
+        'partial_update': 7,
+        'destroy': 7,
+        'bulk_create': 7,
+        'bulk_update': 10,
+        'bulk_destroy': 7,
+        'export': 2,
+    }
 
     def get_queryset(self):
         """Retrieve recipes for authenticated user"""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        return self.queryset.filter(
+            user=self.request.user
+        ).order_by('-id').prefetch_related(tag_prefetch())
+
+    @property
+    def paginator(self):
+        """Return numbered pages for searches, cursor pages otherwise."""
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if RecipeSearchFilter().get_search_term(request):
+                self._paginator = RecipeSearchPagination()
+            else:
+                self._paginator = self.pagination_class()
+
+        return self._paginator
+
+    def bump_version(self):
+        """Mark the recipes of the user as changed.
+
+        Called inside the write's transaction, so a rolled back write
+        leaves the version alone and readers never see the new version
+        before the data it describes.
+        """
+        CollectionVersion.objects.bump(
+            self.request.user,
+            CollectionVersion.RECIPES
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def perform_create(self, serializer):
         """Create a new recipe"""
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+            self.bump_version()
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            self.bump_version()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            self.bump_version()
+
+    def _bulk_is_atomic(self):
+        """Return False when invalid items should be skipped, not fatal."""
+        atomic = self.request.query_params.get('atomic', 'true')
+        return atomic.lower() not in ('false', '0')
+
+    def _bulk_serializer(self, data, instances, indexes):
+        """Return a list serializer for the items of data at indexes."""
+        if instances is not None:
+            instances = [instances[i] for i in indexes]
+
+        return self.get_serializer(
+            instances,
+            data=[data[i] for i in indexes],
+            many=True,
+            partial=instances is not None
+        )
+
+    def _bulk_data(self):
+        """Return the request payload, which must be a list of items."""
+        data = self.request.data
+        if not isinstance(data, list):
+            raise ValidationError(
+                {'non_field_errors': ['Expected a list of items.']}
+            )
+        if len(data) > settings.RECIPE_BULK_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [
+                'Ensure this field has no more than '
+                f'{settings.RECIPE_BULK_MAX_ITEMS} elements.'
+            ]})
+
+        return data
+
+    def _bulk_response(self, results, errors, status_code):
+        """Return the bulk response, or a 400 if results is None."""
+        errors = [
+            {'index': index, 'errors': errors[index]}
+            for index in sorted(errors)
+        ]
+        if errors and results is None:
+            return Response(
+                {'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {'results': results, 'errors': errors},
+            status=status_code
+        )
+
+    def _bulk_save(self, data, instances=None, errors=None):
+        """Validate and save data as one batch of recipes.
 
+        Returns the saved representations, or None when the batch was
+        rejected, together with item errors keyed by their index in data.
+        Unless the request opted out of atomic batches any item error
+        rejects the whole batch.
+        """
+        errors = dict(errors or {})
+        indexes = [i for i in range(len(data)) if i not in errors]
 
-class TagViewSet(mixins.UpdateModelMixin,
+        serializer = self._bulk_serializer(data, instances, indexes)
+        if not serializer.is_valid():
+            for index, error in zip(indexes, serializer.errors):
+                if error:
+                    errors[index] = error
+            indexes = [i for i in indexes if i not in errors]
+            serializer = None
+
+        if errors and self._bulk_is_atomic():
+            return None, errors
+
+        results = []
+        if indexes:
+            if serializer is None:
+                serializer = self._bulk_serializer(data, instances, indexes)
+                serializer.is_valid(raise_exception=True)
+            extra = {'user': self.request.user} if instances is None else {}
+            with transaction.atomic():
+                recipes = serializer.save(**extra)
+                self.bump_version()
+            prefetch_related_objects(recipes, tag_prefetch())
+            results = serializer.data
+
+        return results, errors
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    def bulk_create(self, request):
+        """Create a list of recipes in one transaction."""
+        results, errors = self._bulk_save(self._bulk_data())
+        return self._bulk_response(results, errors, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Partially update a list of recipes identified by id."""
+        data = self._bulk_data()
+        ids = serializers.IntegerField()
+        errors, instances = {}, {}
+        for index, item in enumerate(data):
+            try:
+                instances[index] = ids.run_validation(item.get('id'))
+            except (AttributeError, ValidationError):
+                errors[index] = {'id': ['A valid integer is required.']}
+
+        # Items sharing an id would update one instance, none of them wins.
+        counts = Counter(instances.values())
+        for index, recipe_id in list(instances.items()):
+            if counts[recipe_id] > 1:
+                del instances[index]
+                errors[index] = {'id': ['Duplicate id.']}
+
+        recipes = Recipe.objects.filter(
+            user=request.user,
+            id__in=instances.values()
+        ).in_bulk()
+        for index, recipe_id in instances.items():
+            if recipe_id in recipes:
+                instances[index] = recipes[recipe_id]
+            else:
+                errors[index] = {'id': ['Not found.']}
+
+        results, errors = self._bulk_save(data, instances, errors)
+        return self._bulk_response(results, errors, status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        """Delete a list of recipes identified by id."""
+        field = serializers.ListField(
+            child=serializers.IntegerField(),
+            max_length=settings.RECIPE_BULK_MAX_ITEMS
+        )
+        ids = field.run_validation(request.data)
+
+        queryset = Recipe.objects.filter(user=request.user, id__in=ids)
+        found = set(queryset.values_list('id', flat=True))
+        errors = {
+            index: {'id': ['Not found.']}
+            for index, recipe_id in enumerate(ids)
+            if recipe_id not in found
+        }
+        if errors and self._bulk_is_atomic():
+            return self._bulk_response(None, errors, status.HTTP_200_OK)
+
+        with transaction.atomic():
+            queryset.filter(id__in=found).delete()
+            if found:
+                self.bump_version()
+
+        return self._bulk_response(
+            sorted(found),
+            errors,
+            status.HTTP_200_OK
+        )
+
+    def _export_rows(self):
+        """Yield the representation of each recipe, one chunk at a time."""
+        serializer = self.get_serializer()
+        recipes = self.get_queryset().iterator(
+            chunk_size=settings.RECIPE_EXPORT_CHUNK_SIZE
+        )
+        for recipe in recipes:
+            yield serializer.to_representation(recipe)
+
+    def _export_ndjson(self, rows):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(row) + '\n'
+
+    def _export_csv(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_CSV_FIELDS)
+        for row in rows:
+            row['tags'] = EXPORT_CSV_TAG_SEPARATOR.join(
+                tag['name'] for tag in row['tags']
+            )
+            for field in EXPORT_CSV_TEXT_FIELDS:
+                row[field] = escape_csv_text(row[field])
+            yield writer.writerow([row[field] for field in EXPORT_CSV_FIELDS])
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every recipe of the user as NDJSON or CSV."""
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({'type': [
+                f'Expected one of {", ".join(EXPORT_CONTENT_TYPES)}.'
+            ]})
+
+        stream = getattr(self, f'_export_{export_type}')
+        response = StreamingHttpResponse(
+            stream(self._export_rows()),
+            content_type=EXPORT_CONTENT_TYPES[export_type]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{export_type}"'
+        )
+
+        return response
+
+
+class TagViewSet(ReplicaReadMixin,
+                 CachedResponseMixin,
+                 FastListMixin,
+                 mixins.UpdateModelMixin,
                  mixins.DestroyModelMixin,
                  mixins.ListModelMixin,
                  viewsets.GenericViewSet):
     """View for manage tag APIs."""
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    collection = CollectionVersion.TAGS
+    query_budget = {
+        'list': 2,
+        'update': 5,
+        'partial_update': 5,
+        'destroy': 6,
+    }
 
     def get_queryset(self):
         """Retrieve tags for authenticated user"""
         return self.queryset.filter(user=self.request.user).order_by('-name')
+
+    def bump_version(self):
+        """Mark the tags, and the recipes embedding them, as changed."""
+        CollectionVersion.objects.bump(
+            self.request.user,
+            CollectionVersion.TAGS,
+            CollectionVersion.RECIPES
+        )
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            self.bump_version()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            self.bump_version()
@@ -0,0 +1,228 @@
+"""
+Authentication classes for the API.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import exceptions
+from django.utils import timezone
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+from core.models import AuthToken
+
+
+class TokenCache:
+    """Two tier cache of token key to (user, token).
+
+    The first tier is a bounded, TTL-evicting LRU private to the process.
+    The second, optional tier is a Django cache shared between processes,
+    selected by alias in ``settings.TOKEN_AUTH_CACHE['SHARED_CACHE']``.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return settings.TOKEN_AUTH_CACHE['MAX_SIZE']
+
+    @property
+    def ttl(self):
+        return settings.TOKEN_AUTH_CACHE['TTL']
+
+    @property
+    def shared(self):
+        alias = settings.TOKEN_AUTH_CACHE.get('SHARED_CACHE')
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def shared_key(key):
+        """Return the shared cache key, never storing the raw token."""
+        return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        """Return the cached (user, token) for key or None."""
+        now = time.monotonic()
+        value = self._get_local(key, now)
+        shared = self.shared
+        if value is not None or shared is None:
+            return value
+
+        value = shared.get(self.shared_key(key))
+        if value is not None:
+            self._store(key, value, now)
+        return value
+
+    async def aget(self, key):
+        """Async variant of get(), the shared tier is not read blocking."""
+        now = time.monotonic()
+        value = self._get_local(key, now)
+        shared = self.shared
+        if value is not None or shared is None:
+            return value
+
+        value = await shared.aget(self.shared_key(key))
+        if value is not None:
+            self._store(key, value, now)
+        return value
+
+    def set(self, key, value):
+        """Cache value for key in every tier."""
+        self._store(key, value, time.monotonic())
+        shared = self.shared
+        if shared is not None:
+            shared.set(self.shared_key(key), value, self.ttl)
+
+    async def aset(self, key, value):
+        """Async variant of set()."""
+        self._store(key, value, time.monotonic())
+        shared = self.shared
+        if shared is not None:
+            await shared.aset(self.shared_key(key), value, self.ttl)
+
+    def delete(self, *keys):
+        """Remove keys from every tier."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        shared = self.shared
+        if shared is not None and keys:
+            shared.delete_many([self.shared_key(key) for key in keys])
+
+    def clear(self):
+        """Empty the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_local(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        return None
+
+    def _store(self, key, value, now):
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+token_cache = TokenCache()
+
+
+def invalidate_user_tokens(user):
+    """Drop every cached token belonging to user."""
+    keys = AuthToken.objects.filter(user=user).values_list('key', flat=True)
+    token_cache.delete(*keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that avoids the token and user lookup query.
+
+    Tokens are resolved from ``token_cache`` and only fall back to the
+    database on a miss, a single lookup of the unique key. Entries are
+    invalidated when a token is deleted or its user is updated through
+    ``UserSerializer``; changes made elsewhere become visible once the
+    entry's TTL runs out. Expiry is checked on every request, expired
+    tokens are left for the ``reap_tokens`` command to delete.
+
+    Invalidation reaches the local tier of the process making the change
+    and the shared tier only. Other processes keep accepting a revoked
+    token until their local entry expires, at most
+    ``TOKEN_AUTH_CACHE['TTL']`` seconds later. A TTL of 0 makes revocation
+    immediate at the cost of a lookup per request.
+    """
+    model = AuthToken
+
+    def get_key(self, request):
+        """Return the token key of the Authorization header, or None."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header. No credentials provided.'
+            )
+        elif len(auth) > 2:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header. Token string should not contain spaces.'
+            )
+
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header. Token string should not contain '
+                'invalid characters.'
+            )
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        return None if key is None else self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """Async variant of authenticate() for async views.
+
+        Local cache hits are served on the event loop, the shared tier is
+        read with the async cache API and misses look the token up with
+        the async ORM.
+        """
+        key = self.get_key(request)
+        if key is None:
+            return None
+
+        cached = await token_cache.aget(key)
+        if cached is None:
+            try:
+                token = await self.model.objects.select_related(
+                    'user'
+                ).aget(key=key)
+            except self.model.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid token.')
+            cached = (token.user, token)
+            await token_cache.aset(key, cached)
+
+        return self.check_credentials(cached)
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            try:
+                token = self.model.objects.select_related('user').get(key=key)
+            except self.model.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid token.')
+            cached = (token.user, token)
+            token_cache.set(key, cached)
+
+        return self.check_credentials(cached)
+
+    def check_credentials(self, cached):
+        """Return the request's (user, token) if the token is usable."""
+        user, token = cached
+        if token.expires_at <= timezone.now():
+            raise exceptions.AuthenticationFailed('Token has expired.')
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        # Every request gets its own copy, views are free to mutate it.
+        return (copy.copy(user), token)
@@ -8,8 +8,12 @@ from django.contrib.auth import (
     authenticate
 )
 
+from core.serializers import TimedSerializerMixin
+from core.models import AuthToken
+from user.authentication import invalidate_user_tokens
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for the users object."""
 
     class Meta:
@@ -30,6 +34,8 @@ class UserSerializer(serializers.ModelSerializer):
             user.set_password(password)
             user.save()
 
+        invalidate_user_tokens(user)
+
         return user
 
 
@@ -40,6 +46,12 @@ class AuthTokenSerializer(serializers.Serializer):
         style={'input_type': 'password'},
         trim_whitespace=False
     )
+    device = serializers.CharField(
+        max_length=64,
+        required=False,
+        allow_blank=True,
+        default=''
+    )
 
     def validate(self, attrs):
         """Validate and authenticate the user."""
@@ -58,3 +70,21 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class IssuedTokenSerializer(serializers.ModelSerializer):
+    """Serializer for a token returned on login."""
+    token = serializers.CharField(source='key')
+
+    class Meta:
+        model = AuthToken
+        fields = ('token', 'device', 'expires_at')
+
+
+class TokenSerializer(serializers.ModelSerializer):
+    """Serializer for the tokens of a user, without their keys."""
+
+    class Meta:
+        model = AuthToken
+        fields = ('id', 'device', 'created', 'expires_at')
+        read_only_fields = fields
@@ -0,0 +1,16 @@
+"""
+Signal handlers for the user app.
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.models import AuthToken
+
+
+@receiver(post_delete, sender=AuthToken)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Drop a deleted token from the authentication cache."""
+    # Imported here so app loading does not import DRF.
+    from user.authentication import token_cache
+
+    token_cache.delete(instance.key)
@@ -0,0 +1,148 @@
+"""
+Tests for the cached token authentication.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import AuthToken
+from user.authentication import TokenCache, token_cache
+
+ME_URL = reverse('user:me')
+
+
+def create_user(**params):
+    """Helper function to create a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class TokenCacheTests(TestCase):
+    """Test the in-process token cache tier."""
+
+    def setUp(self):
+        self.cache = TokenCache()
+
+    @override_settings(TOKEN_AUTH_CACHE={'MAX_SIZE': 2, 'TTL': 60})
+    def test_least_recently_used_evicted(self):
+        """Test the cache keeps at most MAX_SIZE entries."""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+
+    @override_settings(TOKEN_AUTH_CACHE={'MAX_SIZE': 2, 'TTL': 60})
+    @patch('user.authentication.time.monotonic')
+    def test_entries_expire_after_ttl(self, patched_monotonic):
+        """Test entries are evicted once their TTL runs out."""
+        patched_monotonic.return_value = 100
+        self.cache.set('a', 1)
+
+        patched_monotonic.return_value = 159
+        self.assertEqual(self.cache.get('a'), 1)
+
+        patched_monotonic.return_value = 160
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    @override_settings(TOKEN_AUTH_CACHE={
+        'MAX_SIZE': 2,
+        'TTL': 60,
+        'SHARED_CACHE': 'default',
+    })
+    def test_shared_tier_fills_local_tier(self):
+        """Test a miss in process is served from the shared cache."""
+        self.cache.set('a', 1)
+        self.cache.clear()
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(len(self.cache), 1)
+
+        self.cache.delete('a')
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating API requests through the token cache."""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = create_user(
+            email='test@example.com',
+            password='Testpass123',
+            name='Test User'
+        )
+        self.token = AuthToken.objects.rotate(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_token_lookup_cached(self):
+        """Test the token is only looked up on the first request."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_deleted_token_rejected(self):
+        """Test deleting a token invalidates its cache entry."""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates_cache(self):
+        """Test updating the user drops its cached tokens."""
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {'password': 'Newpass123'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_inactive_user_rejected(self):
+        """Test a deactivated user can not authenticate."""
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_token_rejected(self):
+        """Test a token past its expiry can not authenticate."""
+        AuthToken.objects.filter(pk=self.token.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_token_expires(self):
+        """Test a cached token is rejected once it expires."""
+        self.client.get(ME_URL)
+
+        with patch('user.authentication.timezone.now') as patched_now:
+            patched_now.return_value = self.token.expires_at
+            with self.assertNumQueries(0):
+                res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,181 @@
+"""
+Tests for issuing and revoking auth tokens.
+"""
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import AuthToken
+from user.authentication import TokenCache, token_cache
+
+TOKEN_URL = reverse('user:token')
+TOKENS_URL = reverse('user:tokens')
+ME_URL = reverse('user:me')
+
+
+def token_detail_url(token_id):
+    """Create and return a token detail URL."""
+    return reverse('user:token-detail', args=[token_id])
+
+
+class TokenApiTests(TestCase):
+    """Test logging in and managing tokens."""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'Testpass123',
+        )
+        self.client = APIClient()
+
+    def login(self, **params):
+        payload = {'email': self.user.email, 'password': 'Testpass123'}
+        payload.update(params)
+        res = self.client.post(TOKEN_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def authenticate(self, key):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + key)
+
+    @override_settings(AUTH_TOKEN_TTL=3600)
+    def test_login_returns_expiring_token(self):
+        """Test tokens are issued with the configured TTL."""
+        data = self.login(device='phone')
+
+        token = AuthToken.objects.get(key=data['token'])
+        self.assertEqual(data['device'], 'phone')
+        self.assertEqual(token.user, self.user)
+        remaining = token.expires_at - timezone.now()
+        self.assertAlmostEqual(remaining.total_seconds(), 3600, delta=60)
+
+    def test_login_rotates_device_token(self):
+        """Test logging in again replaces the device's token."""
+        old = self.login()['token']
+        self.authenticate(old)
+        self.client.get(ME_URL)
+
+        new = self.login()['token']
+
+        self.assertNotEqual(old, new)
+        self.assertEqual(AuthToken.objects.filter(user=self.user).count(), 1)
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_per_device(self):
+        """Test each device keeps its own token."""
+        phone = self.login(device='phone')['token']
+        laptop = self.login(device='laptop')['token']
+
+        for key in (phone, laptop):
+            self.authenticate(key)
+            res = self.client.get(ME_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_tokens(self):
+        """Test listing tokens never exposes their keys."""
+        self.authenticate(self.login(device='phone')['token'])
+        self.login(device='laptop')
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        AuthToken.objects.rotate(other)
+
+        res = self.client.get(TOKENS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [token['device'] for token in res.data],
+            ['phone', 'laptop']
+        )
+        self.assertNotIn('key', res.data[0])
+
+    def test_revoke_token(self):
+        """Test revoking one token logs out only that device."""
+        phone = self.login(device='phone')['token']
+        laptop = self.login(device='laptop')['token']
+        self.authenticate(phone)
+        self.client.get(ME_URL)
+
+        self.authenticate(laptop)
+        token = AuthToken.objects.get(key=phone)
+        res = self.client.delete(token_detail_url(token.id))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(self.client.get(ME_URL).status_code, 200)
+        self.authenticate(phone)
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_other_users_token(self):
+        """Test tokens of other users can not be revoked."""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'Testpass123',
+        )
+        token = AuthToken.objects.rotate(other)
+        self.authenticate(self.login()['token'])
+
+        res = self.client.delete(token_detail_url(token.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(AuthToken.objects.filter(id=token.id).exists())
+
+    def test_revoke_all_tokens(self):
+        """Test revoking all tokens logs out every device."""
+        phone = self.login(device='phone')['token']
+        self.authenticate(self.login(device='laptop')['token'])
+        self.client.get(ME_URL)
+
+        res = self.client.delete(TOKENS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(AuthToken.objects.filter(user=self.user).exists())
+        for key in (phone,):
+            self.authenticate(key)
+            res = self.client.get(ME_URL)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNone(token_cache.get(phone))
+
+    def test_one_token_per_device(self):
+        """Test the database refuses a second token for a device."""
+        AuthToken.objects.rotate(self.user, 'phone')
+
+        with self.assertRaises(IntegrityError):
+            AuthToken.objects.create(
+                user=self.user,
+                device='phone',
+                expires_at=timezone.now() + timedelta(hours=1)
+            )
+
+    @override_settings(TOKEN_AUTH_CACHE={
+        'MAX_SIZE': 100, 'TTL': 60, 'SHARED_CACHE': None
+    })
+    def test_revocation_window_in_other_processes(self):
+        """Test other processes accept a revoked token until their local
+        cache entry expires, TTL seconds at most.
+        """
+        key = self.login()['token']
+        token = AuthToken.objects.select_related('user').get(key=key)
+        other_process = TokenCache()
+        other_process.set(key, (token.user, token))
+        self.authenticate(key)
+
+        self.client.delete(TOKENS_URL)
+
+        self.assertIsNone(token_cache.get(key))
+        self.assertIsNotNone(other_process.get(key))
+        later = time.monotonic() + 61
+        with patch('user.authentication.time.monotonic', return_value=later):
+            self.assertIsNone(other_process.get(key))
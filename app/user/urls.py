@@ -10,5 +10,11 @@ app_name = 'user'
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('me/', views.ManageUserView.as_view(), name='me'),
-    path('token/', views.CreateTokenView.as_view(), name='token')
+    path('token/', views.CreateTokenView.as_view(), name='token'),
+    path('tokens/', views.TokenListView.as_view(), name='tokens'),
+    path(
+        'tokens/<int:pk>/',
+        views.TokenDetailView.as_view(),
+        name='token-detail'
+    ),
 ]
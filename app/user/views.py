@@ -1,30 +1,85 @@
 """
 Views for the user API.
 """
-from rest_framework import generics, authentication, permissions
-from rest_framework.authtoken.views import ObtainAuthToken
-from rest_framework.settings import api_settings
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
 
+from core.mixins import ReplicaReadMixin
+from core.models import AuthToken
 from user import serializers
+from user.authentication import CachedTokenAuthentication
 
 
 class CreateUserView(generics.CreateAPIView):
     """Create a new user in the system."""
     serializer_class = serializers.UserSerializer
+    query_budget = {'post': 2}
 
 
-class CreateTokenView(ObtainAuthToken):
+class CreateTokenView(generics.GenericAPIView):
     """Create new auth token for user"""
     serializer_class = serializers.AuthTokenSerializer
-    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    permission_classes = []
+    query_budget = {'post': 7}
 
+    def post(self, request, *args, **kwargs):
+        """Log in, replacing the user's previous token for the device."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+        token = AuthToken.objects.rotate(
+            serializer.validated_data['user'],
+            serializer.validated_data['device']
+        )
+
+        return Response(serializers.IssuedTokenSerializer(token).data)
+
+
+class ManageUserView(ReplicaReadMixin,
+                     generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
     serializer_class = serializers.UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'get': 0, 'put': 4, 'patch': 2}
 
     def get_object(self):
         """Retrieve and return authentication user."""
         return self.request.user
+
+
+class TokenListView(generics.ListAPIView):
+    """List the authenticated user's tokens, or revoke all of them."""
+    serializer_class = serializers.TokenSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'get': 1, 'delete': 2}
+
+    def get_queryset(self):
+        """Retrieve the tokens of the authenticated user."""
+        return AuthToken.objects.filter(user=self.request.user).order_by('id')
+
+    @extend_schema(operation_id='user_tokens_revoke_all')
+    def delete(self, request, *args, **kwargs):
+        """Revoke every token of the user, logging out all devices.
+
+        Other processes may accept a revoked token from their local cache
+        for up to ``TOKEN_AUTH_CACHE['TTL']`` seconds, see
+        ``CachedTokenAuthentication``.
+        """
+        self.get_queryset().delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema_view(delete=extend_schema(operation_id='user_tokens_revoke'))
+class TokenDetailView(generics.DestroyAPIView):
+    """Revoke one of the authenticated user's tokens."""
+    serializer_class = serializers.TokenSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'delete': 2}
+
+    def get_queryset(self):
+        """Retrieve the tokens of the authenticated user."""
+        return AuthToken.objects.filter(user=self.request.user)